@@ -15,12 +15,15 @@ from display import (
     draw_extension_warning, draw_pause_menu, draw_controls_help, draw_game_list,
     draw_history_list, draw_clear_history_dialog, draw_cancel_download_dialog,
     draw_confirm_dialog, draw_redownload_game_cache_dialog, draw_popup, draw_gradient,
-    THEME_COLORS
+    draw_validation_transition, begin_frame, present_frame, invalidate_frame, damage_full, THEME_COLORS
 )
 from language import handle_language_menu_events, _
-from network import test_internet, download_rom, is_1fichier_url, download_from_1fichier, check_for_updates
-from controls import handle_controls, validate_menu_state, process_key_repeats, get_emergency_controls
+from network import start_internet_check, is_1fichier_url, check_for_updates, resume_download_queue, suspend_downloads
+from controls import handle_controls, validate_menu_state, process_key_repeats, get_emergency_controls, start_download_task
 from controls_mapper import load_controls_config, map_controls, draw_controls_mapping, get_actions
+import frame_scheduler
+import game_lists
+from game_search import set_search_index
 from utils import (
     detect_non_pc, load_sources, check_extension_before_download, extract_zip_data,
     play_random_music, load_music_config
@@ -70,7 +73,6 @@ config.is_non_pc = detect_non_pc()
 
 # Initialisation de l’écran
 screen = init_display()
-clock = pygame.time.Clock()
 
 pygame.display.set_caption("RGSX")
 
@@ -93,7 +95,7 @@ logger.debug(f"APP_FOLDER: {config.APP_FOLDER}")
 config.current_page = 0
 config.selected_platform = 0
 config.selected_key = (0, 0)
-config.transition_state = "none"
+config.transition_state = "idle"
 
 # Initialisation des variables de répétition
 config.repeat_action = None
@@ -174,10 +176,11 @@ async def main():
     config.update_triggered = False
     last_redraw_time = pygame.time.get_ticks()
     config.last_frame_time = pygame.time.get_ticks()  # Initialisation pour éviter erreur
+    prefetched_platform = None  # Plateforme survolée dont les listes voisines ont été préchargées
+    internet_check = None  # Future du test de connexion en cours
 
 
     while running:
-        clock.tick(30)  # Limite à 60 FPS
         if config.update_triggered:
             logger.debug("Mise à jour déclenchée, arrêt de la boucle principale")
             break
@@ -214,11 +217,12 @@ async def main():
             config.needs_redraw = True
             logger.debug("Fin popup update_result, retour à platform")
 
-        # Gestion de la répétition automatique des actions
-        process_key_repeats(sources, joystick, screen)
+        # Gestion de la répétition automatique des actions (suspendue pendant la transition vers la liste des jeux)
+        if config.transition_state == "idle":
+            process_key_repeats(sources, joystick, screen)
         
-        # Gestion des événements
-        events = pygame.event.get()
+        # Gestion des événements (au repos, attend la prochaine entrée au lieu de tourner à vide)
+        events = frame_scheduler.wait_for_events()
         for event in events:
             # Gestion directe des événements pour le menu de langue
             if config.menu_state == "language_select":
@@ -238,6 +242,10 @@ async def main():
                 logger.debug("Événement QUIT détecté, passage à confirm_exit")
                 continue
 
+            # Les entrées sont ignorées pendant la transition vers la liste des jeux
+            if config.transition_state != "idle":
+                continue
+
             start_config = config.controls_config.get("start", {})
             if start_config and (
                 (event.type == pygame.KEYDOWN and start_config.get("type") == "key" and event.key == start_config.get("key")) or
@@ -303,7 +311,6 @@ async def main():
                     if config.pending_download and config.extension_confirm_selection == 0:  # Oui
                         url, platform, game_name, is_zip_non_supported = config.pending_download
                         logger.debug(f"Téléchargement confirmé après avertissement: {game_name} pour {platform} depuis {url}")
-                        task_id = str(pygame.time.get_ticks())
                         config.history.append({
                             "platform": platform,
                             "game_name": game_name,
@@ -314,10 +321,7 @@ async def main():
                         })
                         config.current_history_item = len(config.history) - 1
                         save_history(config.history)
-                        config.download_tasks[task_id] = (
-                            asyncio.create_task(download_rom(url, platform, game_name, is_zip_non_supported, task_id)),
-                            url, game_name, platform
-                        )
+                        task_id = start_download_task(url, platform, game_name, is_zip_non_supported)
                         config.menu_state = "history"
                         config.pending_download = None
                         config.needs_redraw = True
@@ -382,11 +386,7 @@ async def main():
                                 config.previous_menu_state = config.menu_state
                                 logger.debug(f"Previous menu state défini: {config.previous_menu_state}")
                                 # Lancer le téléchargement dans une tâche asynchrone
-                                task_id = str(pygame.time.get_ticks())
-                                config.download_tasks[task_id] = (
-                                    asyncio.create_task(download_from_1fichier(url, platform, game_name, is_zip_non_supported)),
-                                    url, game_name, platform
-                                )
+                                start_download_task(url, platform, game_name, is_zip_non_supported)
                                 config.menu_state = "history"  # Passer à l'historique
                                 config.needs_redraw = True
                                 logger.debug(f"Téléchargement 1fichier démarré pour {game_name}, passage à l'historique")
@@ -404,11 +404,7 @@ async def main():
                                 config.previous_menu_state = config.menu_state
                                 logger.debug(f"Previous menu state défini: {config.previous_menu_state}")
                                 # Lancer le téléchargement dans une tâche asynchrone
-                                task_id = str(pygame.time.get_ticks())
-                                config.download_tasks[task_id] = (
-                                    asyncio.create_task(download_rom(url, platform, game_name, is_zip_non_supported)),
-                                    url, game_name, platform
-                                )
+                                start_download_task(url, platform, game_name, is_zip_non_supported)
                                 config.menu_state = "history"  # Passer à l'historique
                                 config.needs_redraw = True
                                 logger.debug(f"Téléchargement démarré pour {game_name}, passage à l'historique")
@@ -441,15 +437,13 @@ async def main():
                                 else:
                                     config.previous_menu_state = config.menu_state
                                     logger.debug(f"Previous menu state défini: {config.previous_menu_state}")
-                                    success, message = download_from_1fichier(url, platform, game_name, is_zip_non_supported)
+                                    task_id = start_download_task(url, platform, game_name, is_zip_non_supported, force=True)
                                     # Ancien popup download_result supprimé : retour direct à l'historique
-                                    config.download_result_message = message
-                                    config.download_result_error = not success
                                     config.download_progress.clear()
                                     config.pending_download = None
                                     config.menu_state = "history"
                                     config.needs_redraw = True
-                                    logger.debug(f"Retéléchargement 1fichier terminé pour {game_name}, succès={success}, message={message}, retour direct history")
+                                    logger.debug(f"Retéléchargement 1fichier lancé pour {game_name}, task_id={task_id}, retour direct history")
                             else:
                                 is_supported, message, is_zip_non_supported = check_extension_before_download(url, platform, game_name)
                                 if not is_supported:
@@ -461,14 +455,12 @@ async def main():
                                 else:
                                     config.previous_menu_state = config.menu_state
                                     logger.debug(f"Previous menu state défini: {config.previous_menu_state}")
-                                    success, message = download_rom(url, platform, game_name, is_zip_non_supported)
-                                    config.download_result_message = message
-                                    config.download_result_error = not success
+                                    task_id = start_download_task(url, platform, game_name, is_zip_non_supported, force=True)
                                     config.download_progress.clear()
                                     config.pending_download = None
                                     config.menu_state = "history"
                                     config.needs_redraw = True
-                                    logger.debug(f"Retéléchargement terminé pour {game_name}, succès={success}, message={message}, retour direct history")
+                                    logger.debug(f"Retéléchargement lancé pour {game_name}, task_id={task_id}, retour direct history")
                             break
                 elif action in ("clear_history", "delete_history") and config.menu_state == "history":
                     # Ouvrir le dialogue de confirmation
@@ -568,6 +560,7 @@ async def main():
 
         # Affichage
         if config.needs_redraw:
+            begin_frame()
             draw_gradient(screen, THEME_COLORS["background_top"], THEME_COLORS["background_bottom"])
             
             
@@ -582,6 +575,9 @@ async def main():
                 # Ancien popup supprimé : afficher directement l'historique
                 config.menu_state = "history"
                 draw_history_list(screen)
+            elif config.menu_state == "platform" and config.transition_state == "to_game":
+                damage_full()
+                draw_validation_transition(screen, config.current_platform, config.transition_progress)
             elif config.menu_state == "platform":
                 draw_platform_grid(screen)
             elif config.menu_state == "game":
@@ -627,7 +623,7 @@ async def main():
                 logger.error(f"État de menu non valide détecté: {config.menu_state}, retour à platform")
             draw_controls(screen, config.menu_state, getattr(config, 'current_music_name', None), getattr(config, 'music_popup_start_time', 0))
             
-            pygame.display.flip()
+            present_frame()
             
             config.needs_redraw = False
             # logger.debug("Screen flipped with pygame.display.flip()")
@@ -655,6 +651,7 @@ async def main():
                     action = get_actions()[0]
                     draw_controls_mapping(screen, action, None, True, 0.0)
                     pygame.display.flip()
+                    invalidate_frame()
                     logger.debug("Interface de mappage des contrôles affichée")
                     
                     # Appeler map_controls pour gérer la configuration
@@ -686,14 +683,30 @@ async def main():
                 config.needs_redraw = True
                 logger.debug(f"Étape chargement : {loading_step}, progress={config.loading_progress}")
             elif loading_step == "test_internet":
-                #logger.debug("Exécution de test_internet()")
-                if test_internet():
+                if getattr(config, 'SKIP_INTERNET_CHECK', False):
+                    logger.debug("SKIP_INTERNET_CHECK=true -> skipping connectivity check")
+                    connected = True
+                else:
+                    # Le test tourne dans un thread : l'écran de chargement reste animé en attendant
+                    if internet_check is None:
+                        internet_check = start_internet_check()
+                        test_start_time = current_time
+                    if not internet_check.done():
+                        status = f"{_('loading_test_connection')} ({(current_time - test_start_time) // 1000}s)"
+                        if status != config.current_loading_system:
+                            config.current_loading_system = status
+                            config.needs_redraw = True
+                        connected = None
+                    else:
+                        connected = internet_check.result()
+                        internet_check = None
+                if connected:
                     loading_step = "check_ota"
                     config.current_loading_system = _("loading_check_updates")
                     config.loading_progress = 20.0
                     config.needs_redraw = True
                     logger.debug(f"Étape chargement : {loading_step}, progress={config.loading_progress}")
-                else:
+                elif connected is False:
                     config.menu_state = "error"
                     config.error_message = _("error_no_internet")
                     config.needs_redraw = True
@@ -793,27 +806,41 @@ async def main():
                     logger.debug(f"Dossier Data non vide, passage à {loading_step}")
             elif loading_step == "load_sources":
                 sources = load_sources()
+                # Reprendre les téléchargements laissés dans la file persistante
+                for task_id, task, item in resume_download_queue():
+                    config.download_tasks[task_id] = (task, item["url"], item["game_name"], item["platform"])
                 config.menu_state = "platform"
                 config.loading_progress = 100.0
                 config.current_loading_system = ""
                 config.needs_redraw = True
                 logger.debug(f"Fin chargement, passage à platform, progress={config.loading_progress}")
 
-        # Gestion de l'état de transition
+        # Gestion de l'état de transition : l'animation tourne pendant que la liste des jeux se charge en arrière-plan,
+        # on passe à game quand les deux sont terminées
         if config.transition_state == "to_game":
-            config.transition_progress += 1
-            if config.transition_progress >= config.transition_duration:
+            config.transition_progress = current_time - config.transition_start
+            config.needs_redraw = True
+            loaded = game_lists.get_games_if_ready(config.platforms[config.current_platform])
+            if config.transition_progress >= config.transition_duration and loaded is not None:
+                config.games, search_index = loaded
+                set_search_index(config.games, search_index)
+                config.filtered_games = config.games
                 config.menu_state = "game"
                 config.transition_state = "idle"
                 config.transition_progress = 0.0
-                config.needs_redraw = True
-                logger.debug("Transition terminée, passage à game")
+                logger.debug(f"Transition terminée, passage à game ({len(config.games)} jeux)")
+                game_lists.prefetch_games(game_lists.get_adjacent_platforms(config.current_platform, config.platforms))
+        elif config.menu_state == "platform" and config.platforms and config.selected_platform != prefetched_platform:
+            # Préchargement spéculatif de la plateforme survolée et de ses voisines
+            prefetched_platform = config.selected_platform
+            game_lists.prefetch_games([config.platforms[prefetched_platform]] + game_lists.get_adjacent_platforms(prefetched_platform, config.platforms))
 
         config.last_frame_time = current_time
-        clock.tick(60)
-        await asyncio.sleep(0.01)
+        await frame_scheduler.next_frame()
 
     pygame.mixer.music.stop()
+    # Les transferts en cours restent dans la file persistante et reprendront au prochain lancement
+    suspend_downloads()
 
     process_name = "emulatorLauncher.exe"
     result = os.system(f"taskkill /f /im {process_name}")
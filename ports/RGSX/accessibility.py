@@ -29,9 +29,9 @@ def save_accessibility_settings(accessibility_settings):
 
 def draw_accessibility_menu(screen):
     """Affiche le menu d'accessibilité avec curseur pour la taille de police."""
-    from display import OVERLAY, THEME_COLORS, draw_stylized_button
+    from display import THEME_COLORS, draw_stylized_button, draw_overlay
     
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     
     # Titre
     title_text = _("menu_accessibility")
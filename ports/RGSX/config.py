@@ -93,6 +93,8 @@ GAMES_FOLDER = os.path.join(SAVE_FOLDER, "games")
 SOURCES_FILE = os.path.join(SAVE_FOLDER, "sources.json")
 CONTROLS_CONFIG_PATH = os.path.join(SAVE_FOLDER, "controls.json")
 HISTORY_PATH = os.path.join(SAVE_FOLDER, "history.json")
+DOWNLOAD_QUEUE_PATH = os.path.join(SAVE_FOLDER, "download_queue.json")
+SIZE_CACHE_PATH = os.path.join(SAVE_FOLDER, "size_cache.json")
 
 # Nouveau fichier unifié pour les paramètres RGSX
 RGSX_SETTINGS_PATH = os.path.join(SAVE_FOLDER, "rgsx_settings.json")
@@ -130,6 +132,10 @@ def _env_flag(name: str, default: bool = False) -> bool:
 DISABLE_CODE_UPDATE = _env_flag("RGSX_DISABLE_UPDATER", False)
 # Disable data bootstrap/update (rgsx-data.zip)
 DISABLE_DATA_UPDATE = _env_flag("RGSX_DISABLE_DATA_UPDATE", False)
+# Skip the startup connectivity check (containers: the network is managed by the host)
+SKIP_INTERNET_CHECK = _env_flag("RGSX_SKIP_INTERNET_CHECK", False)
+# Zone de transit locale pour téléchargement/extraction avant déplacement vers le dossier ROM (vide = désactivée)
+STAGING_DIR = os.path.abspath(os.getenv("RGSX_STAGING_DIR").strip()) if (os.getenv("RGSX_STAGING_DIR") or "").strip() else ""
 
 # Constantes pour la répétition automatique dans pause_menu
 REPEAT_DELAY = 350  # Délai initial avant répétition (ms) - augmenté pour éviter les doubles actions
@@ -155,8 +161,9 @@ popup_start_time = 0
 last_progress_update = 0
 needs_redraw = True
 transition_state = "idle"
-transition_progress = 0.0
-transition_duration = 18
+transition_progress = 0.0  # ms écoulées depuis le début de la transition
+transition_duration = 1000  # ms
+transition_start = 0
 games_count = {}
 music_enabled = True  # Par défaut la musique est activée
 API_KEY_1FICHIER = ""  # Initialisation de la variable globale pour la clé API
@@ -4,13 +4,14 @@ import config
 # Constantes pour la répétition automatique - importées de config.py
 from config import REPEAT_DELAY, REPEAT_INTERVAL, REPEAT_ACTION_DEBOUNCE
 from config import CONTROLS_CONFIG_PATH , GRID_COLS, GRID_ROWS
-import asyncio
 import json
 import os
-from display import draw_validation_transition
-from network import download_rom, download_from_1fichier, is_1fichier_url
+from display import prepare_validation_transition
+import game_lists
+from game_search import filter_games
+from network import launch_download, request_cancel, is_1fichier_url
 from utils import (
-    load_games, check_extension_before_download, is_extension_supported,
+    check_extension_before_download, is_extension_supported,
     load_extensions_json, play_random_music, sanitize_filename,
     load_api_key_1fichier, save_music_config
 )
@@ -35,6 +36,23 @@ VALID_STATES = [
     "language_select"
 ]
 
+def start_download_task(url, platform, game_name, is_zip_non_supported, force=False):
+    """Lance le téléchargement et l'enregistre dans config.download_tasks.
+    Si la même URL est déjà en cours, la tâche existante est réutilisée et l'entrée
+    d'historique temporaire ajoutée juste avant est retirée. Retourne le task_id."""
+    task_id, task, coalesced = launch_download(url, platform, game_name, is_zip_non_supported, force=force)
+    if coalesced:
+        active = [e for e in config.history if e.get("url") == url and e.get("status") in ["downloading", "Téléchargement", "Extracting"]]
+        if len(active) > 1 and config.history[-1] is active[-1]:
+            config.history.pop()
+            save_history(config.history)
+        for i, entry in enumerate(config.history):
+            if entry.get("url") == url and entry.get("status") in ["downloading", "Téléchargement", "Extracting"]:
+                config.current_history_item = i
+                break
+    config.download_tasks[task_id] = (task, url, game_name, platform)
+    return task_id
+
 def validate_menu_state(state):
     if state not in VALID_STATES:
         logger.debug(f"État invalide {state}, retour à platform")
@@ -274,13 +292,15 @@ def handle_controls(event, sources, joystick, screen):
             elif is_input_matched(event, "confirm"):
                 if config.platforms:
                     config.current_platform = config.selected_platform
-                    config.games = load_games(config.platforms[config.current_platform])
-                    config.filtered_games = config.games
+                    # La liste se charge en arrière-plan pendant la transition ; la boucle principale passe à game à la fin
+                    game_lists.request_games(config.platforms[config.current_platform])
                     config.filter_active = False
                     config.current_game = 0
                     config.scroll_offset = 0
-                    draw_validation_transition(screen, config.current_platform)
-                    config.menu_state = "game"
+                    prepare_validation_transition(config.current_platform)
+                    config.transition_state = "to_game"
+                    config.transition_start = pygame.time.get_ticks()
+                    config.transition_progress = 0.0
                     config.needs_redraw = True
                     #logger.debug(f"Plateforme sélectionnée: {config.platforms[config.current_platform]}, {len(config.games)} jeux chargés")
             elif is_input_matched(event, "cancel"):
@@ -335,7 +355,7 @@ def handle_controls(event, sources, joystick, screen):
                         config.needs_redraw = True
                 elif is_input_matched(event, "confirm"):
                     config.search_query += keyboard_layout[row][col]
-                    config.filtered_games = [game for game in config.games if config.search_query.lower() in game[0].lower()]
+                    config.filtered_games = filter_games(config.games, config.search_query)
                     config.current_game = 0
                     config.scroll_offset = 0
                     config.needs_redraw = True
@@ -343,14 +363,14 @@ def handle_controls(event, sources, joystick, screen):
                 elif is_input_matched(event, "delete"):
                     if config.search_query:
                         config.search_query = config.search_query[:-1]
-                        config.filtered_games = [game for game in config.games if config.search_query.lower() in game[0].lower()]
+                        config.filtered_games = filter_games(config.games, config.search_query)
                         config.current_game = 0
                         config.scroll_offset = 0
                         config.needs_redraw = True
                         #logger.debug(f"Suppression caractère: query={config.search_query}, jeux filtrés={len(config.filtered_games)}")
                 elif is_input_matched(event, "space"):
                     config.search_query += " "
-                    config.filtered_games = [game for game in config.games if config.search_query.lower() in game[0].lower()]
+                    config.filtered_games = filter_games(config.games, config.search_query)
                     config.current_game = 0
                     config.scroll_offset = 0
                     config.needs_redraw = True
@@ -391,7 +411,7 @@ def handle_controls(event, sources, joystick, screen):
                     # Saisie de texte alphanumérique
                     if event.unicode.isalnum() or event.unicode == ' ':
                         config.search_query += event.unicode
-                        config.filtered_games = [game for game in config.games if config.search_query.lower() in game[0].lower()]
+                        config.filtered_games = filter_games(config.games, config.search_query)
                         config.current_game = 0
                         config.scroll_offset = 0
                         config.needs_redraw = True
@@ -400,7 +420,7 @@ def handle_controls(event, sources, joystick, screen):
                     elif is_input_matched(event, "delete"):
                         if config.search_query:
                             config.search_query = config.search_query[:-1]
-                            config.filtered_games = [game for game in config.games if config.search_query.lower() in game[0].lower()]
+                            config.filtered_games = filter_games(config.games, config.search_query)
                             config.current_game = 0
                             config.scroll_offset = 0
                             config.needs_redraw = True
@@ -526,7 +546,6 @@ def handle_controls(event, sources, joystick, screen):
                                 # Téléchargement direct
                                 config.history.append(add_to_history(platform, game_name, "downloading", url, 0, "Téléchargement en cours"))
                                 config.current_history_item = len(config.history) -1
-                                task_id = str(pygame.time.get_ticks())
                                 if is_1fichier_url(url):
                                     config.API_KEY_1FICHIER = load_api_key_1fichier()
                                     if not config.API_KEY_1FICHIER:
@@ -534,10 +553,7 @@ def handle_controls(event, sources, joystick, screen):
                                         config.history[-1]["message"] = "Erreur API : Clé API 1fichier absente"
                                         save_history(config.history)
                                         continue
-                                    task = asyncio.create_task(download_from_1fichier(url, platform, game_name, config.pending_download[3], task_id))
-                                else:
-                                    task = asyncio.create_task(download_rom(url, platform, game_name, config.pending_download[3], task_id))
-                                config.download_tasks[task_id] = (task, url, game_name, platform)
+                                start_download_task(url, platform, game_name, config.pending_download[3])
                                 # passer à l'élément suivant (boucle while)
                             return True  # fin lot
 
@@ -597,9 +613,7 @@ def handle_controls(event, sources, joystick, screen):
                                     logger.debug(f"Extension non supportée, passage à extension_warning pour {game_name}")
                                     config.history.pop()  # Supprimer l'entrée temporaire
                                 else:
-                                    task_id = str(pygame.time.get_ticks())
-                                    task = asyncio.create_task(download_from_1fichier(url, platform, game_name, config.pending_download[3], task_id))
-                                    config.download_tasks[task_id] = (task, url, game_name, platform)
+                                    task_id = start_download_task(url, platform, game_name, config.pending_download[3])
                                     config.previous_menu_state = config.menu_state
                                     config.menu_state = "history"  # Passer à l'historique
                                     config.needs_redraw = True
@@ -630,9 +644,7 @@ def handle_controls(event, sources, joystick, screen):
                                     logger.debug(f"Extension non supportée, passage à extension_warning pour {game_name}")
                                     config.history.pop()  # Supprimer l'entrée temporaire
                                 else:
-                                    task_id = str(pygame.time.get_ticks())
-                                    task = asyncio.create_task(download_rom(url, platform, game_name, config.pending_download[3], task_id))
-                                    config.download_tasks[task_id] = (task, url, game_name, platform)
+                                    task_id = start_download_task(url, platform, game_name, config.pending_download[3])
                                     config.previous_menu_state = config.menu_state
                                     config.menu_state = "history"  # Passer à l'historique
                                     config.needs_redraw = True
@@ -678,12 +690,7 @@ def handle_controls(event, sources, joystick, screen):
                                 logger.error("Clé API 1fichier absente, téléchargement impossible.")
                                 config.pending_download = None
                                 return action
-                            task_id = str(pygame.time.get_ticks())
-                            task = asyncio.create_task(download_from_1fichier(url, platform, game_name, is_zip_non_supported, task_id))
-                        else:
-                            task_id = str(pygame.time.get_ticks())
-                            task = asyncio.create_task(download_rom(url, platform, game_name, is_zip_non_supported, task_id))
-                        config.download_tasks[task_id] = (task, url, game_name, platform)
+                        task_id = start_download_task(url, platform, game_name, is_zip_non_supported)
                         config.previous_menu_state = validate_menu_state(config.previous_menu_state)
                         config.menu_state = "history"  # Passer à l'historique
                         config.needs_redraw = True
@@ -721,7 +728,6 @@ def handle_controls(event, sources, joystick, screen):
                                         break
                                     config.history.append(add_to_history(platform, game_name, "downloading", url, 0, "Téléchargement en cours"))
                                     config.current_history_item = len(config.history) -1
-                                    task_id = str(pygame.time.get_ticks())
                                     if is_1fichier_url(url):
                                         config.API_KEY_1FICHIER = load_api_key_1fichier()
                                         if not config.API_KEY_1FICHIER:
@@ -729,10 +735,7 @@ def handle_controls(event, sources, joystick, screen):
                                             config.history[-1]["message"] = "Erreur API : Clé API 1fichier absente"
                                             save_history(config.history)
                                             continue
-                                        task = asyncio.create_task(download_from_1fichier(url, platform, game_name, config.pending_download[3], task_id))
-                                    else:
-                                        task = asyncio.create_task(download_rom(url, platform, game_name, config.pending_download[3], task_id))
-                                    config.download_tasks[task_id] = (task, url, game_name, platform)
+                                    start_download_task(url, platform, game_name, config.pending_download[3])
                                 if not config.batch_download_indices and not config.batch_pending_game:
                                     # Batch terminé
                                     config.batch_in_progress = False
@@ -780,7 +783,6 @@ def handle_controls(event, sources, joystick, screen):
                                     break
                                 config.history.append(add_to_history(platform, game_name, "downloading", url, 0, "Téléchargement en cours"))
                                 config.current_history_item = len(config.history) -1
-                                task_id = str(pygame.time.get_ticks())
                                 if is_1fichier_url(url):
                                     config.API_KEY_1FICHIER = load_api_key_1fichier()
                                     if not config.API_KEY_1FICHIER:
@@ -788,10 +790,7 @@ def handle_controls(event, sources, joystick, screen):
                                         config.history[-1]["message"] = "Erreur API : Clé API 1fichier absente"
                                         save_history(config.history)
                                         continue
-                                    task = asyncio.create_task(download_from_1fichier(url, platform, game_name, config.pending_download[3], task_id))
-                                else:
-                                    task = asyncio.create_task(download_rom(url, platform, game_name, config.pending_download[3], task_id))
-                                config.download_tasks[task_id] = (task, url, game_name, platform)
+                                start_download_task(url, platform, game_name, config.pending_download[3])
                             if not config.batch_download_indices and not config.batch_pending_game:
                                 config.batch_in_progress = False
                                 config.menu_state = "history"
@@ -870,7 +869,6 @@ def handle_controls(event, sources, joystick, screen):
                                     config.needs_redraw = True
                                     logger.debug(f"Extension non supportée pour retéléchargement, passage à extension_warning pour {game_name}")
                                 else:
-                                    task_id = str(pygame.time.get_ticks())
                                     if is_1fichier_url(url):
                                         if not config.API_KEY_1FICHIER:
                                             config.previous_menu_state = config.menu_state
@@ -886,10 +884,7 @@ def handle_controls(event, sources, joystick, screen):
                                             logger.error("Clé API 1fichier absente, retéléchargement impossible.")
                                             config.pending_download = None
                                             return action
-                                        task = asyncio.create_task(download_from_1fichier(url, platform, game_name, is_zip_non_supported, task_id))
-                                    else:
-                                        task = asyncio.create_task(download_rom(url, platform, game_name, is_zip_non_supported, task_id))
-                                    config.download_tasks[task_id] = (task, url, game_name, platform)
+                                    task_id = start_download_task(url, platform, game_name, is_zip_non_supported, force=True)
                                     config.previous_menu_state = config.menu_state
                                     config.menu_state = "history"
                                     config.needs_redraw = True
@@ -927,7 +922,8 @@ def handle_controls(event, sources, joystick, screen):
                     # Annuler la tâche correspondante
                     for task_id, (task, task_url, game_name, platform) in list(config.download_tasks.items()):
                         if task_url == url:
-                            task.cancel()
+                            # Le jeton d'annulation interrompt le thread de téléchargement, la tâche se termine d'elle-même
+                            request_cancel(task_id=task_id)
                             del config.download_tasks[task_id]
                             entry["status"] = "Canceled"
                             entry["progress"] = 0
@@ -1106,6 +1102,8 @@ def handle_controls(event, sources, joystick, screen):
                             if os.path.exists(config.GAMES_FOLDER):
                                 shutil.rmtree(config.GAMES_FOLDER)
                                 logger.debug("Dossier games supprimé avec succès")
+                            # Les listes chargées ou préchargées proviennent des fichiers supprimés
+                            game_lists.clear_game_lists()
                             if os.path.exists(config.IMAGES_FOLDER):
                                 shutil.rmtree(config.IMAGES_FOLDER)
                                 logger.debug("Dossier images supprimé avec succès")
@@ -5,7 +5,7 @@ import logging
 import config
 import language
 from config import CONTROLS_CONFIG_PATH
-from display import draw_gradient
+from display import draw_gradient, invalidate_frame
 import xml.etree.ElementTree as ET
 
 logger = logging.getLogger(__name__)
@@ -372,6 +372,7 @@ def map_controls(screen):
             progress = min(input_held_time / HOLD_DURATION, 1.0) if current_input else 0.0
             draw_controls_mapping(screen, actions[current_action_index], last_input_name, current_input is not None, progress)
             pygame.display.flip()
+            invalidate_frame()
             config.needs_redraw = False
         
         current_time = pygame.time.get_ticks()
@@ -3,7 +3,10 @@ import config
 from utils import truncate_text_middle, wrap_text, load_system_image, truncate_text_end
 import logging
 import math
+from collections import OrderedDict
 from history import load_history  # Ajout de l'import
+from network import get_transfer_stats
+import size_probe
 from language import _  # Import de la fonction de traduction
 
 logger = logging.getLogger(__name__)
@@ -51,19 +54,198 @@ def init_display():
     # Initialisation de OVERLAY
     OVERLAY = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
     OVERLAY.fill((0, 0, 0, 150))  # Transparence augmentée
+    clear_layer_cache()
+    clear_text_cache()
     logger.debug(f"Écran initialisé avec résolution : {screen_width}x{screen_height}")
     return screen
 
+# Calques pré-composés : fond dégradé, fond + voile OVERLAY et bandeau des contrôles sont rendus
+# une seule fois par résolution/thème (ou par texte pour le bandeau) puis recopiés en un seul blit.
+MAX_LAYERS = 16
+_layer_cache = {}
+_current_background = None  # (taille, couleur haut, couleur bas) du dernier fond dessiné par draw_gradient
+
+
+def clear_layer_cache():
+    """Oublie les calques pré-composés (changement de résolution ou de thème)."""
+    global _current_background
+    _layer_cache.clear()
+    _current_background = None
+
+
+def _store_layer(key, surface):
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+    while len(_layer_cache) >= MAX_LAYERS:
+        del _layer_cache[next(iter(_layer_cache))]
+    _layer_cache[key] = surface
+    return surface
+
+
+def get_overlay(size):
+    """Voile semi-transparent plein écran, recréé si la résolution a changé."""
+    global OVERLAY
+    if OVERLAY is None or OVERLAY.get_size() != size:
+        OVERLAY = pygame.Surface(size, pygame.SRCALPHA)
+        OVERLAY.fill((0, 0, 0, 150))
+        logger.debug(f"OVERLAY recréé en {size[0]}x{size[1]}")
+    return OVERLAY
+
+
+def get_background_layer(size, top_color, bottom_color, with_overlay=False):
+    """Fond dégradé vertical de taille size (voilé par OVERLAY si with_overlay), rendu au premier appel."""
+    key = ("background", size, tuple(top_color), tuple(bottom_color), with_overlay)
+    layer = _layer_cache.get(key)
+    if layer is not None:
+        return layer
+    if with_overlay:
+        layer = get_background_layer(size, top_color, bottom_color).copy()
+        layer.blit(get_overlay(size), (0, 0))
+    else:
+        width, height = size
+        # Une colonne d'un pixel étirée sur toute la largeur : height interpolations au lieu de height lignes
+        column = pygame.Surface((1, height))
+        top_color = pygame.Color(*top_color)
+        bottom_color = pygame.Color(*bottom_color)
+        for y in range(height):
+            column.set_at((0, y), top_color.lerp(bottom_color, y / height))
+        layer = pygame.transform.scale(column, (width, height))
+    return _store_layer(key, layer)
+
+
+# Cache LRU des textes rendus : (texte, police, couleur, largeur max, troncature) -> surface.
+# Les lignes des listes ne sont tronquées et rendues qu'à leur première apparition ; la taille
+# totale des surfaces est bornée par TEXT_CACHE_MAX_BYTES (les moins récemment affichées partent d'abord).
+TEXT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+TEXT_CACHE_LOG_EVERY = 10000
+_text_cache = OrderedDict()
+_text_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def render_text(font, text, color, max_width=None, truncate="end"):
+    """Rendu antialiasé de text avec font et color, via le cache.
+    Avec max_width, le texte est d'abord tronqué : "end" (truncate_text_end), "middle"
+    (truncate_text_middle) ou "filename" (truncate_text_middle sans l'extension)."""
+    key = (text, font, tuple(color), max_width, truncate if max_width is not None else None)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        _text_cache_stats["hits"] += 1
+    else:
+        _text_cache_stats["misses"] += 1
+        if max_width is not None:
+            if truncate == "end":
+                text = truncate_text_end(text, font, max_width)
+            else:
+                text = truncate_text_middle(text, font, max_width, is_filename=truncate == "filename")
+        surface = font.render(text, True, color)
+        _text_cache[key] = surface
+        _text_cache_stats["bytes"] += surface.get_pitch() * surface.get_height()
+        while _text_cache_stats["bytes"] > TEXT_CACHE_MAX_BYTES and len(_text_cache) > 1:
+            _, evicted = _text_cache.popitem(last=False)
+            _text_cache_stats["bytes"] -= evicted.get_pitch() * evicted.get_height()
+            _text_cache_stats["evictions"] += 1
+    lookups = _text_cache_stats["hits"] + _text_cache_stats["misses"]
+    if lookups % TEXT_CACHE_LOG_EVERY == 0:
+        logger.debug(f"Cache des textes : {get_text_cache_stats()}")
+    return surface
+
+
+def get_text_cache_stats():
+    """Statistiques du cache des textes : hits, misses, evictions, bytes, entries et hit_rate."""
+    lookups = _text_cache_stats["hits"] + _text_cache_stats["misses"]
+    return dict(_text_cache_stats, entries=len(_text_cache), hit_rate=round(_text_cache_stats["hits"] / lookups, 3) if lookups else 0.0)
+
+
+def clear_text_cache():
+    _text_cache.clear()
+    _text_cache_stats["bytes"] = 0
+
+
 # Fond d'écran dégradé
 def draw_gradient(screen, top_color, bottom_color):
     """Dessine un fond dégradé vertical avec des couleurs vibrantes."""
-    height = screen.get_height()
-    top_color = pygame.Color(*top_color)
-    bottom_color = pygame.Color(*bottom_color)
-    for y in range(height):
-        ratio = y / height
-        color = top_color.lerp(bottom_color, ratio)
-        pygame.draw.line(screen, color, (0, y), (screen.get_width(), y))
+    global _current_background
+    size = screen.get_size()
+    screen.blit(get_background_layer(size, top_color, bottom_color), (0, 0))
+    _current_background = (size, tuple(top_color), tuple(bottom_color))
+
+
+def draw_overlay(screen):
+    """Assombrit l'écran avec OVERLAY. Au premier appel suivant draw_gradient, le fond déjà voilé est
+    recopié tel quel au lieu d'un mélange alpha plein écran ; les appels suivants (voile par-dessus
+    un contenu déjà dessiné) reviennent au mélange alpha."""
+    global _current_background
+    size = screen.get_size()
+    if _current_background is not None and _current_background[0] == size:
+        screen.blit(get_background_layer(*_current_background, with_overlay=True), (0, 0))
+    else:
+        screen.blit(get_overlay(size), (0, 0))
+    _current_background = None
+
+# Rendu par zones modifiées : un écran qui sait le faire déclare sa mise en page fixe (set_frame_layout),
+# puis chaque élément variable (ligne, barre de progression, titre...) avec damage_region(nom, rect, contenu).
+# present_frame compare avec l'image précédente et n'envoie à l'écran que les rectangles dont le contenu a changé ;
+# sans mise en page déclarée, ou si elle a changé, tout l'écran est envoyé comme avant.
+_frame = {"layout": None, "regions": {}, "full": False}
+_previous_frame = {"layout": None, "regions": {}}
+
+
+def begin_frame():
+    """Début d'une image : oublie les zones déclarées par l'image précédente."""
+    _frame["layout"] = None
+    _frame["regions"] = {}
+    _frame["full"] = False
+
+
+def set_frame_layout(*layout):
+    """Déclare que l'écran signale ses zones modifiées. layout résume tout ce qui est dessiné hors de ces zones :
+    s'il change, l'image entière est envoyée."""
+    _frame["layout"] = (config.menu_state, config.screen_width, config.screen_height) + layout
+
+
+def damage_region(name, rect, *content):
+    """Déclare une zone variable de l'image ; elle n'est envoyée que si rect ou content ont changé."""
+    _frame["regions"][name] = (pygame.Rect(rect), content)
+
+
+def damage_full():
+    """Force l'envoi de toute l'image (élément dessiné sans zones déclarées)."""
+    _frame["full"] = True
+
+
+def invalidate_frame():
+    """À appeler après un affichage fait hors de present_frame (transition, configuration des contrôles...)."""
+    _previous_frame["layout"] = None
+
+
+def get_damaged_rects():
+    """Rectangles à envoyer pour l'image courante : None pour tout l'écran, sinon une liste (vide si rien n'a changé)."""
+    full = _frame["full"] or _frame["layout"] is None or _frame["layout"] != _previous_frame["layout"]
+    old_regions, new_regions = _previous_frame["regions"], _frame["regions"]
+    _previous_frame["layout"] = None if _frame["full"] else _frame["layout"]
+    _previous_frame["regions"] = new_regions
+    if full:
+        return None
+    rects = []
+    for name in old_regions.keys() | new_regions.keys():
+        old, new = old_regions.get(name), new_regions.get(name)
+        if old == new:
+            continue
+        if old is None or new is None or old[0] == new[0]:
+            rects.append((old or new)[0])
+        else:
+            rects.extend([old[0], new[0]])
+    return rects
+
+
+def present_frame():
+    """Envoie l'image à l'écran : pygame.display.update sur les zones modifiées, ou flip complet."""
+    rects = get_damaged_rects()
+    if rects is None:
+        pygame.display.flip()
+    elif rects:
+        pygame.display.update(rects)
 
 # Nouvelle fonction pour dessiner un bouton stylisé
 def draw_stylized_button(screen, text, x, y, width, height, selected=False):
@@ -77,15 +259,20 @@ def draw_stylized_button(screen, text, x, y, width, height, selected=False):
         pygame.draw.rect(glow_surface, THEME_COLORS["fond_lignes"] + (50,), (5, 5, width, height), border_radius=12)
         screen.blit(glow_surface, (x - 5, y - 5))
     screen.blit(button_surface, (x, y))
-    text_surface = config.font.render(text, True, THEME_COLORS["text"])
+    text_surface = render_text(config.font, text, THEME_COLORS["text"])
     text_rect = text_surface.get_rect(center=(x + width // 2, y + height // 2))
     screen.blit(text_surface, text_rect)
 
-# Transition d'image lors de la sélection d'un système
-def draw_validation_transition(screen, platform_index):
-    """Affiche une animation de transition fluide pour la sélection d’une plateforme."""
-    platform_dict = config.platform_dicts[platform_index]
-    image = load_system_image(platform_dict)
+# Transition d'image lors de la sélection d'un système : TRANSITION_FRAMES images précalculées à la validation,
+# puis une image par tour de la boucle principale (les entrées et les téléchargements continuent pendant l'animation).
+TRANSITION_FRAMES = 24
+transition_frames = {"index": None, "frames": [], "final": None}
+
+
+def prepare_validation_transition(platform_index):
+    """Précalcule les images de l'animation de sélection de la plateforme platform_index."""
+    transition_frames.update(index=platform_index, frames=[], final=None)
+    image = platform_atlas["sources"].get(platform_index) or load_system_image(config.platform_dicts[platform_index])
     if not image:
         return
 
@@ -96,54 +283,41 @@ def draw_validation_transition(screen, platform_index):
     base_width = int(orig_width * ratio)
     base_height = int(orig_height * ratio)
 
-    # Paramètres de l'animation
-    start_time = pygame.time.get_ticks()
-    duration = 1000  # Durée augmentée à 1 seconde
-    fps = 60
-    frame_time = 1000 / fps  # Temps par frame en ms
-
-    while pygame.time.get_ticks() - start_time < duration:
-        # Fond dégradé
-        draw_gradient(screen, THEME_COLORS["background_top"], THEME_COLORS["background_bottom"])
-
-        # Calcul de l'échelle avec une courbe sinusoïdale pour une transition fluide
-        elapsed = pygame.time.get_ticks() - start_time
-        progress = elapsed / duration
+    # Réduction unique à la taille maximale de l'animation : les images suivantes partent de cette copie
+    image = pygame.transform.smoothscale(image, (int(base_width * 2.5), int(base_height * 2.5)))
+    neon_color = THEME_COLORS["neon"]  # Cyan vif
+    padding = 24
+    for frame in range(TRANSITION_FRAMES):
+        progress = frame / TRANSITION_FRAMES
         # Courbe sinusoïdale pour une montée/descente douce
         scale = 1.5 + 1.0 * math.sin(math.pi * progress)  # Échelle de 1.5 à 2.5
         new_width = int(base_width * scale)
         new_height = int(base_height * scale)
-
-        # Redimensionner l'image en préservant les proportions
         scaled_image = pygame.transform.smoothscale(image, (new_width, new_height))
-        image_rect = scaled_image.get_rect(center=(config.screen_width // 2, config.screen_height // 2))
-
         # Effet de fondu (opacité de 50% à 100% puis retour à 50%)
-        alpha = int(128 + 127 * math.cos(math.pi * progress))  # Opacité entre 128 et 255
-        scaled_image.set_alpha(alpha)
-
-        # Effet de glow néon pour l'image sélectionnée
-        neon_color = THEME_COLORS["neon"]  # Cyan vif
-        padding = 24
+        scaled_image.set_alpha(int(128 + 127 * math.cos(math.pi * progress)))
+        # Effet de glow néon
         neon_surface = pygame.Surface((new_width + 2 * padding, new_height + 2 * padding), pygame.SRCALPHA)
         pygame.draw.rect(neon_surface, neon_color + (40,), neon_surface.get_rect(), border_radius=24)
         pygame.draw.rect(neon_surface, neon_color + (100,), neon_surface.get_rect().inflate(-10, -10), border_radius=18)
-        screen.blit(neon_surface, (image_rect.left - padding, image_rect.top - padding), special_flags=pygame.BLEND_RGBA_ADD)
-
-        # Afficher l'image
-        screen.blit(scaled_image, image_rect)
-        pygame.display.flip()
-
-        # Contrôler la fréquence de rendu
-        pygame.time.wait(int(frame_time))
-
-    # Afficher l'image finale sans effet pour une transition propre
-    draw_gradient(screen, THEME_COLORS["background_top"], THEME_COLORS["background_bottom"])
-    final_image = pygame.transform.smoothscale(image, (base_width, base_height))
-    final_image.set_alpha(255)  # Opacité complète
-    final_rect = final_image.get_rect(center=(config.screen_width // 2, config.screen_height // 2))
-    screen.blit(final_image, final_rect)
-    pygame.display.flip()
+        transition_frames["frames"].append((scaled_image, neon_surface))
+    # Image finale sans effet pour une transition propre
+    transition_frames["final"] = pygame.transform.smoothscale(image, (base_width, base_height))
+
+
+def draw_validation_transition(screen, platform_index, elapsed):
+    """Dessine l'animation de sélection de la plateforme à elapsed ms de son début (image finale au-delà de config.transition_duration)."""
+    if transition_frames["index"] != platform_index:
+        prepare_validation_transition(platform_index)
+    center = (config.screen_width // 2, config.screen_height // 2)
+    if elapsed >= config.transition_duration or not transition_frames["frames"]:
+        if transition_frames["final"] is not None:
+            screen.blit(transition_frames["final"], transition_frames["final"].get_rect(center=center))
+        return
+    scaled_image, neon_surface = transition_frames["frames"][int(elapsed / config.transition_duration * TRANSITION_FRAMES)]
+    image_rect = scaled_image.get_rect(center=center)
+    screen.blit(neon_surface, neon_surface.get_rect(center=center), special_flags=pygame.BLEND_RGBA_ADD)
+    screen.blit(scaled_image, image_rect)
 
 # Écran de chargement
 def draw_loading_screen(screen):
@@ -187,7 +361,7 @@ def draw_loading_screen(screen):
     for i, line in enumerate(disclaimer_lines):
         wrapped_lines = wrap_text(line, config.small_font, max_text_width)
         for j, wrapped_line in enumerate(wrapped_lines):
-            text_surface = config.small_font.render(wrapped_line, True, THEME_COLORS["title_text"])
+            text_surface = render_text(config.small_font, wrapped_line, THEME_COLORS["title_text"])
             text_rect = text_surface.get_rect(center=(
                 config.screen_width // 2,
                 rect_y + padding_vertical + (i * len(wrapped_lines) + j + 0.5) * line_height - padding_between // 2
@@ -195,17 +369,20 @@ def draw_loading_screen(screen):
             screen.blit(text_surface, text_rect)
 
     loading_y = rect_y + rect_height + int(config.screen_height * 0.0926)
-    text = config.small_font.render(truncate_text_middle(f"{config.current_loading_system}", config.small_font, config.screen_width - 2 * margin_horizontal), True, THEME_COLORS["text"])
+    text = render_text(config.small_font, f"{config.current_loading_system}", THEME_COLORS["text"], config.screen_width - 2 * margin_horizontal, "filename")
     text_rect = text.get_rect(center=(config.screen_width // 2, loading_y))
     screen.blit(text, text_rect)
 
-    progress_text = config.small_font.render(_("loading_progress").format(int(config.loading_progress)), True, THEME_COLORS["text"])
+    progress_text = render_text(config.small_font, _("loading_progress").format(int(config.loading_progress)), THEME_COLORS["text"])
     progress_rect = progress_text.get_rect(center=(config.screen_width // 2, loading_y + int(config.screen_height * 0.0463)))
     screen.blit(progress_text, progress_rect)
 
     bar_width = int(config.screen_width * 0.2083)
     bar_height = int(config.screen_height * 0.037)
     progress_width = (bar_width * config.loading_progress) / 100
+    bar_rect = pygame.Rect(config.screen_width // 2 - bar_width // 2, loading_y + int(config.screen_height * 0.0926), bar_width, bar_height)
+    set_frame_layout()
+    damage_region("loading", text_rect.unionall([progress_rect, bar_rect]), config.current_loading_system, int(config.loading_progress), progress_width)
     pygame.draw.rect(screen, THEME_COLORS["button_idle"], (config.screen_width // 2 - bar_width // 2, loading_y + int(config.screen_height * 0.0926), bar_width, bar_height), border_radius=8)
     pygame.draw.rect(screen, THEME_COLORS["fond_lignes"], (config.screen_width // 2 - bar_width // 2, loading_y + int(config.screen_height * 0.0926), progress_width, bar_height), border_radius=8)
 
@@ -223,12 +400,12 @@ def draw_error_screen(screen):
     rect_x = (config.screen_width - rect_width) // 2
     rect_y = (config.screen_height - rect_height) // 2
 
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(wrapped_message):
-        text = config.small_font.render(line, True, THEME_COLORS["error_text"])
+        text = render_text(config.small_font, line, THEME_COLORS["error_text"])
         text_rect = text.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text, text_rect)
 
@@ -388,14 +565,77 @@ def get_control_display(action, default):
     # Fallback vers l'ancien système ou valeur par défaut
     return control_config.get('display', default)
 
-# Cache pour les images des plateformes
-platform_images_cache = {}
+# Grille des plateformes : à chaque changement de page (ou de résolution), les logos de la page sont lus
+# une seule fois sur disque et redimensionnés ; la tuile sélectionnée pulse entre PULSE_FRAMES tailles
+# précalculées à sa sélection. En régime établi, l'affichage ne fait plus que des blits.
+PULSE_FRAMES = 8
+platform_atlas = {"key": None, "sources": {}, "tiles": {}, "selected": None, "pulse": []}
+
+
+def _scale_platform_image(image, cell_size, scale):
+    orig_width, orig_height = image.get_width(), image.get_height()
+    max_size = int(cell_size * scale * 1.1)  # Légèrement plus grand que la cellule
+    ratio = min(max_size / orig_width, max_size / orig_height)
+    return pygame.transform.smoothscale(image, (int(orig_width * ratio), int(orig_height * ratio)))
+
+
+def _make_platform_tile(image, is_selected, glow_intensity=0):
+    """Surfaces d'une tuile : logo (translucide si non sélectionné), fond arrondi et halo néon si sélectionnée."""
+    width, height = image.get_size()
+    background = pygame.Surface((width + 10, height + 10), pygame.SRCALPHA)
+    bg_alpha = 220 if is_selected else 180  # Plus opaque pour l'item sélectionné
+    pygame.draw.rect(background, THEME_COLORS["fond_image"] + (bg_alpha,), background.get_rect(), border_radius=12)
+    tile = {"image": image, "background": background, "neon": None}
+    if is_selected:
+        neon_color = THEME_COLORS["neon"]
+        border_radius = 12
+        padding = 12
+        neon_surface = pygame.Surface((width + 2 * padding, height + 2 * padding), pygame.SRCALPHA)
+        pygame.draw.rect(neon_surface, neon_color + (glow_intensity,), neon_surface.get_rect(), border_radius=border_radius)
+        pygame.draw.rect(neon_surface, neon_color + (100,), neon_surface.get_rect().inflate(-10, -10), border_radius=border_radius)
+        pygame.draw.rect(neon_surface, neon_color + (200,), neon_surface.get_rect().inflate(-20, -20), width=1, border_radius=border_radius)
+        tile["neon"] = neon_surface
+    else:
+        # Légère transparence pour les items non sélectionnés
+        tile["image"] = image.copy()
+        tile["image"].set_alpha(220)
+    return tile
+
+
+def get_platform_page_tiles(start_idx, end_idx, cell_size):
+    """Tuiles non sélectionnées de la page [start_idx, end_idx), construites au premier affichage de la page."""
+    key = (start_idx, end_idx, cell_size, tuple(config.platforms[start_idx:end_idx]))
+    if platform_atlas["key"] != key:
+        platform_atlas.update(key=key, sources={}, tiles={}, selected=None, pulse=[])
+        for idx in range(start_idx, end_idx):
+            image = load_system_image(config.platform_dicts[idx])
+            if image:
+                platform_atlas["sources"][idx] = image
+                platform_atlas["tiles"][idx] = _make_platform_tile(_scale_platform_image(image, cell_size, 1.0), False)
+        logger.debug(f"Grille des plateformes : {len(platform_atlas['tiles'])} logos préparés pour les index {start_idx}-{end_idx - 1}")
+    return platform_atlas["tiles"]
+
+
+def get_platform_pulse_frame(idx, cell_size, current_time):
+    """Image de la tuile sélectionnée idx pour l'instant current_time, parmi PULSE_FRAMES précalculées."""
+    if platform_atlas["selected"] != idx:
+        platform_atlas["selected"] = idx
+        platform_atlas["pulse"] = []
+        image = platform_atlas["sources"].get(idx)
+        if image:
+            for frame in range(PULSE_FRAMES):
+                phase = math.sin(2 * math.pi * frame / PULSE_FRAMES)
+                platform_atlas["pulse"].append(_make_platform_tile(
+                    _scale_platform_image(image, cell_size, 1.5 + 0.1 * phase), True, 40 + int(30 * phase)))
+    if not platform_atlas["pulse"]:
+        return None
+    frame = int((current_time / 300) / (2 * math.pi) * PULSE_FRAMES) % PULSE_FRAMES
+    return platform_atlas["pulse"][frame]
+
 
 # Grille des systèmes 3x3
 def draw_platform_grid(screen):
     """Affiche la grille des plateformes avec un style moderne et fluide."""
-    global platform_images_cache
-    
     if not config.platforms or config.selected_platform >= len(config.platforms):
         platform_name = _("platform_no_platform")
         logger.warning("Aucune plateforme ou selected_platform hors limites")
@@ -405,7 +645,7 @@ def draw_platform_grid(screen):
     
     # Affichage du titre avec animation subtile
     title_text = f"{platform_name}"
-    title_surface = config.title_font.render(title_text, True, THEME_COLORS["text"])
+    title_surface = render_text(config.title_font, title_text, THEME_COLORS["text"])
     title_rect = title_surface.get_rect(center=(config.screen_width // 2, title_surface.get_height() // 2 + 20))
     title_rect_inflated = title_rect.inflate(60, 30)
     title_rect_inflated.topleft = ((config.screen_width - title_rect_inflated.width) // 2, 10)
@@ -444,99 +684,35 @@ def draw_platform_grid(screen):
     total_pages = (len(config.platforms) + systems_per_page - 1) // systems_per_page
     if total_pages > 1:
         page_indicator_text = _("platform_page").format(config.current_page + 1, total_pages)
-        page_indicator = config.small_font.render(page_indicator_text, True, THEME_COLORS["text"])
+        page_indicator = render_text(config.small_font, page_indicator_text, THEME_COLORS["text"])
         page_rect = page_indicator.get_rect(center=(config.screen_width // 2, config.screen_height - margin_bottom // 2))
         screen.blit(page_indicator, page_rect)
 
-    # Calculer une seule fois la pulsation pour les éléments sélectionnés
-    pulse = 0.1 * math.sin(current_time / 300)
-    glow_intensity = 40 + int(30 * math.sin(current_time / 300))
-    
-    # Pré-calcul des images pour optimiser le rendu
+    # Logos de la page pré-redimensionnés ; la tuile sélectionnée utilise l'image de pulsation du moment
     start_idx = config.current_page * systems_per_page
-    for idx in range(start_idx, start_idx + systems_per_page):
-        if idx >= len(config.platforms):
-            break
+    end_idx = min(start_idx + systems_per_page, len(config.platforms))
+    cell_size = min(col_width, row_height)
+    tiles = get_platform_page_tiles(start_idx, end_idx, cell_size)
+    for idx in range(start_idx, end_idx):
         grid_idx = idx - start_idx
         row = grid_idx // num_cols
         col = grid_idx % num_cols
         x = x_positions[col]
         y = y_positions[row]
-        
-        # Animation fluide pour l'item sélectionné
+
         is_selected = idx == config.selected_platform
-        scale_base = 1.5 if is_selected else 1.0
-        scale = scale_base + pulse if is_selected else scale_base
-            
-        platform_dict = config.platform_dicts[idx]
-        platform_id = platform_dict.get("platform", str(idx))
-        
-        # Utiliser le cache d'images pour éviter de recharger/redimensionner à chaque frame
-        cache_key = f"{platform_id}_{scale:.2f}"
-        if cache_key not in platform_images_cache:
-            image = load_system_image(platform_dict)
-            if image:
-                orig_width, orig_height = image.get_width(), image.get_height()
-                max_size = int(min(col_width, row_height) * scale * 1.1)  # Légèrement plus grand que la cellule
-                ratio = min(max_size / orig_width, max_size / orig_height)
-                new_width = int(orig_width * ratio)
-                new_height = int(orig_height * ratio)
-                scaled_image = pygame.transform.smoothscale(image, (new_width, new_height))
-                platform_images_cache[cache_key] = {
-                    "image": scaled_image,
-                    "width": new_width,
-                    "height": new_height,
-                    "last_used": current_time
-                }
-            else:
-                continue
-        else:
-            # Mettre à jour le timestamp de dernière utilisation
-            platform_images_cache[cache_key]["last_used"] = current_time
-            scaled_image = platform_images_cache[cache_key]["image"]
-            new_width = platform_images_cache[cache_key]["width"]
-            new_height = platform_images_cache[cache_key]["height"]
-        
-        image_rect = scaled_image.get_rect(center=(x, y))
+        tile = get_platform_pulse_frame(idx, cell_size, current_time) if is_selected else tiles.get(idx)
+        if tile is None:
+            continue
+        image_rect = tile["image"].get_rect(center=(x, y))
 
         # Effet visuel amélioré pour l'item sélectionné
-        if is_selected:
-            neon_color = THEME_COLORS["neon"]
-            border_radius = 12
-            padding = 12
-            rect_width = image_rect.width + 2 * padding
-            rect_height = image_rect.height + 2 * padding
-            
-            # Effet de glow dynamique
-            neon_surface = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
-            pygame.draw.rect(neon_surface, neon_color + (glow_intensity,), neon_surface.get_rect(), border_radius=border_radius)
-            pygame.draw.rect(neon_surface, neon_color + (100,), neon_surface.get_rect().inflate(-10, -10), border_radius=border_radius)
-            pygame.draw.rect(neon_surface, neon_color + (200,), neon_surface.get_rect().inflate(-20, -20), width=1, border_radius=border_radius)
-            screen.blit(neon_surface, (image_rect.left - padding, image_rect.top - padding), special_flags=pygame.BLEND_RGBA_ADD)
+        if tile["neon"] is not None:
+            screen.blit(tile["neon"], (image_rect.left - 12, image_rect.top - 12), special_flags=pygame.BLEND_RGBA_ADD)
 
         # Fond pour toutes les images
-        background_surface = pygame.Surface((image_rect.width + 10, image_rect.height + 10), pygame.SRCALPHA)
-        bg_alpha = 220 if is_selected else 180  # Plus opaque pour l'item sélectionné
-        pygame.draw.rect(background_surface, THEME_COLORS["fond_image"] + (bg_alpha,), background_surface.get_rect(), border_radius=12)
-        screen.blit(background_surface, (image_rect.left - 5, image_rect.top - 5))
-
-        # Affichage de l'image avec un léger effet de transparence pour les items non sélectionnés
-        if not is_selected:
-            # Appliquer la transparence seulement si nécessaire
-            temp_image = scaled_image.copy()
-            temp_image.set_alpha(220)
-            screen.blit(temp_image, image_rect)
-        else:
-            screen.blit(scaled_image, image_rect)
-    
-    # Nettoyer le cache périodiquement (garder seulement les images utilisées récemment)
-    if len(platform_images_cache) > 50:  # Limite arbitraire pour éviter une croissance excessive
-        current_time = pygame.time.get_ticks()
-        cache_timeout = 30000  # 30 secondes
-        keys_to_remove = [k for k, v in platform_images_cache.items() 
-                         if current_time - v["last_used"] > cache_timeout]
-        for key in keys_to_remove:
-            del platform_images_cache[key]
+        screen.blit(tile["background"], (image_rect.left - 5, image_rect.top - 5))
+        screen.blit(tile["image"], image_rect)
 
 # Liste des jeux
 def draw_game_list(screen):
@@ -559,12 +735,12 @@ def draw_game_list(screen):
         rect_x = (config.screen_width - rect_width) // 2
         rect_y = (config.screen_height - rect_height) // 2
 
-        screen.blit(OVERLAY, (0, 0))
+        draw_overlay(screen)
         pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
         pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
         for i, line in enumerate(lines):
-            text_surface = config.font.render(line, True, THEME_COLORS["text"])
+            text_surface = render_text(config.font, line, THEME_COLORS["text"])
             text_rect = text_surface.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
             screen.blit(text_surface, text_rect)
         return
@@ -589,11 +765,11 @@ def draw_game_list(screen):
     elif config.current_game >= config.scroll_offset + items_per_page:
         config.scroll_offset = config.current_game - items_per_page + 1
 
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     if config.search_mode:
         search_text = _("game_search").format(config.search_query + "_")
-        title_surface = config.search_font.render(search_text, True, THEME_COLORS["text"])
+        title_surface = render_text(config.search_font, search_text, THEME_COLORS["text"])
         title_rect = title_surface.get_rect(center=(config.screen_width // 2, title_surface.get_height() // 2 + 20))
         title_rect_inflated = title_rect.inflate(60, 30)
         title_rect_inflated.topleft = ((config.screen_width - title_rect_inflated.width) // 2, 10)
@@ -602,7 +778,7 @@ def draw_game_list(screen):
         screen.blit(title_surface, title_rect)
     elif config.filter_active:
         filter_text = _("game_filter").format(config.search_query)
-        title_surface = config.font.render(filter_text, True, THEME_COLORS["fond_lignes"])
+        title_surface = render_text(config.font, filter_text, THEME_COLORS["fond_lignes"])
         title_rect = title_surface.get_rect(center=(config.screen_width // 2, title_surface.get_height() // 2 + 20))
         title_rect_inflated = title_rect.inflate(60, 30)
         title_rect_inflated.topleft = ((config.screen_width - title_rect_inflated.width) // 2, 10)
@@ -611,7 +787,7 @@ def draw_game_list(screen):
         screen.blit(title_surface, title_rect)
     else:
         title_text = _("game_count").format(platform_name, game_count)
-        title_surface = config.title_font.render(title_text, True, THEME_COLORS["text"])
+        title_surface = render_text(config.title_font, title_text, THEME_COLORS["text"])
         title_rect = title_surface.get_rect(center=(config.screen_width // 2, title_surface.get_height() // 2 + 20))
         title_rect_inflated = title_rect.inflate(60, 30)
         title_rect_inflated.topleft = ((config.screen_width - title_rect_inflated.width) // 2, 10)
@@ -619,19 +795,37 @@ def draw_game_list(screen):
         pygame.draw.rect(screen, THEME_COLORS["border"], title_rect_inflated, 2, border_radius=12)
         screen.blit(title_surface, title_rect)
 
+    set_frame_layout(config.current_platform, game_count, config.scroll_offset, items_per_page)
+    damage_region("title", title_rect_inflated, config.search_mode, config.filter_active, config.search_query)
+
     pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
-    for i in range(config.scroll_offset, min(config.scroll_offset + items_per_page, len(games))):
+    # Tailles des lignes visibles : celle du catalogue, sinon celle obtenue par HEAD en tâche de fond
+    visible = range(config.scroll_offset, min(config.scroll_offset + items_per_page, len(games)))
+    visible_urls = [games[i][1] for i in visible if isinstance(games[i], (list, tuple)) and len(games[i]) > 1]
+    probed_sizes = size_probe.get_cached_sizes(visible_urls)
+    size_probe.schedule_probe([url for url in visible_urls if url not in probed_sizes])
+    size_column = config.small_font.size("0000.0M")[0] + 20
+
+    for i in visible:
         game_name = games[i][0] if isinstance(games[i], (list, tuple)) else games[i]
         is_marked = i in getattr(config, 'selected_games', set())
         # Couleur verte si jeu sous curseur OU marqué en multi-sélection
         color = THEME_COLORS["fond_lignes"] if (i == config.current_game or is_marked) else THEME_COLORS["text"]
         # Préfixe ASCII pour distinguer les jeux marqués (éviter collision glyphes)
         prefix = "[X] " if is_marked else "    "
-        game_text = truncate_text_middle(prefix + game_name, config.small_font, rect_width - 40, is_filename=False)
-        text_surface = config.small_font.render(game_text, True, color)
-        text_rect = text_surface.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + (i - config.scroll_offset) * line_height + line_height // 2))
+        row_center_y = rect_y + margin_top_bottom + (i - config.scroll_offset) * line_height + line_height // 2
+        size_text = games[i][2] if isinstance(games[i], (list, tuple)) and len(games[i]) > 2 else ""
+        if not size_text and isinstance(games[i], (list, tuple)) and len(games[i]) > 1 and games[i][1] in probed_sizes:
+            size_text = size_probe.format_catalog_size(probed_sizes[games[i][1]])
+        if size_text:
+            size_surface = render_text(config.small_font, str(size_text), color)
+            screen.blit(size_surface, size_surface.get_rect(midright=(rect_x + rect_width - 25, row_center_y)))
+        text_surface = render_text(config.small_font, prefix + game_name, color, rect_width - 40 - 2 * size_column, "middle")
+        text_rect = text_surface.get_rect(center=(config.screen_width // 2, row_center_y))
+        damage_region(("row", i - config.scroll_offset), (rect_x, row_center_y - line_height // 2, rect_width, line_height),
+                      prefix + game_name, color, size_text, i == config.current_game)
         if i == config.current_game:
             glow_surface = pygame.Surface((text_rect.width + 20, text_rect.height + 10), pygame.SRCALPHA)
             pygame.draw.rect(glow_surface, THEME_COLORS["fond_lignes"] + (50,), (10, 5, text_rect.width, text_rect.height), border_radius=8)
@@ -674,29 +868,54 @@ def format_size(size):
     return f"{size:.1f} Po"
 
 
+def format_eta(seconds):
+    """Formate un temps restant en h:mm:ss ou m:ss."""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def draw_throughput_graph(screen, rect, samples):
+    """Dessine la courbe des débits récents (Mo/s) dans rect ; les creux à zéro signalent les blocages."""
+    if rect.height < 8 or len(samples) < 2:
+        return
+    pygame.draw.rect(screen, THEME_COLORS["button_idle"], rect, border_radius=4)
+    pygame.draw.rect(screen, THEME_COLORS["border"], rect, 1, border_radius=4)
+    peak = max(samples) or 1.0
+    step = (rect.width - 4) / (len(samples) - 1)
+    points = [(rect.x + 2 + i * step, rect.bottom - 2 - (rect.height - 4) * value / peak) for i, value in enumerate(samples)]
+    pygame.draw.lines(screen, THEME_COLORS["fond_lignes"], False, points, 2)
+    peak_surface = render_text(config.small_font, f"{peak:.1f} Mo/s", THEME_COLORS["text"])
+    screen.blit(peak_surface, (rect.x - peak_surface.get_width() - 8, rect.centery - peak_surface.get_height() // 2))
+
+
 def draw_history_list(screen):
     # logger.debug(f"Dessin historique, history={config.history}, needs_redraw={config.needs_redraw}")
     history = config.history if hasattr(config, 'history') else load_history()
     history_count = len(history)
 
-    # Cherche une entrée en cours de téléchargement pour afficher la vitesse
+    # Cherche une entrée en cours de téléchargement pour afficher la vitesse lissée et le temps restant
     speed_str = ""
     for entry in history:
         if entry.get("status") in ["Téléchargement", "downloading"]:
             speed = entry.get("speed", 0.0)
             if speed and speed > 0:
                 speed_str = f" - {speed:.2f} Mo/s"
+                if entry.get("eta") is not None:
+                    speed_str += f" - {format_eta(entry['eta'])}"
             break
 
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     title_text = _("history_title").format(history_count) + speed_str
-    title_surface = config.title_font.render(title_text, True, THEME_COLORS["text"])
+    title_surface = render_text(config.title_font, title_text, THEME_COLORS["text"])
     title_rect = title_surface.get_rect(center=(config.screen_width // 2, title_surface.get_height() // 2 + 20))
     title_rect_inflated = title_rect.inflate(60, 30)
     title_rect_inflated.topleft = ((config.screen_width - title_rect_inflated.width) // 2, 10)
     pygame.draw.rect(screen, THEME_COLORS["button_idle"], title_rect_inflated, border_radius=12)  # fond opaque
     pygame.draw.rect(screen, THEME_COLORS["border"], title_rect_inflated, 2, border_radius=12)
     screen.blit(title_surface, title_rect)
+    damage_region("title", title_rect_inflated, title_text)
 
     # Define column widths as percentages of available space
     column_width_percentages = {
@@ -726,16 +945,6 @@ def draw_history_list(screen):
     else:
         config.current_history_item = 0
 
-    speed = 0.0
-    if history and history[config.current_history_item].get("status") in ["Téléchargement", "downloading"]:
-        speed = history[config.current_history_item].get("speed", 0.0)
-    if speed > 0:
-        speed_str = f"{speed:.2f} Mo/s"
-        title_text = _("history_title").format(history_count) + f" {speed_str}"
-    else:
-        title_text = _("history_title").format(history_count)
-    title_surface = config.title_font.render(title_text, True, THEME_COLORS["text"])
-   
 
     if not history:
         logger.debug("Aucun historique disponible")
@@ -749,12 +958,12 @@ def draw_history_list(screen):
         rect_x = (config.screen_width - rect_width) // 2
         rect_y = (config.screen_height - rect_height) // 2
 
-        screen.blit(OVERLAY, (0, 0))
+        draw_overlay(screen)
         pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
         pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
         for i, line in enumerate(lines):
-            text_surface = config.font.render(line, True, THEME_COLORS["text"])
+            text_surface = render_text(config.font, line, THEME_COLORS["text"])
             text_rect = text_surface.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
             screen.blit(text_surface, text_rect)
         return
@@ -762,7 +971,14 @@ def draw_history_list(screen):
     available_height = config.screen_height - title_height - extra_margin_top - extra_margin_bottom - 2 * margin_top_bottom
     items_per_page = available_height // line_height
 
-    rect_height = header_height + items_per_page * line_height + 2 * margin_top_bottom
+    # Débit récent du téléchargement sélectionné : une ligne du tableau lui est réservée
+    throughput_stats = None
+    if history[config.current_history_item].get("status") in ["Téléchargement", "downloading"]:
+        throughput_stats = get_transfer_stats(history[config.current_history_item].get("url"))
+    graph_rows = 1 if throughput_stats and items_per_page > 2 else 0
+    items_per_page -= graph_rows
+
+    rect_height = header_height + (items_per_page + graph_rows) * line_height + 2 * margin_top_bottom
     rect_x = (config.screen_width - rect_width) // 2
     rect_y = title_height + extra_margin_top + (config.screen_height - title_height - extra_margin_top - extra_margin_bottom - rect_height) // 2
 
@@ -773,9 +989,19 @@ def draw_history_list(screen):
         config.history_scroll_offset = config.current_history_item - items_per_page + 1
 
 
+    set_frame_layout(len(history), config.history_scroll_offset, items_per_page, graph_rows)
+
     pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
+    if graph_rows:
+        graph_top = rect_y + margin_top_bottom + header_height + items_per_page * line_height
+        graph_rect = pygame.Rect(rect_x + rect_width // 2, graph_top + 3, rect_width // 2 - 20, line_height - 6)
+        samples = throughput_stats.timeline()
+        draw_throughput_graph(screen, graph_rect, samples)
+        # L'étiquette du pic est dessinée à gauche de la courbe
+        damage_region("graph", (rect_x, graph_top, rect_width, line_height), tuple(samples))
+
     headers = [_("history_column_system"), _("history_column_game"), _("history_column_size"), _("history_column_status")]
     header_y = rect_y + margin_top_bottom + header_height // 2
     header_x_positions = [
@@ -785,7 +1011,7 @@ def draw_history_list(screen):
         rect_x + 20 + col_platform_width + col_game_width + col_size_width + col_status_width // 2
     ]
     for header, x_pos in zip(headers, header_x_positions):
-        text_surface = config.small_font.render(header, True, THEME_COLORS["text"])
+        text_surface = render_text(config.small_font, header, THEME_COLORS["text"])
         text_rect = text_surface.get_rect(center=(x_pos, header_y))
         screen.blit(text_surface, text_rect)
 
@@ -835,21 +1061,18 @@ def draw_history_list(screen):
             status_text = status
             #logger.debug(f"Affichage statut inconnu: {game_name}, status={status_text}")
 
-        platform_text = truncate_text_end(platform, config.small_font, col_platform_width - 10)
-        game_text = truncate_text_end(game_name, config.small_font, col_game_width - 10)
-        size_text = truncate_text_end(size_text, config.small_font, col_size_width - 10)
-        status_text = truncate_text_middle(status_text, config.small_font, col_status_width - 10, is_filename=False)
-
         y_pos = rect_y + margin_top_bottom + header_height + idx * line_height + line_height // 2
-        platform_surface = config.small_font.render(platform_text, True, color)
-        game_surface = config.small_font.render(game_text, True, color)
-        size_surface = config.small_font.render(size_text, True, color)  # Correction ici
-        status_surface = config.small_font.render(status_text, True, color)
+        platform_surface = render_text(config.small_font, platform, color, col_platform_width - 10, "end")
+        game_surface = render_text(config.small_font, game_name, color, col_game_width - 10, "end")
+        size_surface = render_text(config.small_font, size_text, color, col_size_width - 10, "end")
+        status_surface = render_text(config.small_font, status_text, color, col_status_width - 10, "middle")
 
         platform_rect = platform_surface.get_rect(center=(header_x_positions[0], y_pos))
         game_rect = game_surface.get_rect(center=(header_x_positions[1], y_pos))
         size_rect = size_surface.get_rect(center=(header_x_positions[2], y_pos))
         status_rect = status_surface.get_rect(center=(header_x_positions[3], y_pos))
+        damage_region(("row", idx), (rect_x, y_pos - line_height // 2, rect_width, line_height),
+                      platform, game_name, size_text, status_text, color)
 
         if i == config.current_history_item:
             glow_surface = pygame.Surface((rect_width - 40, line_height), pygame.SRCALPHA)
@@ -888,7 +1111,7 @@ def draw_history_scrollbar(screen, scroll_offset, total_items, visible_items, x,
 # Écran confirmation vider historique
 def draw_clear_history_dialog(screen):
     """Affiche la boîte de dialogue de confirmation pour vider l'historique."""
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     message = _("confirm_clear_history")
     wrapped_message = wrap_text(message, config.font, config.screen_width - 80)
@@ -906,7 +1129,7 @@ def draw_clear_history_dialog(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(wrapped_message):
-        text = config.font.render(line, True, THEME_COLORS["text"])
+        text = render_text(config.font, line, THEME_COLORS["text"])
         text_rect = text.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text, text_rect)
 
@@ -916,7 +1139,7 @@ def draw_clear_history_dialog(screen):
 
 def draw_cancel_download_dialog(screen):
     """Affiche la boîte de dialogue de confirmation pour annuler un téléchargement."""
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     message = _("confirm_cancel_download")
     wrapped_message = wrap_text(message, config.font, config.screen_width - 80)
@@ -934,7 +1157,7 @@ def draw_cancel_download_dialog(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(wrapped_message):
-        text = config.font.render(line, True, THEME_COLORS["text"])
+        text = render_text(config.font, line, THEME_COLORS["text"])
         text_rect = text.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text, text_rect)
 
@@ -945,6 +1168,7 @@ def draw_cancel_download_dialog(screen):
 # Affichage du clavier virtuel sur non-PC
 def draw_virtual_keyboard(screen):
     """Affiche un clavier virtuel avec un style moderne."""
+    damage_full()
     keyboard_layout = [
         ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9'],
         ['A', 'Z', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P'],
@@ -976,7 +1200,7 @@ def draw_virtual_keyboard(screen):
             else:
                 pygame.draw.rect(screen, THEME_COLORS["button_idle"], key_rect, border_radius=8)
             pygame.draw.rect(screen, THEME_COLORS["border"], key_rect, 1, border_radius=8)
-            text = config.font.render(key, True, THEME_COLORS["text"])
+            text = render_text(config.font, key, THEME_COLORS["text"])
             text_rect = text.get_rect(center=key_rect.center)
             screen.blit(text, text_rect)
 
@@ -998,7 +1222,7 @@ def draw_progress_screen(screen):
     # S'assurer que le pourcentage est entre 0 et 100
     progress_percent = max(0, min(100, progress_percent))
 
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     title_text = _("download_status").format(status, truncate_text_middle(game_name, config.font, config.screen_width - 200))
     title_lines = wrap_text(title_text, config.font, config.screen_width - 80)
@@ -1018,7 +1242,7 @@ def draw_progress_screen(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(title_lines):
-        title_render = config.font.render(line, True, THEME_COLORS["text"])
+        title_render = render_text(config.font, line, THEME_COLORS["text"])
         title_rect = title_render.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(title_render, title_rect)
 
@@ -1028,6 +1252,9 @@ def draw_progress_screen(screen):
     if total_size > 0:
         # Limiter le pourcentage entre 0 et 100 pour l'affichage de la barre
         progress_width = int(bar_width * (min(100, max(0, progress_percent)) / 100))
+        pygame.draw.rect(screen, THEME_COLORS["fond_lignes"], (rect_x + 20, bar_y, progress_width, bar_height), border_radius=8)
+    set_frame_layout(url, title_text)
+    damage_region("bar", (rect_x + 20, bar_y, bar_width, bar_height), progress_width)
 
 
 ## Ancienne fonction draw_popup_result_download supprimée (popup de fin de téléchargement retiré)
@@ -1068,12 +1295,12 @@ def draw_extension_warning(screen):
         rect_x = (config.screen_width - rect_width) // 2
         rect_y = (config.screen_height - rect_height) // 2
 
-        screen.blit(OVERLAY, (0, 0))
+        draw_overlay(screen)
         pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
         pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
         for i, line in enumerate(lines):
-            text_surface = config.font.render(line, True, THEME_COLORS["warning_text"])
+            text_surface = render_text(config.font, line, THEME_COLORS["warning_text"])
             text_rect = text_surface.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
             screen.blit(text_surface, text_rect)
 
@@ -1091,12 +1318,12 @@ def draw_extension_warning(screen):
         rect_x = (config.screen_width - rect_width) // 2
         rect_y = (config.screen_height - rect_height) // 2
 
-        screen.blit(OVERLAY, (0, 0))
+        draw_overlay(screen)
         pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, rect_width, rect_height), border_radius=12)
         pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
         for i, line in enumerate(wrapped_error):
-            error_surface = config.font.render(line, True, THEME_COLORS["error_text"])
+            error_surface = render_text(config.font, line, THEME_COLORS["error_text"])
             error_rect = error_surface.get_rect(center=(config.screen_width // 2, rect_y + 20 + i * line_height + line_height // 2))
             screen.blit(error_surface, error_rect)
 
@@ -1113,26 +1340,33 @@ def draw_controls(screen, menu_state, current_music_name=None, music_popup_start
         if current_time - config.music_popup_start_time < 3.0:  # Afficher pendant 3 secondes
             control_text += f" | {config.current_music_name}"
     max_width = config.screen_width - 40
-    wrapped_controls = wrap_text(control_text, config.small_font, max_width)
-    line_height = config.small_font.get_height() + 5
-    rect_height = len(wrapped_controls) * line_height + 20
-    rect_y = config.screen_height - rect_height - 5
     rect_x = (config.screen_width - max_width) // 2
 
-    pygame.draw.rect(screen, THEME_COLORS["button_idle"], (rect_x, rect_y, max_width, rect_height), border_radius=8)
-    pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, max_width, rect_height), 1, border_radius=8)
-
-    for i, line in enumerate(wrapped_controls):
-        text_surface = config.small_font.render(line, True, THEME_COLORS["text"])
-        text_rect = text_surface.get_rect(center=(config.screen_width // 2, rect_y + 10 + i * line_height + line_height // 2))
-        screen.blit(text_surface, text_rect)
+    # Le bandeau ne change qu'avec son texte : il est rendu une fois puis recopié
+    key = ("controls", control_text, max_width, config.small_font)
+    layer = _layer_cache.get(key)
+    if layer is None:
+        wrapped_controls = wrap_text(control_text, config.small_font, max_width)
+        line_height = config.small_font.get_height() + 5
+        rect_height = len(wrapped_controls) * line_height + 20
+        # Couleurs opaques, comme pygame.draw directement sur l'écran
+        layer = pygame.Surface((max_width, rect_height), pygame.SRCALPHA)
+        pygame.draw.rect(layer, THEME_COLORS["button_idle"][:3], (0, 0, max_width, rect_height), border_radius=8)
+        pygame.draw.rect(layer, THEME_COLORS["border"], (0, 0, max_width, rect_height), 1, border_radius=8)
+        for i, line in enumerate(wrapped_controls):
+            text_surface = render_text(config.small_font, line, THEME_COLORS["text"])
+            text_rect = text_surface.get_rect(center=(max_width // 2, 10 + i * line_height + line_height // 2))
+            layer.blit(text_surface, text_rect)
+        layer = _store_layer(key, layer)
+    layer_rect = screen.blit(layer, (rect_x, config.screen_height - layer.get_height() - 5))
+    damage_region("controls", layer_rect, control_text)
 
 # Menu pause
 def draw_language_menu(screen):
     """Dessine le menu de sélection de langue avec un style moderne."""
     from language import get_available_languages, get_language_name
     
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     
     # Obtenir les langues disponibles
     available_languages = get_available_languages()
@@ -1143,7 +1377,7 @@ def draw_language_menu(screen):
     
     # Titre
     title_text = _("language_select_title")
-    title_surface = config.font.render(title_text, True, THEME_COLORS["text"])
+    title_surface = render_text(config.font, title_text, THEME_COLORS["text"])
     title_rect = title_surface.get_rect(center=(config.screen_width // 2, config.screen_height // 4))
     
     # Fond du titre
@@ -1174,19 +1408,19 @@ def draw_language_menu(screen):
         pygame.draw.rect(screen, THEME_COLORS["border"], (button_x, button_y, button_width, button_height), 2, border_radius=10)
         
         # Texte du bouton
-        text_surface = config.font.render(lang_name, True, THEME_COLORS["text"])
+        text_surface = render_text(config.font, lang_name, THEME_COLORS["text"])
         text_rect = text_surface.get_rect(center=(button_x + button_width // 2, button_y + button_height // 2))
         screen.blit(text_surface, text_rect)
     
     # Instructions
     instruction_text = _("language_select_instruction")
-    instruction_surface = config.small_font.render(instruction_text, True, THEME_COLORS["text"])
+    instruction_surface = render_text(config.small_font, instruction_text, THEME_COLORS["text"])
     instruction_rect = instruction_surface.get_rect(center=(config.screen_width // 2, config.screen_height - 50))
     screen.blit(instruction_surface, instruction_rect)
 
 def draw_pause_menu(screen, selected_option):
     """Dessine le menu pause avec un style moderne."""
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     # Option musique dynamique
     if config.music_enabled:
@@ -1269,7 +1503,7 @@ def draw_controls_help(screen, previous_state):
     if previous_state not in allowed_states:
         return
 
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     # Paramètres d'affichage
     font = config.small_font
@@ -1298,7 +1532,7 @@ def draw_controls_help(screen, previous_state):
         total_height = 0
         for section_title, lines in cat_pairs:
             # Titre section
-            sec_surf = section_font.render(section_title, True, THEME_COLORS["fond_lignes"])
+            sec_surf = render_text(section_font, section_title, THEME_COLORS["fond_lignes"])
             wrapped.append((True, sec_surf))
             total_height += sec_surf.get_height() + line_spacing
 
@@ -1312,13 +1546,13 @@ def draw_controls_help(screen, previous_state):
                         cur = test
                     else:
                         if cur:
-                            line_surf = font.render(cur, True, THEME_COLORS["text"])
+                            line_surf = render_text(font, cur, THEME_COLORS["text"])
                             wrapped.append((False, line_surf))
                             total_height += line_surf.get_height() + line_spacing
                             max_width = max(max_width, line_surf.get_width())
                         cur = word
                 if cur:
-                    line_surf = font.render(cur, True, THEME_COLORS["text"])
+                    line_surf = render_text(font, cur, THEME_COLORS["text"])
                     wrapped.append((False, line_surf))
                     total_height += line_surf.get_height() + line_spacing
                     max_width = max(max_width, line_surf.get_width())
@@ -1337,7 +1571,7 @@ def draw_controls_help(screen, previous_state):
     content_width = min(max_panel_width - 2 * padding, max(col_widths_sum, col1_w + col2_w + inter_col_spacing))
     panel_width = content_width + 2 * padding
 
-    title_surf = title_font.render(_("controls_help_title"), True, THEME_COLORS["text"])
+    title_surf = render_text(title_font, _("controls_help_title"), THEME_COLORS["text"])
     title_height = title_surf.get_height()
 
     content_height = max(col1_h, col2_h)
@@ -1397,13 +1631,7 @@ def draw_controls_help(screen, previous_state):
 # Menu Quitter Appli
 def draw_confirm_dialog(screen):
     """Affiche la boîte de dialogue de confirmation pour quitter."""
-    global OVERLAY
-    if OVERLAY is None or OVERLAY.get_size() != (config.screen_width, config.screen_height):
-        OVERLAY = pygame.Surface((config.screen_width, config.screen_height), pygame.SRCALPHA)
-        OVERLAY.fill((0, 0, 0, 150))
-        logger.debug("OVERLAY recréé dans draw_confirm_dialog")
-
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     message = _("confirm_exit")
     wrapped_message = wrap_text(message, config.font, config.screen_width - 80)
     line_height = config.font.get_height() + 5
@@ -1420,7 +1648,7 @@ def draw_confirm_dialog(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(wrapped_message):
-        text = config.font.render(line, True, THEME_COLORS["text"])
+        text = render_text(config.font, line, THEME_COLORS["text"])
         text_rect = text.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text, text_rect)
 
@@ -1431,13 +1659,7 @@ def draw_confirm_dialog(screen):
 # draw_redownload_game_cache_dialog
 def draw_redownload_game_cache_dialog(screen):
     """Affiche la boîte de dialogue de confirmation pour retélécharger le cache des jeux."""
-    global OVERLAY
-    if OVERLAY is None or OVERLAY.get_size() != (config.screen_width, config.screen_height):
-        OVERLAY = pygame.Surface((config.screen_width, config.screen_height), pygame.SRCALPHA)
-        OVERLAY.fill((0, 0, 0, 150))
-        logger.debug("OVERLAY recréé dans draw_redownload_game_cache_dialog")
-
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
     message = _("confirm_redownload_cache")
     wrapped_message = wrap_text(message, config.small_font, config.screen_width - 80)
     line_height = config.small_font.get_height() + 5
@@ -1454,7 +1676,7 @@ def draw_redownload_game_cache_dialog(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (rect_x, rect_y, rect_width, rect_height), 2, border_radius=12)
 
     for i, line in enumerate(wrapped_message):
-        text = config.small_font.render(line, True, THEME_COLORS["text"])
+        text = render_text(config.small_font, line, THEME_COLORS["text"])
         text_rect = text.get_rect(center=(config.screen_width // 2, rect_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text, text_rect)
 
@@ -1469,7 +1691,7 @@ def draw_redownload_game_cache_dialog(screen):
 # Popup avec compte à rebours
 def draw_popup(screen):
     """Dessine un popup avec un message et un compte à rebours."""
-    screen.blit(OVERLAY, (0, 0))
+    draw_overlay(screen)
 
     popup_width = int(config.screen_width * 0.8)
     line_height = config.small_font.get_height() + 10
@@ -1484,13 +1706,13 @@ def draw_popup(screen):
     pygame.draw.rect(screen, THEME_COLORS["border"], (popup_x, popup_y, popup_width, popup_height), 2, border_radius=12)
 
     for i, line in enumerate(text_lines):
-        text_surface = config.small_font.render(line, True, THEME_COLORS["text"])
+        text_surface = render_text(config.small_font, line, THEME_COLORS["text"])
         text_rect = text_surface.get_rect(center=(config.screen_width // 2, popup_y + margin_top_bottom + i * line_height + line_height // 2))
         screen.blit(text_surface, text_rect)
 
     remaining_time = max(0, config.popup_timer // 1000)
     countdown_text = _("popup_countdown").format(remaining_time, 's' if remaining_time != 1 else '')
-    countdown_surface = config.small_font.render(countdown_text, True, THEME_COLORS["text"])
+    countdown_surface = render_text(config.small_font, countdown_text, THEME_COLORS["text"])
     countdown_rect = countdown_surface.get_rect(center=(config.screen_width // 2, popup_y + margin_top_bottom + len(text_lines) * line_height + line_height // 2))
     screen.blit(countdown_surface, countdown_rect)
 
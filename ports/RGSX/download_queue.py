@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import logging
+import config
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# File de téléchargements persistante (download_queue.json) : {task_id: élément}
+# Un élément est "queued" (en attente d'un emplacement), "running" (transfert en cours)
+# ou "paused" (interrompu par l'arrêt de l'application, fichier partiel conservé).
+QUEUE_STATUSES = ("queued", "running", "paused")
+
+_lock = threading.Lock()
+
+
+def load_download_queue():
+    """Charge la file depuis download_queue.json."""
+    queue_path = getattr(config, 'DOWNLOAD_QUEUE_PATH')
+    try:
+        if not os.path.exists(queue_path):
+            return {}
+        with open(queue_path, "r", encoding='utf-8') as f:
+            items = json.load(f)
+        if not isinstance(items, dict):
+            logger.warning(f"File de téléchargements invalide : {queue_path}")
+            return {}
+        return {task_id: item for task_id, item in items.items()
+                if isinstance(item, dict) and item.get("url") and item.get("status") in QUEUE_STATUSES}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Erreur lors de la lecture de {queue_path} : {e}")
+        return {}
+
+
+def save_download_queue(items):
+    """Sauvegarde la file dans download_queue.json (écriture atomique)."""
+    queue_path = getattr(config, 'DOWNLOAD_QUEUE_PATH')
+    try:
+        os.makedirs(os.path.dirname(queue_path), exist_ok=True)
+        tmp_path = queue_path + ".tmp"
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump(items, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, queue_path)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'écriture de {queue_path} : {e}")
+
+
+def enqueue_download(task_id, url, platform, game_name, is_zip_non_supported=False, force=False):
+    """Ajoute un téléchargement à la file (statut "queued")."""
+    with _lock:
+        items = load_download_queue()
+        items[task_id] = {
+            "url": url,
+            "platform": platform,
+            "game_name": game_name,
+            "is_zip_non_supported": bool(is_zip_non_supported),
+            "force": bool(force),
+            "status": "queued",
+            "offset": 0,
+            "total_size": 0,
+            "dest_path": None,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        save_download_queue(items)
+
+
+def update_download(task_id, **fields):
+    """Met à jour un élément de la file (status, offset, total_size, dest_path)."""
+    with _lock:
+        items = load_download_queue()
+        if task_id not in items:
+            return
+        items[task_id].update(fields)
+        save_download_queue(items)
+
+
+def remove_download(task_id):
+    """Retire un élément de la file (téléchargement terminé, échoué ou annulé)."""
+    with _lock:
+        items = load_download_queue()
+        if items.pop(task_id, None) is not None:
+            save_download_queue(items)
+
+
+def get_pending_downloads():
+    """Retourne les éléments à reprendre, dans l'ordre d'ajout : [(task_id, élément)]."""
+    with _lock:
+        items = load_download_queue()
+    return list(items.items())
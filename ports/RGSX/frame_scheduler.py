@@ -0,0 +1,88 @@
+import asyncio
+import platform
+import time
+import logging
+import pygame  # type: ignore
+import config
+from controls import key_states
+
+logger = logging.getLogger(__name__)
+
+# Cadence de la boucle principale : cadence fixe uniquement quand quelque chose s'anime
+# (transition, chargement, téléchargement, popup à rebours, répétition de touche) ; sinon la boucle
+# dort dans pygame.event.wait jusqu'à la prochaine entrée au lieu de tourner à vide.
+ACTIVE_FPS = 30
+# En attente, on se réveille régulièrement pour les redessins demandés par les threads de fond
+# (config.needs_redraw : tailles sondées, post-traitement...).
+IDLE_POLL_MS = 100
+# Pilotes vidéo où SDL attend réellement les événements ; ailleurs (kmsdrm des consoles portables,
+# dummy...) SDL_WaitEventTimeout scrute toutes les millisecondes : on dort alors par tranches.
+WAITING_DRIVERS = {"x11", "wayland", "windows", "cocoa"}
+IDLE_SLEEP_MS = 40
+CPU_REPORT_INTERVAL = 60
+# Dans le navigateur (Emscripten), la boucle ne doit jamais bloquer
+BLOCKING_WAIT = platform.system() != "Emscripten"
+ANIMATED_STATES = {"loading", "download_progress", "restart_popup", "update_result", "controls_mapping"}
+
+clock = pygame.time.Clock()
+# Temps CPU et temps écoulé par état (menu_state, suffixé de ":actif" en cadence fixe)
+cpu_stats = {}
+_last_sample = (time.process_time(), time.monotonic())
+_last_report = time.monotonic()
+
+
+def is_animating():
+    """Vrai si l'écran doit être rafraîchi à cadence fixe."""
+    if config.transition_state != "idle" or config.menu_state in ANIMATED_STATES:
+        return True
+    if config.download_tasks or any(state["pressed"] for state in key_states.values()):
+        return True
+    # Autres tâches asyncio que main() (téléchargements relancés, vérifications...) : il faut leur rendre la main
+    return len(asyncio.all_tasks()) > 1
+
+
+def wait_for_events():
+    """Retourne les événements en attente. Au repos, bloque jusqu'au premier événement
+    ou jusqu'à ce qu'un thread demande un redessin."""
+    if not BLOCKING_WAIT or is_animating() or config.needs_redraw:
+        return pygame.event.get()
+    blocking = pygame.display.get_driver() in WAITING_DRIVERS
+    while True:
+        if blocking:
+            event = pygame.event.wait(IDLE_POLL_MS)
+            if event.type != pygame.NOEVENT:
+                return [event] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+            if events:
+                return events
+            pygame.time.wait(IDLE_SLEEP_MS)
+        if config.needs_redraw or is_animating():
+            return []
+
+
+async def next_frame():
+    """Fin d'itération de la boucle principale : limite la cadence si l'écran s'anime,
+    rend la main aux tâches asyncio et comptabilise le temps CPU de l'état courant."""
+    animating = is_animating()
+    if animating or not BLOCKING_WAIT:
+        clock.tick(ACTIVE_FPS)
+    await asyncio.sleep(0)
+    _record_cpu(config.menu_state + (":actif" if animating else ""))
+
+
+def _record_cpu(state):
+    global _last_sample, _last_report
+    cpu, wall = time.process_time(), time.monotonic()
+    stats = cpu_stats.setdefault(state, [0.0, 0.0])
+    stats[0] += cpu - _last_sample[0]
+    stats[1] += wall - _last_sample[1]
+    _last_sample = (cpu, wall)
+    if wall - _last_report >= CPU_REPORT_INTERVAL:
+        _last_report = wall
+        logger.debug("CPU par état : " + ", ".join(f"{name} {usage:.1f}%" for name, usage in get_cpu_usage().items()))
+
+
+def get_cpu_usage():
+    """Pourcentage d'un cœur utilisé par le processus dans chaque état, depuis le démarrage."""
+    return {state: 100.0 * cpu / wall for state, (cpu, wall) in cpu_stats.items() if wall > 0}
@@ -0,0 +1,99 @@
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils import load_games
+from game_search import build_search_index
+
+logger = logging.getLogger(__name__)
+
+# Listes de jeux chargées par un thread dédié : la plateforme validée passe en premier,
+# les plateformes voisines de la sélection sont préchargées de façon spéculative.
+# Le thread construit aussi l'index de recherche (game_search), pour que l'entrée dans une plateforme
+# de plusieurs dizaines de milliers de jeux ne coûte rien au thread principal.
+# Les MAX_CACHED_LISTS dernières listes restent en mémoire (les plus anciennes sont oubliées).
+MAX_CACHED_LISTS = 5
+
+_lock = threading.Lock()
+_executor = None
+_lists = OrderedDict()  # platform_id -> Future de (liste des jeux, index de recherche)
+_prefetches = {}  # platform_id -> Future pas encore démarré, annulable
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="game-lists")
+    return _executor
+
+
+def _load(platform_id):
+    try:
+        games = load_games(platform_id)
+        return games, build_search_index(games)
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement des jeux de {platform_id}: {str(e)}")
+        return [], build_search_index([])
+
+
+def _submit(platform_id):
+    """Retourne le Future de platform_id, en lançant le chargement si besoin. Appelé sous _lock."""
+    future = _lists.get(platform_id)
+    if future is None or future.cancelled():
+        future = _get_executor().submit(_load, platform_id)
+        _lists[platform_id] = future
+    _lists.move_to_end(platform_id)
+    while len(_lists) > MAX_CACHED_LISTS:
+        old_id, old_future = _lists.popitem(last=False)
+        old_future.cancel()
+        _prefetches.pop(old_id, None)
+    return future
+
+
+def _cancel_prefetches(keep=()):
+    """Annule les préchargements pas encore démarrés (sauf keep). Appelé sous _lock."""
+    for platform_id, future in list(_prefetches.items()):
+        if platform_id in keep:
+            continue
+        if future.cancel():
+            _lists.pop(platform_id, None)
+        del _prefetches[platform_id]
+
+
+def request_games(platform_id):
+    """Demande la liste des jeux de platform_id en priorité ; retourne un Future."""
+    with _lock:
+        _cancel_prefetches()
+        return _submit(platform_id)
+
+
+def prefetch_games(platform_ids):
+    """Précharge les listes de platform_ids. Les préchargements précédents pas encore démarrés sont abandonnés :
+    seule la sélection la plus récente compte quand on parcourt la grille."""
+    with _lock:
+        _cancel_prefetches(keep=platform_ids)
+        for platform_id in platform_ids:
+            if platform_id in _lists and not _lists[platform_id].cancelled():
+                continue
+            _prefetches[platform_id] = _submit(platform_id)
+
+
+def get_games_if_ready(platform_id):
+    """(liste des jeux, index de recherche) de platform_id si son chargement est terminé, sinon None."""
+    with _lock:
+        future = _lists.get(platform_id)
+    if future is None or not future.done() or future.cancelled():
+        return None
+    return future.result()
+
+
+def get_adjacent_platforms(index, platforms):
+    """Plateformes voisines de index dans la grille (précédente et suivante)."""
+    return [platforms[i] for i in (index + 1, index - 1) if 0 <= i < len(platforms)]
+
+
+def clear_game_lists():
+    """Oublie les listes en mémoire (après une mise à jour des données)."""
+    with _lock:
+        _cancel_prefetches()
+        _lists.clear()
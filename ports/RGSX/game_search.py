@@ -0,0 +1,63 @@
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Recherche incrémentale dans la liste des jeux de la plateforme courante.
+# L'index (noms normalisés en casefold, et pour les grandes listes les positions de chaque trigramme)
+# est construit par le thread de game_lists au chargement de la liste.
+# Chaque frappe ne parcourt que le plus petit ensemble candidat : le résultat de la requête précédente
+# quand la requête s'allonge, ou les jeux contenant le trigramme le plus rare de la requête.
+# Les résultats intermédiaires sont empilés : un retour arrière les restitue sans nouveau parcours.
+TRIGRAM_MIN_GAMES = 2000
+
+_state = {"games": [], "index": None, "stack": []}
+
+
+def build_search_index(games):
+    """Index de recherche de games : {"keys": noms en casefold, "trigrams": trigramme -> positions (ou None)}."""
+    keys = [str(game[0]).casefold() for game in games]
+    trigrams = None
+    if len(keys) >= TRIGRAM_MIN_GAMES:
+        postings = {}
+        for i, key in enumerate(keys):
+            for trigram in {key[j:j + 3] for j in range(len(key) - 2)}:
+                postings.setdefault(trigram, []).append(i)
+        # Positions stockées en tableaux d'entiers non signés : 4 octets par entrée au lieu d'une liste d'objets
+        trigrams = {trigram: array('I', positions) for trigram, positions in postings.items()}
+    return {"keys": keys, "trigrams": trigrams}
+
+
+def set_search_index(games, index):
+    """Associe l'index à la liste des jeux affichée et oublie les recherches précédentes."""
+    _state["games"] = games
+    _state["index"] = index if index is not None else build_search_index(games)
+    _state["stack"] = [("", range(len(games)), games)]
+
+
+def _candidates(query, base):
+    """Positions à vérifier pour query : base, ou les jeux du trigramme le plus rare s'ils sont moins nombreux."""
+    trigrams = _state["index"]["trigrams"]
+    if trigrams is None or len(query) < 3:
+        return base
+    rarest = min((trigrams.get(query[j:j + 3], ()) for j in range(len(query) - 2)), key=len)
+    return rarest if len(rarest) < len(base) else base
+
+
+def filter_games(games, query):
+    """Jeux de games dont le nom contient query (sans tenir compte de la casse), dans l'ordre de la liste."""
+    if games is not _state["games"] or _state["index"] is None:
+        set_search_index(games, None)
+    query = query.casefold()
+    stack = _state["stack"]
+    # Retour arrière ou requête modifiée : on remonte jusqu'au dernier résultat dont la requête est un préfixe
+    while len(stack) > 1 and not query.startswith(stack[-1][0]):
+        stack.pop()
+    if stack[-1][0] == query:
+        return stack[-1][2]
+    keys = _state["index"]["keys"]
+    positions = [i for i in _candidates(query, stack[-1][1]) if query in keys[i]]
+    result = [games[i] for i in positions]
+    stack.append((query, positions, result))
+    logger.debug(f"Recherche '{query}' : {len(result)} jeux")
+    return result
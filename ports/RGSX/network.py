@@ -1,6 +1,9 @@
 import requests
 import subprocess
 import os
+import io
+import errno
+import shutil
 import sys
 import threading
 import pygame # type: ignore
@@ -10,131 +13,1120 @@ import config
 from config import OTA_VERSION_ENDPOINT,APP_FOLDER, UPDATE_FOLDER, OTA_UPDATE_ZIP
 from utils import sanitize_filename, extract_zip, extract_rar, load_api_key_1fichier, normalize_platform_name
 from history import save_history
+import download_queue
+import size_probe
+import staging
 import logging
 import datetime
 import queue
 import time
-import os
+import math
+import uuid
+import socket
+import random
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 from language import _  # Import de la fonction de traduction
 
 
 logger = logging.getLogger(__name__)
 
 
-cache = {}
+cache = {}  # Infos de fichiers 1fichier par lien {link: (timestamp, file_info)}
 CACHE_TTL = 3600  # 1 heure
 
-# Cancellation support
-cancel_tasks_by_id = set()
-cancel_tasks_by_url = set()
+# Annulation : un jeton par tâche de téléchargement, créé par launch_download et retiré à la fin de la tâche
+cancel_tokens = {}  # {task_id: CancelToken}
+
+
+def _response_socket(response):
+    """Socket sous-jacent d'une réponse requests en streaming (None s'il n'est pas accessible)."""
+    raw = getattr(response, "raw", None)
+    sock = getattr(getattr(raw, "_connection", None), "sock", None)
+    if sock is None:
+        # Connexion déjà détachée du pool : http.client.HTTPResponse -> SocketIO -> socket
+        sock = getattr(getattr(getattr(getattr(raw, "_fp", None), "fp", None), "raw", None), "_sock", None)
+    return sock
+
+
+def abort_response(response):
+    """Interrompt depuis un autre thread une lecture bloquée sur response.
+    shutdown() sur le socket réveille le lecteur (fin de flux) sans toucher aux objets qu'il utilise ;
+    la fermeture de la réponse reste à la charge du thread qui lit. Sans socket accessible, on ferme la réponse."""
+    sock = _response_socket(response)
+    if sock is None:
+        response.close()
+        return
+    try:
+        # Méthode de socket.socket : sur un SSLSocket, ne modifie pas l'état TLS partagé avec le lecteur
+        socket.socket.shutdown(sock, socket.SHUT_RDWR)
+    except OSError:
+        pass  # Déjà fermé
+
+
+class CancelToken:
+    """Jeton d'annulation d'une tâche. Les réponses HTTP enregistrées sont interrompues dès l'annulation
+    (shutdown du socket), ce qui débloque une lecture en cours dans le thread de téléchargement."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.reason = None  # "canceled" ou "suspended"
+        self._closeables = set()
+        self._lock = threading.Lock()
+
+    def is_set(self):
+        return self.event.is_set()
+
+    def cancel(self, reason="canceled"):
+        with self._lock:
+            if self.event.is_set():
+                return
+            self.reason = reason
+            self.event.set()
+            closeables = list(self._closeables)
+            self._closeables.clear()
+        for closeable in closeables:
+            try:
+                abort_response(closeable)
+            except Exception:
+                pass
+
+    def register(self, closeable):
+        """Interrompt la réponse closeable à l'annulation (immédiatement si le jeton est déjà annulé)."""
+        with self._lock:
+            if not self.event.is_set():
+                self._closeables.add(closeable)
+                return
+        abort_response(closeable)
+
+    def unregister(self, closeable):
+        with self._lock:
+            self._closeables.discard(closeable)
+
+    def wait(self, timeout):
+        """Attend l'annulation au plus timeout secondes ; retourne True si le jeton est annulé."""
+        return self.event.wait(timeout)
+
+
+def get_cancel_token(task_id=None, url=None):
+    """Jeton de la tâche task_id, ou de la tâche en cours pour url."""
+    if task_id is None and url:
+        task_id = get_inflight_task_id(url)
+    return cancel_tokens.get(task_id) if task_id else None
+
 
 def request_cancel(task_id: str | None = None, url: str | None = None):
-    """Mark a task for cancellation by id and/or url."""
-    if task_id:
-        cancel_tasks_by_id.add(task_id)
-    if url:
-        cancel_tasks_by_url.add(url)
+    """Annule la tâche task_id (ou la tâche en cours pour url). Retourne False si aucune tâche ne correspond."""
+    token = get_cancel_token(task_id) if task_id else None
+    if token is None and url:
+        token = get_cancel_token(url=url)
+    if not token:
+        return False
+    token.cancel()
+    # Réveiller une tâche en attente d'emplacement
+    with download_slots:
+        download_slots.notify_all()
+    return True
 
 def is_canceled(task_id: str | None, url: str | None) -> bool:
-    return (task_id and task_id in cancel_tasks_by_id) or (url and url in cancel_tasks_by_url)
-        
-def test_internet():
-    """Teste la connexion Internet de manière complète et portable pour Windows et Linux/Batocera."""
-    logger.debug("=== Début test de connexion Internet complet ===")
-    
-    # Test 1: Ping vers serveurs DNS publics
-    ping_option = '-n' if sys.platform.startswith("win") else '-c'
-    dns_servers = ['8.8.8.8', '1.1.1.1', '208.67.222.222']  # Google, Cloudflare, OpenDNS
-    
-    ping_success = False
-    for dns_server in dns_servers:
-        logger.debug(f"Test ping vers {dns_server} avec option {ping_option}")
+    token = get_cancel_token(task_id, url)
+    return bool(token and token.is_set() and token.reason == "canceled")
+
+# Suspension à l'arrêt de l'application : les transferts s'interrompent en gardant leur fichier partiel
+downloads_suspended = threading.Event()
+
+
+class DownloadSuspended(Exception):
+    """Le téléchargement est interrompu par l'arrêt de l'application et reprendra au prochain démarrage."""
+
+
+def check_interrupted(task_id, url):
+    """Lève DownloadSuspended si l'application s'arrête, KeyboardInterrupt si la tâche est annulée."""
+    if downloads_suspended.is_set():
+        raise DownloadSuspended()
+    if is_canceled(task_id, url):
+        raise KeyboardInterrupt("Canceled by user")
+
+
+def suspend_downloads():
+    """Interrompt les transferts en cours à l'arrêt ; ils restent dans la file persistante (statut "paused")."""
+    downloads_suspended.set()
+    for token in list(cancel_tokens.values()):
+        token.cancel("suspended")
+    with download_slots:
+        download_slots.notify_all()
+
+QUEUE_SAVE_INTERVAL = 2  # Intervalle (s) d'enregistrement de la position dans la file persistante
+
+
+def prepare_resume(dest_path, resume_offset):
+    """Retourne l'octet de reprise d'un fichier partiel (tronqué à la dernière position enregistrée), 0 sinon."""
+    if not resume_offset or not os.path.exists(dest_path):
+        return 0
+    offset = min(os.path.getsize(dest_path), resume_offset)
+    with open(dest_path, 'r+b') as f:
+        f.truncate(offset)
+    logger.info(f"Reprise de {dest_path} à l'octet {offset}")
+    return offset
+
+
+class QueueProgress:
+    """Enregistre périodiquement la position d'un transfert dans la file persistante."""
+
+    def __init__(self, task_id, downloaded=0):
+        self.task_id = task_id
+        self.downloaded = downloaded
+        self.total_size = 0
+        self.last_save = 0.0
+
+    def update(self, downloaded, total_size):
+        self.downloaded, self.total_size = downloaded, total_size
+        now = time.time()
+        if now - self.last_save >= QUEUE_SAVE_INTERVAL:
+            self.last_save = now
+            download_queue.update_download(self.task_id, offset=downloaded, total_size=total_size)
+
+    def pause(self):
+        download_queue.update_download(self.task_id, status="paused", offset=self.downloaded, total_size=self.total_size)
+
+
+# En-têtes navigateur utilisés pour les téléchargements directs
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Téléchargements en cours par URL : {url: (task_id, task)}
+inflight_downloads = {}
+
+# Politique de nouvelle tentative commune à tous les appels HTTP (réglages "retry" de rgsx_settings.json)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+def get_retry_policy():
+    from rgsx_settings import get_retry_policy as load_retry_policy
+    return load_retry_policy()
+
+
+def is_retryable_error(error):
+    """Vrai pour une erreur transitoire : connexion, délai dépassé, flux interrompu, 429 ou 5xx."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def get_retry_delay(attempt, policy, response=None):
+    """Délai avant la tentative suivante : Retry-After s'il est fourni, sinon backoff exponentiel avec gigue."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(0.0, delay), policy["max_delay"])
+    backoff = min(policy["max_delay"], policy["base_delay"] * 2 ** attempt)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def wait_before_retry(delay, task_id=None, url=None):
+    """Attend delay secondes en restant annulable ; lève KeyboardInterrupt si la tâche est annulée."""
+    token = get_cancel_token(task_id, url)
+    deadline = time.time() + delay
+    while True:
+        check_interrupted(task_id, url)
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        if token:
+            token.wait(remaining)
+        else:
+            time.sleep(min(0.1, remaining))
+
+
+def request_with_retry(method, url, session=None, task_id=None, max_attempts=None, **kwargs):
+    """Requête HTTP avec la politique de nouvelle tentative (erreurs de connexion, 429, 5xx, Retry-After).
+    Retourne la dernière réponse obtenue ; le code de statut reste à vérifier par l'appelant."""
+    policy = get_retry_policy()
+    attempts = max_attempts or policy["max_attempts"]
+    for attempt in range(attempts):
         try:
-            result = subprocess.run(
-                ['ping', ping_option, '2', dns_server],
-                capture_output=True,
-                text=True,
-                timeout=8
-            )
-            if result.returncode == 0:
-                logger.debug(f"[OK] Ping vers {dns_server} réussi")
-                ping_success = True
+            response = (session or requests).request(method, url, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            delay = get_retry_delay(attempt, policy)
+            logger.warning(f"{method} {url} échoué ({e}), nouvelle tentative {attempt + 2}/{attempts} dans {delay:.1f}s")
+        else:
+            if response.status_code not in RETRYABLE_STATUS or attempt == attempts - 1:
+                return response
+            delay = get_retry_delay(attempt, policy, response)
+            response.close()
+            logger.warning(f"{method} {url} a répondu {response.status_code}, nouvelle tentative {attempt + 2}/{attempts} dans {delay:.1f}s")
+        wait_before_retry(delay, task_id, url)
+
+def get_destination_dir(platform):
+    """Retourne le dossier de destination d'une plateforme (lien symbolique compris)."""
+    from rgsx_settings import apply_symlink_path
+    for platform_dict in config.platform_dicts or []:
+        if platform_dict["platform"] == platform:
+            platform_folder = platform_dict.get("folder", normalize_platform_name(platform))
+            return apply_symlink_path(config.ROMS_FOLDER, platform_folder)
+    logger.warning(f"Aucun dossier 'folder' trouvé pour la plateforme {platform}")
+    return apply_symlink_path(config.ROMS_FOLDER, normalize_platform_name(platform))
+
+def head_remote_file(url, max_attempts=None):
+    """Requête HEAD sur url : retourne (taille ou None, en-tête Last-Modified ou None).
+    max_attempts limite les tentatives (politique de téléchargement par défaut).
+    Lève requests.exceptions.RequestException si le serveur est injoignable."""
+    headers = {'User-Agent': BROWSER_HEADERS['User-Agent'], 'Accept-Encoding': 'identity'}
+    response = request_with_retry("HEAD", url, headers=headers, allow_redirects=True, timeout=10, max_attempts=max_attempts)
+    response.close()
+    if response.status_code >= 400:
+        return None, None
+    length = response.headers.get('content-length', '')
+    return (int(length) if length.isdigit() else None), response.headers.get('last-modified')
+
+def get_remote_size(url):
+    """Retourne la taille distante (content-length), depuis le cache persistant ou via HEAD, ou None."""
+    entry = size_probe.get_cached_entry(url)
+    if entry:
+        return entry.get("size")
+    try:
+        size, last_modified = head_remote_file(url)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"HEAD impossible pour {url}: {str(e)}")
+        return None
+    size_probe.store_size(url, size, last_modified)
+    return size
+
+def is_already_present(dest_path, url=None, expected_size=None):
+    """Vrai si dest_path existe déjà avec la taille attendue.
+    La taille attendue est obtenue par HEAD sur url si elle n'est pas fournie."""
+    if not os.path.isfile(dest_path):
+        return False
+    if not expected_size and url:
+        expected_size = get_remote_size(url)
+    if not expected_size:
+        return False
+    return os.path.getsize(dest_path) == int(expected_size)
+
+def get_inflight_task_id(url):
+    """Retourne le task_id du téléchargement en cours pour url, ou None."""
+    inflight = inflight_downloads.get(url)
+    if inflight and not inflight[1].done():
+        return inflight[0]
+    return None
+
+def launch_download(url, platform, game_name, is_zip_non_supported=False, task_id=None, force=False, resume_offset=None):
+    """Crée la tâche asyncio de téléchargement adaptée à l'URL (1fichier ou directe).
+    Si la même URL est déjà en cours, la tâche existante est réutilisée au lieu d'en créer une seconde.
+    force=True retélécharge même si le fichier est déjà présent avec la bonne taille.
+    resume_offset reprend un élément de la file persistante à partir de cet octet.
+    task_id n'est fourni que pour reprendre un élément de la file ; sinon (ou s'il est déjà utilisé) un identifiant unique est créé.
+    Retourne (task_id, task, coalesced)."""
+    existing_task_id = get_inflight_task_id(url)
+    if existing_task_id:
+        logger.info(f"Téléchargement déjà en cours pour {url}, réutilisation de task_id={existing_task_id}")
+        return existing_task_id, inflight_downloads[url][1], True
+    if task_id is not None and task_id in cancel_tokens:
+        logger.warning(f"task_id {task_id} déjà utilisé par un autre téléchargement, nouvel identifiant attribué")
+        task_id = None
+    if task_id is None:
+        task_id = uuid.uuid4().hex
+    if resume_offset is None:
+        download_queue.enqueue_download(task_id, url, platform, game_name, is_zip_non_supported, force)
+    cancel_tokens[task_id] = CancelToken()
+    if downloads_suspended.is_set():
+        cancel_tokens[task_id].cancel("suspended")
+    if is_1fichier_url(url):
+        coro = download_from_1fichier(url, platform, game_name, is_zip_non_supported, task_id, force, resume_offset or 0)
+    else:
+        coro = download_rom(url, platform, game_name, is_zip_non_supported, task_id, force, resume_offset or 0)
+    task = asyncio.create_task(coro)
+    inflight_downloads[url] = (task_id, task)
+
+    def _forget(done_task):
+        # Fin de la tâche : libérer tout l'état qui lui est associé
+        if inflight_downloads.get(url, (None, None))[1] is done_task:
+            del inflight_downloads[url]
+        cancel_tokens.pop(task_id, None)
+        progress_queues.pop(task_id, None)
+    task.add_done_callback(_forget)
+    return task_id, task, False
+
+
+def resume_download_queue():
+    """Relance les téléchargements de la file persistante (à appeler au démarrage, dans la boucle asyncio).
+    Les emplacements de téléchargement limitent toujours le nombre de transferts simultanés.
+    Les entrées d'historique restées « en cours » sans élément dans la file sont marquées en erreur.
+    Retourne [(task_id, task, élément)]."""
+    pending = download_queue.get_pending_downloads()
+    pending_urls = {item["url"] for _task_id, item in pending}
+    history_changed = False
+    if isinstance(config.history, list):
+        for entry in config.history:
+            if entry.get("status") in ["downloading", "Téléchargement", "Extracting"] and entry.get("url") not in pending_urls \
+                    and not get_inflight_task_id(entry.get("url")):
+                entry["status"] = "Erreur"
+                entry["progress"] = 0
+                entry["message"] = _("network_download_interrupted")
+                history_changed = True
+    resumed = []
+    for task_id, item in pending:
+        url = item["url"]
+        if get_inflight_task_id(url):
+            download_queue.remove_download(task_id)
+            continue
+        # L'entrée d'historique la plus récente pour cette URL suit à nouveau la progression
+        for entry in reversed(config.history if isinstance(config.history, list) else []):
+            if entry.get("url") == url:
+                entry["status"] = "downloading"
+                entry["message"] = _("network_download_resumed")
+                history_changed = True
                 break
-            else:
-                logger.debug(f"[FAIL] Ping vers {dns_server} échoué (code: {result.returncode})")
-                if result.stderr:
-                    logger.debug(f"Erreur ping: {result.stderr.strip()}")
-        except subprocess.TimeoutExpired:
-            logger.debug(f"[FAIL] Timeout ping vers {dns_server}")
+        logger.info(f"Reprise du téléchargement {item['game_name']} ({item['status']}, octet {item.get('offset', 0)}), task_id={task_id}")
+        download_queue.update_download(task_id, status="queued")
+        _task_id, task, _coalesced = launch_download(url, item["platform"], item["game_name"], item.get("is_zip_non_supported", False),
+                                                     task_id, item.get("force", False), item.get("offset", 0))
+        resumed.append((task_id, task, item))
+    if history_changed:
+        save_history(config.history)
+        config.needs_redraw = True
+    return resumed
+
+# Modèle de progression : vitesse lissée (EWMA), ETA et historique de débit par tâche
+SPEED_EWMA_TAU = 3.0  # Constante de temps (s) du lissage de la vitesse
+THROUGHPUT_SAMPLE_INTERVAL = 1.0  # Un échantillon de débit par seconde
+THROUGHPUT_SAMPLES = 120  # Taille du tampon circulaire (2 minutes d'historique)
+MAX_TRANSFER_STATS = 50  # Nombre de transferts dont les statistiques restent consultables
+transfer_stats = OrderedDict()  # {url: TransferStats} du dernier transfert de chaque URL
+transfer_stats_lock = threading.Lock()
+
+
+class TransferStats:
+    """Vitesse lissée, ETA et tampon circulaire (array) des débits d'un transfert."""
+
+    def __init__(self, task_id, url):
+        self.task_id = task_id
+        self.url = url
+        self.source = None  # Hôte (miroir) qui sert actuellement le transfert
+        self.downloaded = 0
+        self.total_size = 0
+        self.speed = 0.0  # Octets/s, lissé
+        self.samples = array('d', [0.0]) * THROUGHPUT_SAMPLES
+        self.sample_count = 0
+        self.sample_head = 0  # Prochain emplacement d'écriture
+        self.last_time = None
+        self.sample_start = None
+        self.sample_bytes = 0
+        self.lock = threading.Lock()
+
+    def _push_sample(self, value):
+        self.samples[self.sample_head] = value
+        self.sample_head = (self.sample_head + 1) % THROUGHPUT_SAMPLES
+        self.sample_count = min(self.sample_count + 1, THROUGHPUT_SAMPLES)
+
+    def update(self, downloaded, total_size, source=None):
+        """Enregistre la position courante du transfert."""
+        now = time.time()
+        with self.lock:
+            if source:
+                self.source = source
+            self.total_size = total_size
+            if self.last_time is None or downloaded < self.downloaded:
+                # Début ou redémarrage du transfert à zéro : pas de débit mesurable
+                self.last_time = self.sample_start = now
+                self.downloaded = downloaded
+                self.sample_bytes = 0
+                return
+            elapsed = now - self.last_time
+            if elapsed <= 0:
+                return
+            delta = downloaded - self.downloaded
+            instant = delta / elapsed
+            alpha = 1 - math.exp(-elapsed / SPEED_EWMA_TAU)
+            self.speed = instant if not self.speed else self.speed + alpha * (instant - self.speed)
+            self.downloaded = downloaded
+            self.last_time = now
+            self.sample_bytes += delta
+            window = now - self.sample_start
+            if window >= THROUGHPUT_SAMPLE_INTERVAL:
+                # Une lecture bloquée longtemps apparaît comme des secondes à débit nul
+                missed = int(window // THROUGHPUT_SAMPLE_INTERVAL) - 1
+                for _missed in range(min(missed, THROUGHPUT_SAMPLES)):
+                    self._push_sample(0.0)
+                self._push_sample(self.sample_bytes / (window - missed * THROUGHPUT_SAMPLE_INTERVAL))
+                self.sample_start = now
+                self.sample_bytes = 0
+
+    def speed_mbps(self):
+        return self.speed / (1024 * 1024)
+
+    def eta(self):
+        """Secondes restantes estimées, ou None si inconnu."""
+        if self.speed <= 0 or not self.total_size or self.downloaded >= self.total_size:
+            return None
+        return int((self.total_size - self.downloaded) / self.speed)
+
+    def timeline(self):
+        """Échantillons de débit (Mo/s), du plus ancien au plus récent."""
+        with self.lock:
+            start = (self.sample_head - self.sample_count) % THROUGHPUT_SAMPLES
+            return [round(self.samples[(start + i) % THROUGHPUT_SAMPLES] / (1024 * 1024), 3) for i in range(self.sample_count)]
+
+    def snapshot(self):
+        return {
+            "task_id": self.task_id,
+            "source": self.source,
+            "speed": round(self.speed_mbps(), 3),
+            "eta": self.eta(),
+            "idle": round(time.time() - self.last_time, 1) if self.last_time else None,
+            "downloaded_size": self.downloaded,
+            "total_size": self.total_size,
+            "timeline": self.timeline(),
+            "sample_interval": THROUGHPUT_SAMPLE_INTERVAL,
+        }
+
+
+def start_transfer_stats(task_id, url):
+    """Crée les statistiques du transfert de url (remplace celles d'un transfert précédent)."""
+    stats = TransferStats(task_id, url)
+    with transfer_stats_lock:
+        transfer_stats.pop(url, None)
+        transfer_stats[url] = stats
+        while len(transfer_stats) > MAX_TRANSFER_STATS:
+            transfer_stats.popitem(last=False)
+    return stats
+
+
+def get_eta(url):
+    """ETA (s) du transfert en cours pour url, ou None."""
+    stats = get_transfer_stats(url)
+    return stats.eta() if stats else None
+
+
+def get_transfer_stats(url):
+    """Statistiques du dernier transfert de url, ou None."""
+    with transfer_stats_lock:
+        return transfer_stats.get(url)
+
+
+# Miroirs : statistiques glissantes par hôte {netloc: {"throughput", "samples", "errors", "last_error"}}
+mirror_stats = {}
+mirror_stats_lock = threading.Lock()
+MIRROR_EWMA_ALPHA = 0.3  # Poids du dernier échantillon de débit
+MIRROR_MAX_ERRORS = 3  # Erreurs consécutives avant de considérer un miroir hors service
+MIRROR_COOLDOWN = 300  # Durée (s) pendant laquelle un miroir en erreur est écarté
+MIRROR_GRACE_PERIOD = 15  # Délai (s) avant de juger un miroir lent
+MIRROR_CHECK_INTERVAL = 5  # Fenêtre (s) de mesure du débit pendant un transfert
+MIRROR_DEGRADED_RATIO = 0.3  # Bascule si le débit tombe sous cette fraction du meilleur miroir connu
+
+
+class MirrorDegraded(Exception):
+    """Le miroir en cours est nettement plus lent qu'un autre miroir disponible."""
+
+
+def get_mirror_candidates(url):
+    """Retourne les URLs candidates pour url (origine + miroirs de la table), la plus rapide en premier.
+    Les miroirs en erreur récente passent en fin de liste."""
+    from rgsx_settings import get_mirror_table
+    candidates = [url]
+    for prefix, alternatives in get_mirror_table().items():
+        if url.startswith(prefix):
+            candidates += [alt + url[len(prefix):] for alt in alternatives]
+            break
+    # Tri stable : miroirs sains d'abord, puis débit connu décroissant (l'origine reste devant à égalité)
+    return sorted(candidates, key=lambda u: (not is_mirror_healthy(u), -get_mirror_throughput(u)))
+
+
+def _mirror_key(url):
+    return urlparse(url).netloc
+
+
+def get_mirror_throughput(url):
+    """Débit lissé (octets/s) connu pour le miroir de url, 0 si inconnu."""
+    with mirror_stats_lock:
+        return mirror_stats.get(_mirror_key(url), {}).get("throughput", 0.0)
+
+
+def is_mirror_healthy(url):
+    """Faux si le miroir a accumulé trop d'erreurs consécutives récemment."""
+    with mirror_stats_lock:
+        stats = mirror_stats.get(_mirror_key(url))
+        if not stats or stats["errors"] < MIRROR_MAX_ERRORS:
+            return True
+        return time.time() - stats["last_error"] > MIRROR_COOLDOWN
+
+
+def record_mirror_sample(url, nbytes, duration):
+    """Enregistre un échantillon de débit réussi pour le miroir de url."""
+    if duration <= 0:
+        return
+    with mirror_stats_lock:
+        stats = mirror_stats.setdefault(_mirror_key(url), {"throughput": 0.0, "samples": 0, "errors": 0, "last_error": 0.0})
+        throughput = nbytes / duration
+        if stats["samples"]:
+            stats["throughput"] = MIRROR_EWMA_ALPHA * throughput + (1 - MIRROR_EWMA_ALPHA) * stats["throughput"]
+        else:
+            stats["throughput"] = throughput
+        stats["samples"] += 1
+        stats["errors"] = 0
+
+
+def record_mirror_error(url):
+    """Enregistre une erreur (connexion, HTTP, dégradation) pour le miroir de url."""
+    with mirror_stats_lock:
+        stats = mirror_stats.setdefault(_mirror_key(url), {"throughput": 0.0, "samples": 0, "errors": 0, "last_error": 0.0})
+        stats["errors"] += 1
+        stats["last_error"] = time.time()
+
+
+def download_with_mirrors(session, url, dest_path, headers, task_id=None, on_start=None, on_progress=None, start_offset=0, stats=None):
+    """Télécharge url dans dest_path depuis le miroir le plus rapide.
+    Si le miroir échoue ou devient nettement plus lent qu'un autre, le transfert reprend
+    sur le miroir suivant à partir de l'octet déjà reçu (en-tête Range). Une fois tous les miroirs
+    essayés, les erreurs transitoires sont réessayées selon la politique de nouvelle tentative.
+    on_start(total_size) est appelé à la première réponse, on_progress(downloaded, total_size, speed)
+    au plus toutes les 0,1 s avec la vitesse lissée de stats (Mo/s). start_offset reprend un fichier partiel déjà présent.
+    Retourne (downloaded, total_size)."""
+    candidates = get_mirror_candidates(url)
+    logger.debug(f"Miroirs candidats pour {url}: {candidates}")
+    policy = get_retry_policy()
+    stats = stats or TransferStats(task_id, url)
+    downloaded = start_offset
+    total_size = 0
+    started = False
+    failures = 0
+    index = 0
+    token = get_cancel_token(task_id, url)
+    while True:
+        mirror_url = candidates[index]
+        request_headers = dict(headers)
+        parsed = urlparse(mirror_url)
+        request_headers['Referer'] = f"{parsed.scheme}://{parsed.netloc}/"
+        if downloaded:
+            request_headers['Range'] = f"bytes={downloaded}-"
+        segment_start = time.time()
+        segment_bytes = 0
+        response = None
+        try:
+            print(f"[download_rom] GET {mirror_url}")
+            with session.get(mirror_url, stream=True, timeout=30, allow_redirects=True, headers=request_headers) as response:
+                if token:
+                    # L'annulation coupe le socket de la réponse et interrompt une lecture bloquée
+                    token.register(response)
+                logger.debug(f"Status code: {response.status_code} ({parsed.netloc})")
+                response.raise_for_status()
+                if downloaded and response.status_code != 206:
+                    logger.warning(f"{parsed.netloc} ne gère pas la reprise, redémarrage à 0")
+                    downloaded = 0
+                length = int(response.headers.get('content-length', 0))
+                if response.status_code == 206 and '/' in response.headers.get('content-range', ''):
+                    total_size = int(response.headers['content-range'].rsplit('/', 1)[1])
+                elif not total_size:
+                    total_size = downloaded + length
+                if not started:
+                    started = True
+                    if on_start:
+                        on_start(total_size)
+                # Meilleur débit connu parmi les autres miroirs sains, pour détecter une dégradation
+                alternatives = [u for u in candidates if u != mirror_url and is_mirror_healthy(u)]
+                best_alternative = max((get_mirror_throughput(u) for u in alternatives), default=0.0)
+                last_update_time = window_start = time.time()
+                window_bytes = 0
+                stats.update(downloaded, total_size, parsed.netloc)
+                with open(dest_path, 'ab' if downloaded else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=4096):
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        segment_bytes += len(chunk)
+                        window_bytes += len(chunk)
+                        if segment_bytes == len(chunk):
+                            print(f"[download_rom] first bytes received: {len(chunk)}")
+                        check_interrupted(task_id, url)
+                        current_time = time.time()
+                        if current_time - last_update_time >= 0.1:
+                            last_update_time = current_time
+                            stats.update(downloaded, total_size)
+                            if on_progress:
+                                on_progress(downloaded, total_size, stats.speed_mbps())
+                        if current_time - window_start >= MIRROR_CHECK_INTERVAL:
+                            window_throughput = window_bytes / (current_time - window_start)
+                            if (best_alternative and current_time - segment_start >= MIRROR_GRACE_PERIOD
+                                    and window_throughput < MIRROR_DEGRADED_RATIO * best_alternative):
+                                raise MirrorDegraded(f"{parsed.netloc}: {window_throughput / 1024:.0f} Ko/s")
+                            window_start = current_time
+                            window_bytes = 0
+            check_interrupted(task_id, url)
+            if total_size and downloaded < total_size:
+                raise requests.exceptions.ChunkedEncodingError(f"Flux interrompu à {downloaded}/{total_size} octets")
+            record_mirror_sample(mirror_url, segment_bytes, time.time() - segment_start)
+            return downloaded, total_size
+        except (requests.exceptions.RequestException, MirrorDegraded) as e:
+            check_interrupted(task_id, url)
+            record_mirror_error(mirror_url)
+            if segment_bytes:
+                record_mirror_sample(mirror_url, segment_bytes, time.time() - segment_start)
+                failures = 0  # Le transfert progresse : seules les erreurs consécutives comptent
+            if isinstance(e, MirrorDegraded) or index < len(candidates) - 1:
+                # Bascule immédiate sur le miroir suivant, en reprenant à l'octet déjà reçu
+                index = (index + 1) % len(candidates)
+                logger.warning(f"Miroir {parsed.netloc} abandonné après {downloaded} octets ({e}), bascule sur {urlparse(candidates[index]).netloc}")
+                continue
+            failures += 1
+            if not is_retryable_error(e) or failures >= policy["max_attempts"]:
+                raise
+            delay = get_retry_delay(failures - 1, policy, getattr(e, "response", None))
+            logger.warning(f"Téléchargement interrompu après {downloaded} octets ({e}), nouvelle tentative {failures + 1}/{policy['max_attempts']} dans {delay:.1f}s")
+            wait_before_retry(delay, task_id, url)
+            index = 0
+        except (KeyboardInterrupt, DownloadSuspended):
+            raise
+        except Exception:
+            # Réponse interrompue par une annulation pendant la lecture
+            check_interrupted(task_id, url)
+            raise
+        finally:
+            if token and response is not None:
+                token.unregister(response)
+
+
+
+# Emplacements de téléchargement : au plus max_concurrent_downloads transferts simultanés, servis dans l'ordre d'arrivée
+download_slots = threading.Condition()
+active_download_slots = set()
+download_slot_waiters = []
+
+
+def acquire_download_slot(task_id, url, on_wait=None):
+    """Bloque jusqu'à obtenir un emplacement de téléchargement (ordre FIFO).
+    on_wait(position) est appelé environ chaque seconde pendant l'attente (position 0 = prochain servi).
+    Retourne False si la tâche est annulée pendant l'attente, lève DownloadSuspended à l'arrêt de l'application."""
+    from rgsx_settings import get_max_concurrent_downloads
+    max_slots = get_max_concurrent_downloads()
+    def slot_available():
+        return download_slot_waiters[0] == task_id and len(active_download_slots) < max_slots
+
+    with download_slots:
+        download_slot_waiters.append(task_id)
+    try:
+        while True:
+            with download_slots:
+                if not slot_available():
+                    download_slots.wait(timeout=1)
+                if slot_available():
+                    active_download_slots.add(task_id)
+                    return True
+                position = download_slot_waiters.index(task_id)
+            if is_canceled(task_id, url):
+                return False
+            if downloads_suspended.is_set():
+                raise DownloadSuspended()
+            if on_wait:
+                on_wait(position)
+    finally:
+        with download_slots:
+            download_slot_waiters.remove(task_id)
+            download_slots.notify_all()
+
+
+def release_download_slot(task_id):
+    """Libère l'emplacement de téléchargement de task_id et réveille la tâche suivante."""
+    with download_slots:
+        active_download_slots.discard(task_id)
+        download_slots.notify_all()
+
+
+# Contrôle d'admission sur l'espace disque : chaque tâche réserve la taille restant à télécharger
+# (plus la taille extraite estimée pour les archives) avant d'écrire. Les réservations d'un même
+# volume sont déduites de l'espace libre ; une tâche qui ne tient pas attend qu'une autre se termine.
+# Avec la zone de transit sur un autre volume, le résultat final est aussi réservé sur le volume du dossier ROM
+# (clé task_id + DEST_RESERVATION_SUFFIX), pour ne pas découvrir le manque de place au moment du déplacement.
+DISK_SPACE_MARGIN = 100 * 1024 * 1024  # Marge laissée libre sur le volume (100 Mo)
+EXTRACT_SIZE_RATIO = 1.5  # Taille extraite estimée d'une archive dont le répertoire central est inconnu
+DEST_RESERVATION_SUFFIX = ":dest"
+disk_reservations = {}  # {task_id (ou task_id + DEST_RESERVATION_SUFFIX): réservation}
+
+
+class InsufficientDiskSpace(Exception):
+    """Levée quand une tâche ne peut pas tenir sur le volume, même une fois les autres réservations terminées."""
+
+
+class RemoteRangeFile(io.RawIOBase):
+    """Fichier distant en lecture seule lu par requêtes HTTP Range, pour que zipfile
+    lise le répertoire central d'une archive sans la télécharger."""
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, url, size):
+        self.url = url
+        self.size = size
+        self.position = 0
+        self.block = (0, b"")  # (début, données) du dernier bloc lu
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self.size, self.position + size)
+        if end <= self.position:
+            return b""
+        start, data = self.block
+        if not (start <= self.position and end <= start + len(data)):
+            # Lecture d'au moins un bloc pour servir les petites lectures successives de zipfile
+            start = max(0, min(self.position, end - self.BLOCK_SIZE))
+            headers = {'User-Agent': BROWSER_HEADERS['User-Agent'], 'Accept-Encoding': 'identity',
+                       'Range': f"bytes={start}-{max(end, start + self.BLOCK_SIZE) - 1}"}
+            response = request_with_retry("GET", self.url, headers=headers, stream=True, timeout=15, max_attempts=2)
+            with response:
+                if response.status_code != 206:
+                    raise OSError(f"Requête Range refusée ({response.status_code})")
+                data = response.content
+            self.block = (start, data)
+        chunk = data[self.position - start:end - start]
+        self.position += len(chunk)
+        return chunk
+
+
+def estimate_extracted_size(url, archive_size):
+    """Estime la taille extraite d'une archive : somme du répertoire central ZIP lu à distance,
+    sinon archive_size * EXTRACT_SIZE_RATIO."""
+    if archive_size and urlparse(url).path.lower().endswith(".zip") and not is_1fichier_url(url):
+        try:
+            with zipfile.ZipFile(RemoteRangeFile(url, archive_size)) as zip_ref:
+                return sum(info.file_size for info in zip_ref.infolist() if not info.is_dir())
         except Exception as e:
-            logger.debug(f"[FAIL] Exception ping vers {dns_server}: {str(e)}")
-    
-    # Test 2: Tentative de résolution DNS
-    dns_success = False
+            logger.debug(f"Répertoire central distant illisible pour {url}: {e}")
+    return int((archive_size or 0) * EXTRACT_SIZE_RATIO)
+
+
+def get_volume_id(path):
+    """Identifiant du volume contenant path (les réservations sont comptées par volume)."""
     try:
-        import socket
-        logger.debug("Test de résolution DNS pour google.com")
-        socket.gethostbyname('google.com')
-        logger.debug("[OK] Résolution DNS réussie")
-        dns_success = True
-    except socket.gaierror as e:
-        logger.debug(f"[FAIL] Erreur résolution DNS: {str(e)}")
-    except Exception as e:
-        logger.debug(f"[FAIL] Exception résolution DNS: {str(e)}")
-    
-    # Test 3: Tentative de connexion HTTP
-    http_success = False
-    test_urls = [
-        'http://www.google.com',
-        'http://www.cloudflare.com',
-        'https://httpbin.org/get'
-    ]
-    
-    for test_url in test_urls:
-        logger.debug(f"Test connexion HTTP vers {test_url}")
+        return os.stat(path).st_dev
+    except OSError:
+        return path
+
+
+def reservation_outstanding(reservation):
+    """Octets réservés pas encore écrits sur le disque."""
+    return max(0, reservation["download"] - reservation["written"]) + reservation["extract"]
+
+
+def reserve_disk_space(task_id, url, dest_dir, download_size, extract_size=0, game_name=None, on_wait=None, key=None):
+    """Réserve download_size + extract_size octets sur le volume de dest_dir avant d'écrire (sous key, task_id par défaut).
+    Attend tant que d'autres réservations en cours occupent la place (on_wait(manquant) environ chaque seconde),
+    lève InsufficientDiskSpace si la tâche ne tiendrait pas même seule.
+    Retourne False si la tâche est annulée pendant l'attente, lève DownloadSuspended à l'arrêt de l'application."""
+    key = key or task_id
+    volume = get_volume_id(dest_dir)
+    reservation = {
+        "task_id": task_id,
+        "url": url,
+        "game_name": game_name,
+        "path": dest_dir,
+        "volume": volume,
+        "download": int(download_size or 0),
+        "extract": int(extract_size or 0),
+        "written": 0,
+        "status": "waiting",
+        "since": time.time()
+    }
+    with download_slots:
+        disk_reservations[key] = reservation
+    try:
+        while True:
+            with download_slots:
+                free = shutil.disk_usage(dest_dir).free - DISK_SPACE_MARGIN
+                others = [r for r in disk_reservations.values()
+                          if r is not reservation and r["status"] == "reserved" and r["volume"] == volume]
+                missing = reservation_outstanding(reservation) - (free - sum(reservation_outstanding(r) for r in others))
+                if missing <= 0:
+                    reservation["status"] = "reserved"
+                    return True
+                if not others:
+                    raise InsufficientDiskSpace(_("network_insufficient_disk_space").format(
+                        size_probe.format_catalog_size(reservation_outstanding(reservation)),
+                        size_probe.format_catalog_size(max(0, free))))
+                download_slots.wait(timeout=1)
+            if is_canceled(task_id, url):
+                return False
+            if downloads_suspended.is_set():
+                raise DownloadSuspended()
+            if on_wait:
+                on_wait(missing)
+    finally:
+        if reservation["status"] != "reserved":
+            with download_slots:
+                if disk_reservations.pop(key, None) is not None:
+                    download_slots.notify_all()
+
+
+def reserve_task_disk_space(task_id, url, work_dir, dest_dir, download_size, extract_size, final_size, game_name=None, on_wait=None):
+    """Réservations d'une tâche : download_size + extract_size sur le volume de travail et, si la zone de transit
+    est sur un autre volume que dest_dir, final_size (fichier ou contenu extrait) sur le volume du dossier ROM.
+    Même retour que reserve_disk_space ; en cas d'échec, aucune réservation n'est conservée."""
+    if not reserve_disk_space(task_id, url, work_dir, download_size, extract_size, game_name, on_wait):
+        return False
+    if work_dir == dest_dir or get_volume_id(work_dir) == get_volume_id(dest_dir):
+        return True
+    try:
+        reserved = reserve_disk_space(task_id, url, dest_dir, final_size, 0, game_name, on_wait,
+                                      key=task_id + DEST_RESERVATION_SUFFIX)
+    except BaseException:
+        release_disk_space(task_id)
+        raise
+    if not reserved:
+        release_disk_space(task_id)
+    return reserved
+
+
+def update_disk_reservation(task_id, **fields):
+    """Met à jour une réservation (written au fil du téléchargement, extract une fois l'archive lisible)."""
+    with download_slots:
+        reservation = disk_reservations.get(task_id)
+        if reservation:
+            reservation.update(fields)
+
+
+def release_disk_space(task_id):
+    """Libère les réservations de task_id (volume de travail et dossier ROM) et réveille les tâches en attente d'espace."""
+    with download_slots:
+        released = [disk_reservations.pop(key, None) for key in (task_id, task_id + DEST_RESERVATION_SUFFIX)]
+        if any(r is not None for r in released):
+            download_slots.notify_all()
+
+
+def get_disk_reservations():
+    """Instantané des réservations et de l'espace libre par volume, pour l'API."""
+    with download_slots:
+        reservations = [dict(r, outstanding=reservation_outstanding(r)) for r in disk_reservations.values()]
+    volumes = {}
+    for r in reservations:
+        volume = volumes.setdefault(r["volume"], {"path": r["path"], "free": None, "reserved": 0, "waiting": 0})
+        volume["reserved" if r["status"] == "reserved" else "waiting"] += r["outstanding"]
+    for volume in volumes.values():
         try:
-            response = requests.get(test_url, timeout=5, allow_redirects=True)
-            if response.status_code == 200:
-                logger.debug(f"[OK] Connexion HTTP vers {test_url} réussie (code: {response.status_code})")
-                http_success = True
+            volume["free"] = shutil.disk_usage(volume["path"]).free
+        except OSError:
+            pass
+    for r in reservations:
+        r.pop("volume")
+    return {"reservations": reservations, "volumes": list(volumes.values())}
+
+
+def get_archive_extract_size(archive_path):
+    """Taille extraite d'une archive téléchargée : somme du répertoire central ZIP, ou ratio pour les autres formats."""
+    try:
+        if archive_path.lower().endswith(".zip"):
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                return sum(info.file_size for info in zip_ref.infolist() if not info.is_dir())
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.debug(f"Répertoire central illisible pour {archive_path}: {e}")
+    return int(os.path.getsize(archive_path) * EXTRACT_SIZE_RATIO)
+
+
+def set_waiting_disk_message(url, missing):
+    """Affiche dans l'historique qu'un téléchargement attend de l'espace disque."""
+    if isinstance(config.history, list):
+        for entry in config.history:
+            if entry.get("url") == url and entry.get("status") in ["downloading", "Téléchargement"]:
+                message = _("network_waiting_disk_space").format(size_probe.format_catalog_size(missing))
+                if entry.get("message") != message:
+                    entry["message"] = message
+                    config.needs_redraw = True
                 break
-            else:
-                logger.debug(f"[FAIL] Connexion HTTP vers {test_url} échouée (code: {response.status_code})")
-        except requests.exceptions.Timeout:
-            logger.debug(f"[FAIL] Timeout connexion HTTP vers {test_url}")
-        except requests.exceptions.ConnectionError as e:
-            logger.debug(f"[FAIL] Erreur connexion HTTP vers {test_url}: {str(e)}")
-        except Exception as e:
-            logger.debug(f"[FAIL] Exception connexion HTTP vers {test_url}: {str(e)}")
-    
-    # Analyse des résultats
-    total_tests = 3
-    passed_tests = sum([ping_success, dns_success, http_success])
-    
-    logger.debug(f"=== Résultats test Internet: {passed_tests}/{total_tests} tests réussis ===")
-    logger.debug(f"Ping: {'[OK]' if ping_success else '[FAIL]'}")
-    logger.debug(f"DNS:  {'[OK]' if dns_success else '[FAIL]'}")
-    logger.debug(f"HTTP: {'[OK]' if http_success else '[FAIL]'}")
-    
-    # Diagnostic et conseils
-    if passed_tests == 0:
+
+
+def remove_partial_file(dest_path):
+    """Supprime un fichier partiel laissé par un volume plein (il ne pourra pas être repris)."""
+    try:
+        if dest_path and os.path.exists(dest_path):
+            os.remove(dest_path)
+            logger.info(f"Fichier partiel supprimé (volume plein): {dest_path}")
+    except OSError:
+        pass
+
+
+# Résolution 1fichier : infos de fichier (cache) et jetons de téléchargement anticipés
+ONEFICHIER_API = "https://api.1fichier.com/v1"
+ONEFICHIER_TOKEN_TTL = 240  # Les liens de téléchargement expirent après 5 minutes, on garde une marge
+ONEFICHIER_API_MIN_INTERVAL = 2  # Délai minimal (s) entre deux appels API pour respecter la limite de requêtes
+onefichier_tokens = {}  # {link: (timestamp, url de téléchargement)}
+onefichier_api_lock = threading.Lock()
+onefichier_last_call = [0.0]
+
+
+def onefichier_api_post(endpoint, link):
+    """Appel à l'API 1fichier, espacé d'au moins ONEFICHIER_API_MIN_INTERVAL secondes entre deux appels."""
+    headers = {
+        "Authorization": f"Bearer {config.API_KEY_1FICHIER}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "url": link,
+        "pretty": 1
+    }
+    with onefichier_api_lock:
+        wait = onefichier_last_call[0] + ONEFICHIER_API_MIN_INTERVAL - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            logger.debug(f"Requête {endpoint} pour {link}")
+            response = request_with_retry("POST", f"{ONEFICHIER_API}/{endpoint}", headers=headers, json=payload, timeout=30)
+        finally:
+            onefichier_last_call[0] = time.time()
+    logger.debug(f"Réponse {endpoint} reçue, code: {response.status_code}")
+    response.raise_for_status()
+    return response.json()
+
+
+def get_1fichier_file_info(link):
+    """Infos du fichier (nom, taille) pour un lien 1fichier, mises en cache CACHE_TTL secondes."""
+    cached = cache.get(link)
+    if cached and time.time() - cached[0] < CACHE_TTL:
+        return cached[1]
+    file_info = onefichier_api_post("file/info.cgi", link)
+    if file_info.get("filename"):
+        cache[link] = (time.time(), file_info)
+    return file_info
+
+
+def get_1fichier_token(link, refresh=False):
+    """URL de téléchargement pour un lien 1fichier, réutilisée tant qu'elle n'a pas expiré."""
+    cached = onefichier_tokens.get(link)
+    if not refresh and cached and time.time() - cached[0] < ONEFICHIER_TOKEN_TTL:
+        return cached[1]
+    final_url = onefichier_api_post("download/get_token.cgi", link).get("url")
+    if final_url:
+        onefichier_tokens[link] = (time.time(), final_url)
+    return final_url
+
+
+def prefetch_1fichier_token(link):
+    """Obtient à l'avance le jeton d'un lien en attente, pour démarrer le flux dès qu'un emplacement se libère."""
+    try:
+        get_1fichier_token(link)
+    except Exception as e:
+        logger.debug(f"Préchargement du jeton 1fichier échoué pour {link}: {e}")
+
+        
+# Test de connexion : toutes les sondes (ping, DNS, HTTP) partent en parallèle et la première réussite suffit.
+# Le résultat reste valable INTERNET_CHECK_TTL secondes ; sans réponse après INTERNET_CHECK_TIMEOUT, on conclut à l'absence de connexion.
+INTERNET_CHECK_TTL = 30
+INTERNET_CHECK_TIMEOUT = 10
+INTERNET_DNS_SERVERS = ['8.8.8.8', '1.1.1.1', '208.67.222.222']  # Google, Cloudflare, OpenDNS
+INTERNET_TEST_URLS = ['http://www.google.com', 'http://www.cloudflare.com', 'https://httpbin.org/get']
+internet_check = {"result": None, "time": 0.0}
+
+
+def _probe_ping(dns_server):
+    ping_option = '-n' if sys.platform.startswith("win") else '-c'
+    result = subprocess.run(['ping', ping_option, '2', dns_server], capture_output=True, text=True, timeout=8)
+    if result.returncode != 0 and result.stderr:
+        logger.debug(f"Erreur ping {dns_server}: {result.stderr.strip()}")
+    return result.returncode == 0
+
+
+def _probe_dns(hostname):
+    socket.gethostbyname(hostname)
+    return True
+
+
+def _probe_http(test_url):
+    # Une seule tentative : le test de connectivité doit échouer vite
+    response = request_with_retry("GET", test_url, max_attempts=1, timeout=5, allow_redirects=True)
+    return response.status_code == 200
+
+
+def _run_probe(results, name, probe, target):
+    try:
+        success = probe(target)
+    except subprocess.TimeoutExpired:
+        logger.debug(f"[FAIL] Timeout {name}")
+        success = False
+    except Exception as e:
+        logger.debug(f"[FAIL] Exception {name}: {str(e)}")
+        success = False
+    results.put((name, success))
+
+
+def test_internet(use_cache=True):
+    """Teste la connexion Internet (ping, DNS puis HTTP en parallèle) ; vrai dès qu'une sonde réussit."""
+    if use_cache and internet_check["result"] is not None and time.time() - internet_check["time"] < INTERNET_CHECK_TTL:
+        logger.debug(f"Test de connexion Internet en cache : {internet_check['result']}")
+        return internet_check["result"]
+    logger.debug("=== Début test de connexion Internet ===")
+    probes = [(f"ping vers {server}", _probe_ping, server) for server in INTERNET_DNS_SERVERS]
+    probes.append(("résolution DNS de google.com", _probe_dns, "google.com"))
+    probes += [(f"connexion HTTP vers {url}", _probe_http, url) for url in INTERNET_TEST_URLS]
+    # Threads démons : les sondes encore en attente après la première réussite ne retiennent pas la fermeture de l'application
+    results = queue.Queue()
+    for name, probe, target in probes:
+        threading.Thread(target=_run_probe, args=(results, name, probe, target), daemon=True).start()
+
+    success = False
+    deadline = time.monotonic() + INTERNET_CHECK_TIMEOUT
+    for _probe in probes:
+        try:
+            name, success = results.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            logger.debug(f"[FAIL] Aucune réponse des sondes après {INTERNET_CHECK_TIMEOUT}s")
+            break
+        logger.debug(f"{'[OK]' if success else '[FAIL]'} {name}")
+        if success:
+            break
+
+    if success:
+        logger.debug("[OK] Connexion Internet fonctionnelle")
+    else:
         logger.error("Aucune connexion Internet détectée. Vérifiez:")
         logger.error("- Câble réseau ou WiFi connecté")
         logger.error("- Configuration proxy/firewall")
         logger.error("- Paramètres réseau système")
-        return False
-    elif passed_tests < total_tests:
-        logger.warning(f"Connexion Internet partielle ({passed_tests}/{total_tests})")
-        if not ping_success:
-            logger.warning("- Ping échoué: possible blocage ICMP par firewall")
-        if not dns_success:
-            logger.warning("- DNS échoué: problème serveurs DNS")
-        if not http_success:
-            logger.warning("- HTTP échoué: possible blocage proxy/firewall")
-        return True  # Connexion partielle acceptable
-    else:
-        logger.debug("[OK] Connexion Internet complète et fonctionnelle")
-        return True
+    internet_check.update(result=success, time=time.time())
+    return success
+
+
+def start_internet_check():
+    """Lance test_internet() dans un thread ; retourne un Future du résultat, à consulter sans bloquer la boucle principale."""
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(test_internet())
+        except Exception as e:
+            logger.error(f"Erreur lors du test de connexion Internet: {str(e)}")
+            future.set_result(False)
+
+    threading.Thread(target=run, name="internet-check", daemon=True).start()
+    return future
 
 
 async def check_for_updates():
@@ -143,7 +1135,7 @@ async def check_for_updates():
         config.current_loading_system = _("network_checking_updates")
         config.loading_progress = 5.0
         config.needs_redraw = True
-        response = requests.get(OTA_VERSION_ENDPOINT, timeout=5)
+        response = request_with_retry("GET", OTA_VERSION_ENDPOINT, timeout=5)
         response.raise_for_status()
         if response.headers.get("content-type") != "application/json":
             raise ValueError(f"Le fichier version.json n'est pas un JSON valide (type de contenu : {response.headers.get('content-type')})")
@@ -164,7 +1156,7 @@ async def check_for_updates():
             logger.debug(f"Téléchargement de {UPDATE_ZIP} vers {update_zip_path}")
 
             # Télécharger le ZIP
-            with requests.get(UPDATE_ZIP, stream=True, timeout=10) as r:
+            with request_with_retry("GET", UPDATE_ZIP, stream=True, timeout=10) as r:
                 r.raise_for_status()
                 total_size = int(r.headers.get('content-length', 0))
                 downloaded = 0
@@ -252,8 +1244,8 @@ progress_queues = {}
 
 
 
-async def download_rom(url, platform, game_name, is_zip_non_supported=False, task_id=None):
-    logger.debug(f"Début téléchargement: {game_name} depuis {url}, is_zip_non_supported={is_zip_non_supported}, task_id={task_id}")
+async def download_rom(url, platform, game_name, is_zip_non_supported=False, task_id=None, force=False, resume_offset=0):
+    logger.debug(f"Début téléchargement: {game_name} depuis {url}, is_zip_non_supported={is_zip_non_supported}, task_id={task_id}, force={force}")
     result = [None, None]
     
     # Créer une queue spécifique pour cette tâche
@@ -262,89 +1254,71 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
     
     def download_thread():
         logger.debug(f"Thread téléchargement démarré pour {url}, task_id={task_id}")
+        queue_progress = QueueProgress(task_id, resume_offset)
+        suspended = False
         try:
-            # Use symlink path if enabled
-            from rgsx_settings import apply_symlink_path
-            
-            dest_dir = None
-            for platform_dict in config.platform_dicts:
-                if platform_dict["platform"] == platform:
-                    platform_folder = platform_dict.get("folder", normalize_platform_name(platform))
-                    dest_dir = apply_symlink_path(config.ROMS_FOLDER, platform_folder)
-                    logger.debug(f"Répertoire de destination trouvé pour {platform}: {dest_dir}")
-                    break
-            if not dest_dir:
-                platform_folder = normalize_platform_name(platform)
-                dest_dir = apply_symlink_path(config.ROMS_FOLDER, platform_folder)
+            dest_dir = get_destination_dir(platform)
+            logger.debug(f"Répertoire de destination pour {platform}: {dest_dir}")
             print(f"[download_rom] dest_dir={dest_dir} url={url}")
             os.makedirs(dest_dir, exist_ok=True)
             if not os.access(dest_dir, os.W_OK):
                 raise PermissionError(f"Pas de permission d'écriture dans {dest_dir}")
                 
             sanitized_name = sanitize_filename(game_name)
-            dest_path = os.path.join(dest_dir, f"{sanitized_name}")
+            already_present = not force and is_already_present(os.path.join(dest_dir, sanitized_name), url)
+            # Avec une zone de transit, téléchargement et extraction se font hors du dossier ROM
+            work_dir = staging.get_work_dir(task_id) if staging.is_staging_enabled() and not already_present else dest_dir
+            dest_path = os.path.join(work_dir, f"{sanitized_name}")
             logger.debug(f"Chemin destination: {dest_path}")
             print(f"[download_rom] dest_path={dest_path}")
+            download_queue.update_download(task_id, dest_path=dest_path)
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            session = requests.Session()
-            session.headers.update(headers)
-            
-            download_headers = headers.copy()
-            download_headers['Accept'] = 'application/octet-stream, */*'
-            download_headers['Referer'] = 'https://myrient.erista.me/'
-            print(f"[download_rom] GET {url}")
-            response = session.get(url, stream=True, timeout=30, allow_redirects=True, headers=download_headers)
-            logger.debug(f"Status code: {response.status_code}")
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            logger.debug(f"Taille totale: {total_size} octets")
-            print(f"[download_rom] content-length={total_size}")
-            if isinstance(config.history, list):
-                for entry in config.history:
-                    if "url" in entry and entry["url"] == url:
-                        entry["total_size"] = total_size  # Ajouter la taille totale
-                        save_history(config.history)
-                        break
-            
-            # Initialiser la progression avec task_id
-            progress_queues[task_id].put((task_id, 0, total_size))
-            logger.debug(f"Progression initiale envoyée: 0% pour {game_name}, task_id={task_id}")
+            if already_present:
+                # Fichier déjà présent avec la bonne taille : pas de transfert
+                total_size = os.path.getsize(dest_path)
+                logger.info(f"Fichier déjà présent avec la taille attendue, téléchargement ignoré: {dest_path}")
+                progress_queues[task_id].put((task_id, total_size, total_size))
+            else:
+                session = requests.Session()
+                session.headers.update(BROWSER_HEADERS)
             
-            downloaded = 0
-            chunk_size = 4096
-            last_update_time = time.time()
-            last_downloaded = 0
-            update_interval = 0.1  # Mettre à jour toutes les 0,1 secondes
-            with open(dest_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        size_received = len(chunk)
-                        f.write(chunk)
-                        downloaded += size_received
-                        if downloaded == size_received:
-                            print(f"[download_rom] first bytes received: {size_received}")
-                        # Cancellation check
-                        if is_canceled(task_id, url):
-                            raise KeyboardInterrupt("Canceled by user")
-                        current_time = time.time()
-                        if current_time - last_update_time >= update_interval:
-                            # Calcul de la vitesse en Mo/s
-                            delta = downloaded - last_downloaded
-                            speed = delta / (current_time - last_update_time) / (1024 * 1024)
-                            last_downloaded = downloaded
-                            last_update_time = current_time
-                            progress_queues[task_id].put((task_id, downloaded, total_size, speed))
+                download_headers = BROWSER_HEADERS.copy()
+                download_headers['Accept'] = 'application/octet-stream, */*'
+                download_headers['Accept-Encoding'] = 'identity'  # Nécessaire pour la reprise par plage d'octets
+
+                def on_start(total_size):
+                    logger.debug(f"Taille totale: {total_size} octets")
+                    print(f"[download_rom] content-length={total_size}")
+                    if isinstance(config.history, list):
+                        for entry in config.history:
+                            if "url" in entry and entry["url"] == url:
+                                entry["total_size"] = total_size  # Ajouter la taille totale
+                                save_history(config.history)
+                                break
+                    # Initialiser la progression avec task_id
+                    progress_queues[task_id].put((task_id, 0, total_size))
+                    logger.debug(f"Progression initiale envoyée: 0% pour {game_name}, task_id={task_id}")
+
+                def on_progress(downloaded, total_size, speed):
+                    progress_queues[task_id].put((task_id, downloaded, total_size, speed))
+                    queue_progress.update(downloaded, total_size)
+                    update_disk_reservation(task_id, written=downloaded - start_offset)
+
+                # Réserver l'espace disque (archive + contenu extrait) avant d'occuper un emplacement
+                expected_size = get_remote_size(url) or 0
+                extract_size = estimate_extracted_size(url, expected_size) if is_zip_non_supported else 0
+                if not reserve_task_disk_space(task_id, url, work_dir, dest_dir, max(0, expected_size - resume_offset), extract_size,
+                                               extract_size or expected_size, game_name, lambda missing: set_waiting_disk_message(url, missing)):
+                    raise KeyboardInterrupt("Canceled by user")
+                if not acquire_download_slot(task_id, url):
+                    raise KeyboardInterrupt("Canceled by user")
+                try:
+                    download_queue.update_download(task_id, status="running")
+                    start_offset = prepare_resume(dest_path, resume_offset)
+                    download_with_mirrors(session, url, dest_path, download_headers, task_id, on_start, on_progress, start_offset,
+                                          start_transfer_stats(task_id, url))
+                finally:
+                    release_download_slot(task_id)
 
             
             os.chmod(dest_path, 0o644)
@@ -353,6 +1327,10 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
             if is_zip_non_supported:
                 logger.debug(f"Extraction automatique nécessaire pour {dest_path}")
                 extension = os.path.splitext(dest_path)[1].lower()
+                # Archive sur le disque : la réservation ne couvre plus que le contenu extrait (taille exacte, aussi côté dossier ROM)
+                extracted_size = get_archive_extract_size(dest_path)
+                update_disk_reservation(task_id, download=0, written=0, extract=extracted_size)
+                update_disk_reservation(task_id + DEST_RESERVATION_SUFFIX, download=extracted_size)
                 if extension == ".zip":
                     try:
                         if isinstance(config.history, list):
@@ -365,7 +1343,7 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
                                     config.needs_redraw = True
                                     break
                         
-                        success, msg = extract_zip(dest_path, dest_dir, url)
+                        success, msg = extract_zip(dest_path, work_dir, url, platform_dir=dest_dir)
                         if success:
                             logger.debug(f"Extraction ZIP réussie: {msg}")
                             result[0] = True
@@ -380,7 +1358,7 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
                         result[1] = f"Erreur téléchargement {game_name}: {str(e)}"
                 elif extension == ".rar":
                     try:
-                        success, msg = extract_rar(dest_path, dest_dir, url)
+                        success, msg = extract_rar(dest_path, work_dir, url, cancel_token=get_cancel_token(task_id, url), platform_dir=dest_dir)
                         if success:
                             logger.debug(f"Extraction RAR réussie: {msg}")
                             result[0] = True
@@ -397,9 +1375,25 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
                     logger.warning(f"Type d'archive non supporté: {extension}")
                     result[0] = True
                     result[1] = _("network_download_ok").format(game_name)
+            elif already_present:
+                result[0] = True
+                result[1] = _("network_already_present").format(game_name)
             else:
                 result[0] = True
                 result[1] = _("network_download_ok").format(game_name)
+            if result[0] and work_dir != dest_dir:
+                # Résultat complet dans la zone de transit : déplacement séquentiel vers le dossier ROM
+                moved, error = staging.move_to_destination(work_dir, dest_dir, url)
+                if not moved:
+                    result[0] = False
+                    result[1] = error
+        except DownloadSuspended:
+            # Arrêt de l'application : fichier partiel conservé pour la reprise au prochain démarrage
+            suspended = True
+            queue_progress.pause()
+            logger.info(f"Téléchargement suspendu pour {url} à l'octet {queue_progress.downloaded}")
+            result[0] = False
+            result[1] = _("network_download_suspended").format(game_name)
         except KeyboardInterrupt:
             logger.info(f"Téléchargement annulé pour {url}")
             try:
@@ -418,11 +1412,22 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
                         save_history(config.history)
                         config.needs_redraw = True
                         break
+        except InsufficientDiskSpace as e:
+            logger.error(f"Espace disque insuffisant pour {url}: {str(e)}")
+            result[0] = False
+            result[1] = str(e)
         except Exception as e:
             logger.error(f"Erreur téléchargement {url}: {str(e)}")
+            if isinstance(e, OSError) and e.errno == errno.ENOSPC:
+                remove_partial_file(locals().get('dest_path'))
             result[0] = False
             result[1] = _("network_download_error").format(game_name, str(e))
         finally:
+            release_disk_space(task_id)
+            if not suspended:
+                download_queue.remove_download(task_id)
+                if locals().get('work_dir') not in (None, locals().get('dest_dir')):
+                    staging.remove_work_dir(work_dir)
             logger.debug(f"Thread téléchargement terminé pour {url}, task_id={task_id}")
             progress_queues[task_id].put((task_id, result[0], result[1]))
             logger.debug(f"Final result sent to queue: success={result[0]}, message={result[1]}, task_id={task_id}")
@@ -431,53 +1436,61 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
     thread.start()
     
     # Boucle principale pour mettre à jour la progression
-    while thread.is_alive():
-        try:
-            task_queue = progress_queues.get(task_id)
-            if task_queue:
-                while not task_queue.empty():
-                    data = task_queue.get()
-                    #logger.debug(f"Progress queue data received: {data}")
-                    if isinstance(data[1], bool):  # Fin du téléchargement
-                        success, message = data[1], data[2]
-                        if isinstance(config.history, list):
-                            for entry in config.history:
-                                if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement", "Extracting"]:
-                                    if is_canceled(task_id, url):
-                                        entry["status"] = "canceled"
-                                        entry["progress"] = 0
-                                    else:
-                                        entry["status"] = "Download_OK" if success else "Erreur"
-                                        entry["progress"] = 100 if success else 0
-                                    entry["message"] = message
-                                    save_history(config.history)
-                                    config.needs_redraw = True
-                                    logger.debug(f"Final update in history: status={entry['status']}, progress={entry['progress']}%, message={message}, task_id={task_id}")
-                                    break
-                    else:
-                        if len(data) >= 4:
-                            downloaded, total_size, speed = data[1], data[2], data[3]
+    try:
+        while thread.is_alive():
+            try:
+                task_queue = progress_queues.get(task_id)
+                if task_queue:
+                    while not task_queue.empty():
+                        data = task_queue.get()
+                        #logger.debug(f"Progress queue data received: {data}")
+                        if isinstance(data[1], bool):  # Fin du téléchargement
+                            success, message = data[1], data[2]
+                            if isinstance(config.history, list):
+                                for entry in config.history:
+                                    if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement", "Extracting"]:
+                                        if is_canceled(task_id, url):
+                                            entry["status"] = "canceled"
+                                            entry["progress"] = 0
+                                        else:
+                                            entry["status"] = "Download_OK" if success else "Erreur"
+                                            entry["progress"] = 100 if success else 0
+                                        entry["message"] = message
+                                        save_history(config.history)
+                                        config.needs_redraw = True
+                                        logger.debug(f"Final update in history: status={entry['status']}, progress={entry['progress']}%, message={message}, task_id={task_id}")
+                                        break
                         else:
-                            downloaded, total_size = data[1], data[2]
-                            speed = 0.0
-                        progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
-                        progress_percent = max(0, min(100, progress_percent))
+                            if len(data) >= 4:
+                                downloaded, total_size, speed = data[1], data[2], data[3]
+                            else:
+                                downloaded, total_size = data[1], data[2]
+                                speed = 0.0
+                            progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
+                            progress_percent = max(0, min(100, progress_percent))
                             
-                        if isinstance(config.history, list):
-                            for entry in config.history:
-                                if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement"]:
-                                    entry["progress"] = progress_percent
-                                    entry["status"] = "Téléchargement"
-                                    entry["downloaded_size"] = downloaded
-                                    entry["total_size"] = total_size
-                                    entry["speed"] = speed
-                                    config.needs_redraw = True
-                                    break
-                            save_history(config.history)           
-            await asyncio.sleep(0.1)
-        except Exception as e:
-            logger.error(f"Erreur mise à jour progression: {str(e)}")
-    
+                            if isinstance(config.history, list):
+                                for entry in config.history:
+                                    if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement"]:
+                                        entry["progress"] = progress_percent
+                                        entry["status"] = "Téléchargement"
+                                        entry["downloaded_size"] = downloaded
+                                        entry["total_size"] = total_size
+                                        entry["speed"] = speed
+                                        entry["eta"] = get_eta(url)
+                                        config.needs_redraw = True
+                                        break
+                                save_history(config.history)           
+                await asyncio.sleep(0.1)
+            except Exception as e:
+                logger.error(f"Erreur mise à jour progression: {str(e)}")
+    except asyncio.CancelledError:
+        # Tâche asyncio annulée : arrêter aussi le thread avant de rendre la main
+        request_cancel(task_id)
+        while thread.is_alive():
+            await asyncio.sleep(0.05)
+        raise
+
     thread.join()
     # Drain any remaining progress/final messages after thread exit
     try:
@@ -516,6 +1529,7 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
                                 entry["downloaded_size"] = downloaded
                                 entry["total_size"] = total_size
                                 entry["speed"] = speed
+                                entry["eta"] = get_eta(url)
                                 config.needs_redraw = True
                                 break
                         save_history(config.history)
@@ -526,9 +1540,9 @@ async def download_rom(url, platform, game_name, is_zip_non_supported=False, tas
         del progress_queues[task_id]
     return result[0], result[1]
 
-async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=False, task_id=None):
+async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=False, task_id=None, force=False, resume_offset=0):
     config.API_KEY_1FICHIER = load_api_key_1fichier()
-    logger.debug(f"Début téléchargement 1fichier: {game_name} depuis {url}, is_zip_non_supported={is_zip_non_supported}, task_id={task_id}")
+    logger.debug(f"Début téléchargement 1fichier: {game_name} depuis {url}, is_zip_non_supported={is_zip_non_supported}, task_id={task_id}, force={force}")
     logger.debug(f"Clé API 1fichier: {'présente' if config.API_KEY_1FICHIER else 'absente'}")
     result = [None, None]
 
@@ -539,22 +1553,12 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
 
     def download_thread():
         logger.debug(f"Thread téléchargement 1fichier démarré pour {url}, task_id={task_id}")
+        queue_progress = QueueProgress(task_id, resume_offset)
+        suspended = False
         try:
             link = url.split('&af=')[0]
             logger.debug(f"URL nettoyée: {link}")
-            # Use symlink path if enabled
-            from rgsx_settings import apply_symlink_path
-            
-            dest_dir = None
-            for platform_dict in config.platform_dicts:
-                if platform_dict["platform"] == platform:
-                    platform_folder = platform_dict.get("folder", normalize_platform_name(platform))
-                    dest_dir = apply_symlink_path(config.ROMS_FOLDER, platform_folder)
-                    break
-            if not dest_dir:
-                logger.warning(f"Aucun dossier 'folder' trouvé pour la plateforme {platform}")
-                platform_folder = normalize_platform_name(platform)
-                dest_dir = apply_symlink_path(config.ROMS_FOLDER, platform_folder)
+            dest_dir = get_destination_dir(platform)
             logger.debug(f"Répertoire destination déterminé: {dest_dir}")
 
             logger.debug(f"Vérification répertoire destination: {dest_dir}")
@@ -564,19 +1568,8 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
                 logger.error(f"Pas de permission d'écriture dans {dest_dir}")
                 raise PermissionError(f"Pas de permission d'écriture dans {dest_dir}")
 
-            headers = {
-                "Authorization": f"Bearer {config.API_KEY_1FICHIER}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "url": link,
-                "pretty": 1
-            }
-            logger.debug(f"Préparation requête file/info pour {link}")
-            response = requests.post("https://api.1fichier.com/v1/file/info.cgi", headers=headers, json=payload, timeout=30)
-            logger.debug(f"Réponse file/info reçue, code: {response.status_code}")
-            response.raise_for_status()
-            file_info = response.json()
+            # Infos du fichier (en cache si déjà résolues) avant même d'obtenir un emplacement
+            file_info = get_1fichier_file_info(link)
 
             if "error" in file_info and file_info["error"] == "Resource not found":
                 logger.error(f"Le fichier {game_name} n'existe pas sur 1fichier")
@@ -592,143 +1585,234 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
                 return
 
             sanitized_filename = sanitize_filename(filename)
-            dest_path = os.path.join(dest_dir, sanitized_filename)
+            already_present = not force and is_already_present(os.path.join(dest_dir, sanitized_filename), expected_size=file_info.get("size"))
+            # Avec une zone de transit, téléchargement et extraction se font hors du dossier ROM
+            work_dir = staging.get_work_dir(task_id) if staging.is_staging_enabled() and not already_present else dest_dir
+            dest_path = os.path.join(work_dir, sanitized_filename)
             logger.debug(f"Chemin destination: {dest_path}")
-            logger.debug(f"Envoi requête get_token pour {link}")
-            response = requests.post("https://api.1fichier.com/v1/download/get_token.cgi", headers=headers, json=payload, timeout=30)
-            logger.debug(f"Réponse get_token reçue, code: {response.status_code}")
-            response.raise_for_status()
-            download_info = response.json()
-
-            final_url = download_info.get("url")
-            if not final_url:
-                logger.error(f"Impossible de récupérer l'URL de téléchargement")
-                result[0] = False
-                result[1] = _("network_cannot_get_download_url")
-                return
-
-            logger.debug(f"URL de téléchargement obtenue: {final_url}")
+            download_queue.update_download(task_id, dest_path=dest_path)
             lock = threading.Lock()
-            retries = 10
-            retry_delay = 10
-            logger.debug(f"Initialisation progression avec taille inconnue pour task_id={task_id}")
-            progress_queues[task_id].put((task_id, 0, 0))  # Taille initiale inconnue
-            for attempt in range(retries):
-                logger.debug(f"Début tentative {attempt + 1} pour télécharger {final_url}")
+            retry_policy = get_retry_policy()
+            retries = retry_policy["max_attempts"]
+            if already_present:
+                # Fichier déjà présent avec la bonne taille : ni jeton ni transfert
+                total_size = os.path.getsize(dest_path)
+                logger.info(f"Fichier déjà présent avec la taille attendue, téléchargement ignoré: {dest_path}")
+                progress_queues[task_id].put((task_id, total_size, total_size))
+            else:
+                logger.debug(f"Initialisation progression avec taille inconnue pour task_id={task_id}")
+                progress_queues[task_id].put((task_id, 0, 0))  # Taille initiale inconnue
+                # En attente d'un emplacement, le prochain servi garde un jeton valide d'avance
+                def on_wait(position):
+                    if position == 0:
+                        prefetch_1fichier_token(link)
+
+                # Réserver l'espace disque (archive + contenu extrait) avant d'occuper un emplacement
+                expected_size = int(file_info.get("size") or 0)
+                extract_size = int(expected_size * EXTRACT_SIZE_RATIO) if is_zip_non_supported else 0
+                if not reserve_task_disk_space(task_id, url, work_dir, dest_dir, max(0, expected_size - resume_offset), extract_size,
+                                               extract_size or expected_size, game_name, lambda missing: set_waiting_disk_message(url, missing)):
+                    raise KeyboardInterrupt("Canceled by user")
+                if not acquire_download_slot(task_id, url, on_wait):
+                    raise KeyboardInterrupt("Canceled by user")
                 try:
-                    with requests.get(final_url, stream=True, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30) as response:
-                        logger.debug(f"Réponse GET reçue, code: {response.status_code}")
-                        response.raise_for_status()
-                        total_size = int(response.headers.get('content-length', 0))
-                        logger.debug(f"Taille totale: {total_size} octets")
-                        if isinstance(config.history, list):
-                            for entry in config.history:
-                                if "url" in entry and entry["url"] == url:
-                                    entry["total_size"] = total_size  # Ajouter la taille totale
-                                    save_history(config.history)
-                                    break
-                        with lock:
-                            if isinstance(config.history, list):
-                                for entry in config.history:
-                                    if "url" in entry and entry["url"] == url and entry["status"] == "downloading":
-                                        entry["total_size"] = total_size
-                                        config.needs_redraw = True
-                                        break
-                            progress_queues[task_id].put((task_id, 0, total_size))  # Mettre à jour la taille totale
-
-                        downloaded = 0
-                        chunk_size = 8192
-                        last_update_time = time.time()
-                        update_interval = 0.1  # Mettre à jour toutes les 0,1 secondes
-                        logger.debug(f"Ouverture fichier: {dest_path}")
-                        with open(dest_path, 'wb') as f:
-                            for chunk in response.iter_content(chunk_size=chunk_size):
-                                if chunk:
-                                    f.write(chunk)
-                                    downloaded += len(chunk)
-                                    if is_canceled(task_id, url):
-                                        raise KeyboardInterrupt("Canceled by user")
-                                    current_time = time.time()
-                                    if current_time - last_update_time >= update_interval:
-                                        with lock:
-                                            if isinstance(config.history, list):
-                                                for entry in config.history:
-                                                    if "url" in entry and entry["url"] == url and entry["status"] == "downloading":
-                                                        progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
-                                                        progress_percent = max(0, min(100, progress_percent))
-                                                        entry["progress"] = progress_percent
-                                                        entry["status"] = "Téléchargement"
-                                                        entry["downloaded_size"] = downloaded
-                                                        entry["total_size"] = total_size
-                                                        config.needs_redraw = True
-                                                        break
-                                        progress_queues[task_id].put((task_id, downloaded, total_size))
-                                        last_update_time = current_time
-
-                    if is_zip_non_supported:
-                        with lock:
-                            if isinstance(config.history, list):
-                                for entry in config.history:
-                                    if "url" in entry and entry["url"] == url and entry["status"] == "Téléchargement":
-                                        entry["progress"] = 0
-                                        entry["status"] = "Extracting"
-                                        config.needs_redraw = True
-                                        break
-                        extension = os.path.splitext(dest_path)[1].lower()
-                        logger.debug(f"Début extraction, type d'archive: {extension}")
-                        if extension == ".zip":
-                            try:
-                                success, msg = extract_zip(dest_path, dest_dir, url)
-                                logger.debug(f"Extraction ZIP terminée: {msg}")
-                                if success:
-                                    result[0] = True
-                                    result[1] = _("network_download_extract_ok").format(game_name)
-                                else:
-                                    logger.error(f"Erreur extraction ZIP: {msg}")
-                                    result[0] = False
-                                    result[1] = _("network_extraction_failed").format(msg)
-                            except Exception as e:
-                                logger.error(f"Exception lors de l'extraction ZIP: {str(e)}")
-                                result[0] = False
-                                result[1] = f"Erreur téléchargement {game_name}: {str(e)}"
-                        elif extension == ".rar":
-                            try:
-                                success, msg = extract_rar(dest_path, dest_dir, url)
-                                logger.debug(f"Extraction RAR terminée: {msg}")
-                                if success:
-                                    result[0] = True
-                                    result[1] = _("network_download_extract_ok").format(game_name)
+                    download_queue.update_download(task_id, status="running")
+                    final_url = get_1fichier_token(link)
+                    if not final_url:
+                        logger.error(f"Impossible de récupérer l'URL de téléchargement")
+                        result[0] = False
+                        result[1] = _("network_cannot_get_download_url")
+                        return
+
+                    logger.debug(f"URL de téléchargement obtenue: {final_url}")
+                    downloaded = start_offset = prepare_resume(dest_path, resume_offset)
+                    total_size = 0
+                    attempt = 0
+                    token = get_cancel_token(task_id, url)
+                    stats = start_transfer_stats(task_id, url)
+                    while True:
+                        logger.debug(f"Début tentative {attempt + 1} pour télécharger {final_url}")
+                        segment_bytes = 0
+                        response = None
+                        try:
+                            request_headers = {'User-Agent': 'Mozilla/5.0'}
+                            if downloaded:
+                                # Reprise à l'octet déjà reçu
+                                request_headers['Range'] = f"bytes={downloaded}-"
+                            with requests.get(final_url, stream=True, headers=request_headers, timeout=30) as response:
+                                if token:
+                                    # L'annulation coupe le socket de la réponse et interrompt une lecture bloquée
+                                    token.register(response)
+                                logger.debug(f"Réponse GET reçue, code: {response.status_code}")
+                                response.raise_for_status()
+                                if downloaded and response.status_code != 206:
+                                    logger.warning(f"Reprise refusée par le serveur, redémarrage à 0")
+                                    downloaded = 0
+                                if response.status_code == 206 and '/' in response.headers.get('content-range', ''):
+                                    total_size = int(response.headers['content-range'].rsplit('/', 1)[1])
                                 else:
-                                    logger.error(f"Erreur extraction RAR: {msg}")
-                                    result[0] = False
-                                    result[1] = _("network_extraction_failed").format(msg)
-                            except Exception as e:
-                                logger.error(f"Exception lors de l'extraction RAR: {str(e)}")
+                                    total_size = int(response.headers.get('content-length', 0))
+                                logger.debug(f"Taille totale: {total_size} octets")
+                                if isinstance(config.history, list):
+                                    for entry in config.history:
+                                        if "url" in entry and entry["url"] == url:
+                                            entry["total_size"] = total_size  # Ajouter la taille totale
+                                            save_history(config.history)
+                                            break
+                                with lock:
+                                    if isinstance(config.history, list):
+                                        for entry in config.history:
+                                            if "url" in entry and entry["url"] == url and entry["status"] == "downloading":
+                                                entry["total_size"] = total_size
+                                                config.needs_redraw = True
+                                                break
+                                    progress_queues[task_id].put((task_id, downloaded, total_size))  # Mettre à jour la taille totale
+
+                                stats.update(downloaded, total_size, urlparse(final_url).netloc)
+                                chunk_size = 8192
+                                last_update_time = time.time()
+                                update_interval = 0.1  # Mettre à jour toutes les 0,1 secondes
+                                logger.debug(f"Ouverture fichier: {dest_path}")
+                                with open(dest_path, 'ab' if downloaded else 'wb') as f:
+                                    for chunk in response.iter_content(chunk_size=chunk_size):
+                                        if chunk:
+                                            f.write(chunk)
+                                            downloaded += len(chunk)
+                                            segment_bytes += len(chunk)
+                                            check_interrupted(task_id, url)
+                                            current_time = time.time()
+                                            if current_time - last_update_time >= update_interval:
+                                                stats.update(downloaded, total_size)
+                                                with lock:
+                                                    if isinstance(config.history, list):
+                                                        for entry in config.history:
+                                                            if "url" in entry and entry["url"] == url and entry["status"] == "downloading":
+                                                                progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
+                                                                progress_percent = max(0, min(100, progress_percent))
+                                                                entry["progress"] = progress_percent
+                                                                entry["status"] = "Téléchargement"
+                                                                entry["downloaded_size"] = downloaded
+                                                                entry["total_size"] = total_size
+                                                                entry["speed"] = stats.speed_mbps()
+                                                                entry["eta"] = stats.eta()
+                                                                config.needs_redraw = True
+                                                                break
+                                                progress_queues[task_id].put((task_id, downloaded, total_size, stats.speed_mbps()))
+                                                queue_progress.update(downloaded, total_size)
+                                                update_disk_reservation(task_id, written=downloaded - start_offset)
+                                                last_update_time = current_time
+                            check_interrupted(task_id, url)
+                            if total_size and downloaded < total_size:
+                                raise requests.exceptions.ChunkedEncodingError(f"Flux interrompu à {downloaded}/{total_size} octets")
+                            onefichier_tokens.pop(link, None)  # Jeton consommé
+                            break
+
+                        except requests.exceptions.RequestException as e:
+                            check_interrupted(task_id, url)
+                            logger.error(f"Tentative {attempt + 1} échouée: {e}")
+                            if segment_bytes:
+                                attempt = 0  # Le transfert progresse : seules les erreurs consécutives comptent
+                            status = e.response.status_code if e.response is not None else None
+                            # Un lien expiré ou refusé (403/404/410) se corrige avec un nouveau jeton
+                            renew_token = status in (403, 404, 410)
+                            if (not is_retryable_error(e) and not renew_token) or attempt >= retries - 1:
+                                logger.error(f"Nombre maximum de tentatives atteint")
                                 result[0] = False
-                                result[1] = f"Erreur extraction RAR {game_name}: {str(e)}"
+                                result[1] = _("network_download_failed").format(retries)
+                                return
+                            retry_delay = get_retry_delay(attempt, retry_policy, e.response)
+                            logger.debug(f"Attente de {retry_delay:.1f} secondes avant nouvelle tentative")
+                            wait_before_retry(retry_delay, task_id, url)
+                            attempt += 1
+                            if renew_token:
+                                try:
+                                    final_url = get_1fichier_token(link, refresh=True) or final_url
+                                except requests.exceptions.RequestException as token_error:
+                                    logger.warning(f"Renouvellement du jeton échoué: {token_error}")
+                        except (KeyboardInterrupt, DownloadSuspended):
+                            raise
+                        except Exception:
+                            # Réponse interrompue par une annulation pendant la lecture
+                            check_interrupted(task_id, url)
+                            raise
+                        finally:
+                            if token and response is not None:
+                                token.unregister(response)
+                finally:
+                    release_download_slot(task_id)
+
+            if is_zip_non_supported:
+                with lock:
+                    if isinstance(config.history, list):
+                        for entry in config.history:
+                            if "url" in entry and entry["url"] == url and entry["status"] == "Téléchargement":
+                                entry["progress"] = 0
+                                entry["status"] = "Extracting"
+                                config.needs_redraw = True
+                                break
+                extension = os.path.splitext(dest_path)[1].lower()
+                logger.debug(f"Début extraction, type d'archive: {extension}")
+                # Archive sur le disque : la réservation ne couvre plus que le contenu extrait (taille exacte, aussi côté dossier ROM)
+                extracted_size = get_archive_extract_size(dest_path)
+                update_disk_reservation(task_id, download=0, written=0, extract=extracted_size)
+                update_disk_reservation(task_id + DEST_RESERVATION_SUFFIX, download=extracted_size)
+                if extension == ".zip":
+                    try:
+                        success, msg = extract_zip(dest_path, work_dir, url, platform_dir=dest_dir)
+                        logger.debug(f"Extraction ZIP terminée: {msg}")
+                        if success:
+                            result[0] = True
+                            result[1] = _("network_download_extract_ok").format(game_name)
                         else:
-                            logger.warning(f"Type d'archive non supporté: {extension}")
+                            logger.error(f"Erreur extraction ZIP: {msg}")
+                            result[0] = False
+                            result[1] = _("network_extraction_failed").format(msg)
+                    except Exception as e:
+                        logger.error(f"Exception lors de l'extraction ZIP: {str(e)}")
+                        result[0] = False
+                        result[1] = f"Erreur téléchargement {game_name}: {str(e)}"
+                elif extension == ".rar":
+                    try:
+                        success, msg = extract_rar(dest_path, work_dir, url, cancel_token=get_cancel_token(task_id, url), platform_dir=dest_dir)
+                        logger.debug(f"Extraction RAR terminée: {msg}")
+                        if success:
                             result[0] = True
-                            result[1] = _("network_download_ok").format(game_name)
-                    else:
-                        logger.debug(f"Application des permissions sur {dest_path}")
-                        os.chmod(dest_path, 0o644)
-                        logger.debug(f"Téléchargement terminé: {dest_path}")
-                        result[0] = True
-                        result[1] = _("network_download_ok").format(game_name)
-                    return
-
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Tentative {attempt + 1} échouée: {e}")
-                    if attempt < retries - 1:
-                        logger.debug(f"Attente de {retry_delay} secondes avant nouvelle tentative")
-                        time.sleep(retry_delay)
-                    else:
-                        logger.error(f"Nombre maximum de tentatives atteint")
+                            result[1] = _("network_download_extract_ok").format(game_name)
+                        else:
+                            logger.error(f"Erreur extraction RAR: {msg}")
+                            result[0] = False
+                            result[1] = _("network_extraction_failed").format(msg)
+                    except Exception as e:
+                        logger.error(f"Exception lors de l'extraction RAR: {str(e)}")
                         result[0] = False
-                        result[1] = _("network_download_failed").format(retries)
-                        return
+                        result[1] = f"Erreur extraction RAR {game_name}: {str(e)}"
+                else:
+                    logger.warning(f"Type d'archive non supporté: {extension}")
+                    result[0] = True
+                    result[1] = _("network_download_ok").format(game_name)
+            elif already_present:
+                result[0] = True
+                result[1] = _("network_already_present").format(game_name)
+            else:
+                logger.debug(f"Application des permissions sur {dest_path}")
+                os.chmod(dest_path, 0o644)
+                logger.debug(f"Téléchargement terminé: {dest_path}")
+                result[0] = True
+                result[1] = _("network_download_ok").format(game_name)
+            if result[0] and work_dir != dest_dir:
+                # Résultat complet dans la zone de transit : déplacement séquentiel vers le dossier ROM
+                moved, error = staging.move_to_destination(work_dir, dest_dir, url)
+                if not moved:
+                    result[0] = False
+                    result[1] = error
 
+        except DownloadSuspended:
+            # Arrêt de l'application : fichier partiel conservé pour la reprise au prochain démarrage
+            suspended = True
+            queue_progress.pause()
+            logger.info(f"Téléchargement 1fichier suspendu pour {url} à l'octet {queue_progress.downloaded}")
+            result[0] = False
+            result[1] = _("network_download_suspended").format(game_name)
         except KeyboardInterrupt:
             logger.info(f"Téléchargement 1fichier annulé pour {url}")
             try:
@@ -751,8 +1835,23 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
             logger.error(f"Erreur API 1fichier: {e}")
             result[0] = False
             result[1] = _("network_api_error").format(str(e))
+        except InsufficientDiskSpace as e:
+            logger.error(f"Espace disque insuffisant pour {url}: {str(e)}")
+            result[0] = False
+            result[1] = str(e)
+        except OSError as e:
+            logger.error(f"Erreur d'écriture 1fichier {url}: {str(e)}")
+            if e.errno == errno.ENOSPC:
+                remove_partial_file(locals().get('dest_path'))
+            result[0] = False
+            result[1] = _("network_download_error").format(game_name, str(e))
 
         finally:
+            release_disk_space(task_id)
+            if not suspended:
+                download_queue.remove_download(task_id)
+                if locals().get('work_dir') not in (None, locals().get('dest_dir')):
+                    staging.remove_work_dir(work_dir)
             logger.debug(f"Thread téléchargement 1fichier terminé pour {url}, task_id={task_id}")
             progress_queues[task_id].put((task_id, result[0], result[1]))
             logger.debug(f"Résultat final envoyé à la queue: success={result[0]}, message={result[1]}, task_id={task_id}")
@@ -763,49 +1862,60 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
 
     # Boucle principale pour mettre à jour la progression
     logger.debug(f"Début boucle de progression pour task_id={task_id}")
-    while thread.is_alive():
-        try:
-            task_queue = progress_queues.get(task_id)
-            if task_queue:
-                while not task_queue.empty():
-                    data = task_queue.get()
-                    logger.debug(f"Données queue progression reçues: {data}")
-                    if isinstance(data[1], bool):  # Fin du téléchargement
-                        success, message = data[1], data[2]
-                        if isinstance(config.history, list):
-                            for entry in config.history:
-                                if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement", "Extracting"]:
-                                    if is_canceled(task_id, url):
-                                        entry["status"] = "canceled"
-                                        entry["progress"] = 0
-                                    else:
-                                        entry["status"] = "Download_OK" if success else "Erreur"
-                                        entry["progress"] = 100 if success else 0
-                                    entry["message"] = message
-                                    save_history(config.history)
-                                    config.needs_redraw = True
-                                    logger.debug(f"Mise à jour finale historique: status={entry['status']}, progress={entry['progress']}%, message={message}, task_id={task_id}")
-                                    break
-                    else:
-                        downloaded, total_size = data[1], data[2]
-                        progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
-                        progress_percent = max(0, min(100, progress_percent))
+    try:
+        while thread.is_alive():
+            try:
+                task_queue = progress_queues.get(task_id)
+                if task_queue:
+                    while not task_queue.empty():
+                        data = task_queue.get()
+                        logger.debug(f"Données queue progression reçues: {data}")
+                        if isinstance(data[1], bool):  # Fin du téléchargement
+                            success, message = data[1], data[2]
+                            if isinstance(config.history, list):
+                                for entry in config.history:
+                                    if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement", "Extracting"]:
+                                        if is_canceled(task_id, url):
+                                            entry["status"] = "canceled"
+                                            entry["progress"] = 0
+                                        else:
+                                            entry["status"] = "Download_OK" if success else "Erreur"
+                                            entry["progress"] = 100 if success else 0
+                                        entry["message"] = message
+                                        save_history(config.history)
+                                        config.needs_redraw = True
+                                        logger.debug(f"Mise à jour finale historique: status={entry['status']}, progress={entry['progress']}%, message={message}, task_id={task_id}")
+                                        break
+                        else:
+                            downloaded, total_size = data[1], data[2]
+                            speed = data[3] if len(data) >= 4 else 0.0
+                            progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
+                            progress_percent = max(0, min(100, progress_percent))
                         
-                        if isinstance(config.history, list):
-                            for entry in config.history:
-                                if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement"]:
-                                    entry["progress"] = progress_percent
-                                    entry["status"] = "Téléchargement"
-                                    entry["downloaded_size"] = downloaded
-                                    entry["total_size"] = total_size
-                                    config.needs_redraw = True
-                                    break
-                            save_history(config.history)
-            await asyncio.sleep(0.1)
-        except Exception as e:
-            logger.error(f"Erreur mise à jour progression: {str(e)}")
+                            if isinstance(config.history, list):
+                                for entry in config.history:
+                                    if "url" in entry and entry["url"] == url and entry["status"] in ["downloading", "Téléchargement"]:
+                                        entry["progress"] = progress_percent
+                                        entry["status"] = "Téléchargement"
+                                        entry["downloaded_size"] = downloaded
+                                        entry["total_size"] = total_size
+                                        entry["speed"] = speed
+                                        entry["eta"] = get_eta(url)
+                                        config.needs_redraw = True
+                                        break
+                                save_history(config.history)
+                await asyncio.sleep(0.1)
+            except Exception as e:
+                logger.error(f"Erreur mise à jour progression: {str(e)}")
+
+        logger.debug(f"Fin boucle de progression, attente fin thread pour task_id={task_id}")
+    except asyncio.CancelledError:
+        # Tâche asyncio annulée : arrêter aussi le thread avant de rendre la main
+        request_cancel(task_id)
+        while thread.is_alive():
+            await asyncio.sleep(0.05)
+        raise
 
-    logger.debug(f"Fin boucle de progression, attente fin thread pour task_id={task_id}")
     thread.join()
     # Drain remaining messages
     try:
@@ -830,6 +1940,7 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
                                 break
                 else:
                     downloaded, total_size = data[1], data[2]
+                    speed = data[3] if len(data) >= 4 else 0.0
                     progress_percent = int(downloaded / total_size * 100) if total_size > 0 else 0
                     progress_percent = max(0, min(100, progress_percent))
                     if isinstance(config.history, list):
@@ -839,6 +1950,8 @@ async def download_from_1fichier(url, platform, game_name, is_zip_non_supported=
                                 entry["status"] = "Téléchargement"
                                 entry["downloaded_size"] = downloaded
                                 entry["total_size"] = total_size
+                                entry["speed"] = speed
+                                entry["eta"] = get_eta(url)
                                 config.needs_redraw = True
                                 break
                         save_history(config.history)
@@ -0,0 +1,117 @@
+import os
+import threading
+import logging
+import config
+from concurrent.futures import ThreadPoolExecutor
+from history import save_history
+from language import _  # Import de la fonction de traduction
+
+logger = logging.getLogger(__name__)
+
+# Post-traitement après extraction (conversion Xbox, renommage PS3...) sur son propre pool de threads.
+# Chaque étape est un dict {"name", "label", "applies", "run", "archives"} :
+#   applies(platform_dir, manifest) -> bool : l'étape concerne-t-elle cette extraction ?
+#   run(dest_dir, manifest, report) -> (succès, message) ; report(fait, total) publie l'avancement de l'étape.
+#   archives : types d'archive ("zip", "rar") après l'extraction desquels l'étape s'applique.
+# manifest est la liste des chemins créés par l'extraction dans dest_dir ; platform_dir est le dossier ROM
+# de la plateforme (différent de dest_dir quand l'extraction a lieu dans la zone de transit).
+post_processors = []
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def register_post_processor(name, label, applies, run, archives=("zip", "rar")):
+    """Ajoute une étape de post-traitement (exécutée dans l'ordre d'enregistrement)."""
+    post_processors.append({"name": name, "label": label, "applies": applies, "run": run, "archives": tuple(archives)})
+
+
+def get_steps(archive, platform_dir, manifest):
+    """Étapes concernées par une extraction de type archive."""
+    return [step for step in post_processors if archive in step["archives"] and step["applies"](platform_dir, manifest)]
+
+
+def get_console_dir(name):
+    """Dossier ROM d'une console particulière (xbox, ps3...)."""
+    return os.path.join(os.path.dirname(os.path.dirname(config.APP_FOLDER)), name)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from rgsx_settings import get_postprocess_workers
+            _executor = ThreadPoolExecutor(max_workers=get_postprocess_workers(), thread_name_prefix="postprocess")
+        return _executor
+
+
+def update_step_history(url, label, done, total):
+    """Affiche l'étape en cours (et son avancement) dans l'entrée d'historique de url."""
+    if not url or not isinstance(config.history, list):
+        return
+    for entry in config.history:
+        if entry.get("url") == url and entry.get("status") in ["Téléchargement", "Extracting", "downloading"]:
+            entry["status"] = "Extracting"
+            entry["progress"] = int(done / total * 100) if total else 0
+            entry["message"] = _("postprocess_step").format(label, done, total) if total else label
+            save_history(config.history)
+            config.needs_redraw = True
+            break
+
+
+def process_extraction(dest_dir, manifest, url=None, platform_dir=None, archive="zip"):
+    """Exécute les étapes concernées par cette extraction, l'une après l'autre. Retourne (succès, message)."""
+    for step in post_processors:
+        try:
+            if archive not in step["archives"] or not step["applies"](platform_dir or dest_dir, manifest):
+                continue
+            logger.info(f"Post-traitement {step['name']} pour {dest_dir}")
+            label = _(step["label"])
+            update_step_history(url, label, 0, 0)
+            success, message = step["run"](dest_dir, manifest, lambda done, total: update_step_history(url, label, done, total))
+        except Exception as e:
+            logger.error(f"Erreur pendant le post-traitement {step['name']}: {str(e)}")
+            return False, str(e)
+        if not success:
+            return False, message
+    return True, None
+
+
+def submit_post_processing(dest_dir, manifest, url=None, platform_dir=None, archive="zip"):
+    """Met l'extraction en file pour le pool de post-traitement ; retourne un Future de (succès, message).
+    Sans étape concernée, aucun thread n'est sollicité."""
+    if not get_steps(archive, platform_dir or dest_dir, manifest):
+        return None
+    return get_executor().submit(process_extraction, dest_dir, manifest, url, platform_dir, archive)
+
+
+def run_post_processing(dest_dir, manifest, url=None, platform_dir=None, archive="zip"):
+    """Exécute le post-traitement via le pool (nombre de conversions simultanées borné) et attend le résultat.
+    archive ("zip" ou "rar") : type de l'archive extraite, chaque étape ne s'appliquant qu'à certains types."""
+    future = submit_post_processing(dest_dir, manifest, url, platform_dir, archive)
+    if future is None:
+        return True, None
+    return future.result()
+
+
+def _xbox_applies(platform_dir, manifest):
+    return platform_dir == get_console_dir("xbox") and any(path.lower().endswith('.iso') for path in manifest)
+
+
+def _xbox_run(dest_dir, manifest, report):
+    from utils import handle_xbox
+    return handle_xbox(dest_dir, [path for path in manifest if path.lower().endswith('.iso')], report)
+
+
+def _ps3_applies(platform_dir, manifest):
+    return platform_dir == get_console_dir("ps3")
+
+
+def _ps3_run(dest_dir, manifest, report):
+    from utils import handle_ps3
+    return handle_ps3(dest_dir, manifest)
+
+
+# Comme avant le pool : conversion Xbox après une extraction ZIP, renommage PS3 après une extraction RAR
+register_post_processor("xbox", "postprocess_xbox", _xbox_applies, _xbox_run, archives=("zip",))
+register_post_processor("ps3", "postprocess_ps3", _ps3_applies, _ps3_run, archives=("rar",))
@@ -28,7 +28,22 @@ def load_rgsx_settings():
         "symlink": {
             "enabled": False,
             "target_directory": ""
-        }
+        },
+        "mirrors": {},
+        "max_concurrent_downloads": 3,
+        "retry": {
+            "max_attempts": 6,
+            "base_delay": 2,
+            "max_delay": 60
+        },
+        "size_probe": {
+            "enabled": True,
+            "workers": 2,
+            "host_interval": 1.0,
+            "ttl_hours": 168
+        },
+        "extract_workers": 0,
+        "postprocess_workers": 1
     }
     
     try:
@@ -217,3 +232,75 @@ def apply_symlink_path(base_path, platform_folder):
     else:
         # Return original path
         return os.path.join(base_path, platform_folder)
+
+
+def get_mirror_table():
+    """Retourne la table des miroirs : {préfixe d'URL d'origine: [préfixes alternatifs]}."""
+    try:
+        mirrors = load_rgsx_settings().get("mirrors", {})
+        if not isinstance(mirrors, dict):
+            return {}
+        return {prefix: [alt for alt in alts if isinstance(alt, str) and alt]
+                for prefix, alts in mirrors.items() if isinstance(alts, list)}
+    except Exception as e:
+        logger.error(f"Error loading mirror table: {str(e)}")
+        return {}
+
+
+def get_max_concurrent_downloads():
+    """Retourne le nombre maximal de téléchargements simultanés (au moins 1)."""
+    try:
+        return max(1, int(load_rgsx_settings().get("max_concurrent_downloads", 3)))
+    except Exception as e:
+        logger.error(f"Error loading max concurrent downloads: {str(e)}")
+        return 3
+
+
+def get_retry_policy():
+    """Retourne la politique de nouvelle tentative HTTP : {"max_attempts", "base_delay", "max_delay"}."""
+    policy = {"max_attempts": 6, "base_delay": 2.0, "max_delay": 60.0}
+    try:
+        retry = load_rgsx_settings().get("retry", {})
+        if isinstance(retry, dict):
+            policy["max_attempts"] = max(1, int(retry.get("max_attempts", policy["max_attempts"])))
+            policy["base_delay"] = max(0.0, float(retry.get("base_delay", policy["base_delay"])))
+            policy["max_delay"] = max(policy["base_delay"], float(retry.get("max_delay", policy["max_delay"])))
+    except Exception as e:
+        logger.error(f"Error loading retry policy: {str(e)}")
+    return policy
+
+
+def get_size_probe_settings():
+    """Retourne les réglages du sondage des tailles : {"enabled", "workers", "host_interval", "ttl_hours"}."""
+    settings = {"enabled": True, "workers": 2, "host_interval": 1.0, "ttl_hours": 168.0}
+    try:
+        probe = load_rgsx_settings().get("size_probe", {})
+        if isinstance(probe, dict):
+            settings["enabled"] = bool(probe.get("enabled", settings["enabled"]))
+            settings["workers"] = max(1, int(probe.get("workers", settings["workers"])))
+            settings["host_interval"] = max(0.0, float(probe.get("host_interval", settings["host_interval"])))
+            settings["ttl_hours"] = max(0.0, float(probe.get("ttl_hours", settings["ttl_hours"])))
+    except Exception as e:
+        logger.error(f"Error loading size probe settings: {str(e)}")
+    return settings
+
+
+def get_extract_workers():
+    """Retourne le nombre de threads d'extraction des archives multi-fichiers (0 = automatique, jusqu'à 4)."""
+    try:
+        workers = int(load_rgsx_settings().get("extract_workers", 0))
+    except Exception as e:
+        logger.error(f"Error loading extract workers: {str(e)}")
+        workers = 0
+    if workers <= 0:
+        workers = min(4, os.cpu_count() or 1)
+    return workers
+
+
+def get_postprocess_workers():
+    """Retourne le nombre de post-traitements (conversion Xbox, renommage PS3...) exécutés en parallèle."""
+    try:
+        return max(1, int(load_rgsx_settings().get("postprocess_workers", 1)))
+    except Exception as e:
+        logger.error(f"Error loading postprocess workers: {str(e)}")
+        return 1
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+import logging
+from collections import deque
+from urllib.parse import urlparse
+import config
+
+logger = logging.getLogger(__name__)
+
+# Cache persistant des tailles distantes (size_cache.json) :
+# {url: {"size": octets ou None, "last_modified": en-tête Last-Modified ou None, "ts": horodatage}}
+# Les échecs (size None) expirent plus vite pour être retentés.
+FAILED_TTL = 3600
+SAVE_INTERVAL = 5
+MAX_PENDING = 2000
+# Une seule tentative par sondage : un hôte mort ne doit pas retenir un thread pendant la politique
+# de nouvelle tentative des téléchargements (l'échec est de toute façon retenté après FAILED_TTL).
+PROBE_MAX_ATTEMPTS = 1
+
+_lock = threading.Lock()
+_wakeup = threading.Condition(_lock)
+_entries = None
+_dirty = False
+_last_save = 0.0
+_pending = deque()
+_pending_set = set()
+_workers = []
+_host_next = {}
+_settings = (0.0, None)
+SETTINGS_REFRESH = 10
+
+
+def load_size_cache():
+    """Charge le cache depuis size_cache.json."""
+    cache_path = getattr(config, 'SIZE_CACHE_PATH')
+    try:
+        if not os.path.exists(cache_path):
+            return {}
+        with open(cache_path, "r", encoding='utf-8') as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            logger.warning(f"Cache des tailles invalide : {cache_path}")
+            return {}
+        return {url: entry for url, entry in entries.items() if isinstance(entry, dict) and "ts" in entry}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"Erreur lors de la lecture de {cache_path} : {e}")
+        return {}
+
+
+def save_size_cache(entries):
+    """Sauvegarde le cache dans size_cache.json (écriture atomique)."""
+    cache_path = getattr(config, 'SIZE_CACHE_PATH')
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'écriture de {cache_path} : {e}")
+
+
+def _get_entries():
+    """Retourne le cache en mémoire (chargé au premier accès). Appelé sous _lock."""
+    global _entries
+    if _entries is None:
+        _entries = load_size_cache()
+    return _entries
+
+
+def _flush(force=False):
+    """Écrit le cache s'il a changé depuis SAVE_INTERVAL secondes. Appelé sous _lock."""
+    global _dirty, _last_save
+    if _dirty and (force or time.time() - _last_save >= SAVE_INTERVAL):
+        save_size_cache(dict(_entries))
+        _dirty = False
+        _last_save = time.time()
+
+
+def _get_settings():
+    """Réglages du sondage, relus au plus toutes les SETTINGS_REFRESH secondes (appelé à chaque image par l'interface)."""
+    global _settings
+    from rgsx_settings import get_size_probe_settings
+    if _settings[1] is None or time.time() - _settings[0] >= SETTINGS_REFRESH:
+        _settings = (time.time(), get_size_probe_settings())
+    return _settings[1]
+
+
+def _get_ttl():
+    return _get_settings()["ttl_hours"] * 3600
+
+
+def _is_fresh(entry, ttl, now):
+    return now - entry.get("ts", 0) < (ttl if entry.get("size") else FAILED_TTL)
+
+
+def get_cached_entry(url):
+    """Retourne l'entrée en cache non expirée pour url ({"size", "last_modified", "ts"}), ou None."""
+    with _lock:
+        entry = _get_entries().get(url)
+    if entry and _is_fresh(entry, _get_ttl(), time.time()):
+        return entry
+    return None
+
+
+def get_cached_sizes(urls):
+    """Retourne {url: taille en octets} pour les URL dont la taille est connue et non expirée."""
+    ttl, now = _get_ttl(), time.time()
+    with _lock:
+        entries = _get_entries()
+        found = {url: entries.get(url) for url in urls}
+    return {url: entry["size"] for url, entry in found.items()
+            if entry and entry.get("size") and _is_fresh(entry, ttl, now)}
+
+
+def store_size(url, size, last_modified=None):
+    """Enregistre le résultat d'une requête HEAD dans le cache persistant."""
+    global _dirty
+    with _lock:
+        _get_entries()[url] = {"size": size, "last_modified": last_modified, "ts": time.time()}
+        _dirty = True
+        _flush()
+    if size:
+        config.needs_redraw = True
+
+
+def format_catalog_size(size):
+    """Formate une taille en octets comme dans les catalogues (ex. 52.8M)."""
+    for unit in ['', 'K', 'M', 'G']:
+        if size < 1024:
+            return f"{size}" if not unit else f"{size:.1f}{unit}"
+        size /= 1024.0
+    return f"{size:.1f}T"
+
+
+def is_probeable(url):
+    """Vrai si une requête HEAD peut renseigner la taille de url (les liens 1fichier passent par l'API)."""
+    return bool(url) and url.startswith(("http://", "https://")) and "1fichier.com" not in url
+
+
+def schedule_probe(urls):
+    """Ajoute des URL à sonder en tâche de fond. Les plus récentes passent en premier
+    (la page affichée avant les précédentes) ; au-delà de MAX_PENDING les plus anciennes sont oubliées."""
+    settings = _get_settings()
+    if not settings["enabled"]:
+        return
+    ttl, now = settings["ttl_hours"] * 3600, time.time()
+    with _wakeup:
+        entries = _get_entries()
+        for url in reversed(list(urls)):
+            if not is_probeable(url) or url in _pending_set:
+                continue
+            entry = entries.get(url)
+            if entry and _is_fresh(entry, ttl, now):
+                continue
+            _pending.appendleft(url)
+            _pending_set.add(url)
+        while len(_pending) > MAX_PENDING:
+            _pending_set.discard(_pending.pop())
+        _ensure_workers(settings["workers"])
+        _wakeup.notify_all()
+
+
+def _ensure_workers(count):
+    """Démarre les threads de sondage manquants. Appelé sous _lock."""
+    _workers[:] = [t for t in _workers if t.is_alive()]
+    while len(_workers) < count:
+        thread = threading.Thread(target=_probe_worker, name=f"size-probe-{len(_workers)}", daemon=True)
+        _workers.append(thread)
+        thread.start()
+
+
+def _next_url(host_interval):
+    """Retire la prochaine URL dont l'hôte respecte l'intervalle minimal entre deux requêtes.
+    Attend si toutes les URL en attente visent des hôtes sollicités trop récemment. Appelé sous _lock."""
+    while True:
+        if not _pending:
+            _flush(force=True)
+            _wakeup.wait()
+            continue
+        now = time.time()
+        soonest = None
+        for url in _pending:
+            host = urlparse(url).netloc
+            ready_at = _host_next.get(host, 0)
+            if ready_at <= now:
+                _pending.remove(url)
+                _pending_set.discard(url)
+                _host_next[host] = now + host_interval
+                return url
+            soonest = ready_at if soonest is None else min(soonest, ready_at)
+        _wakeup.wait(soonest - now)
+
+
+def _probe_worker():
+    """Boucle d'un thread de sondage : HEAD sur chaque URL en attente et mise en cache du résultat."""
+    import network
+    while True:
+        host_interval = _get_settings()["host_interval"]
+        with _wakeup:
+            url = _next_url(host_interval)
+        try:
+            size, last_modified = network.head_remote_file(url, max_attempts=PROBE_MAX_ATTEMPTS)
+            store_size(url, size, last_modified)
+        except (Exception, KeyboardInterrupt) as e:
+            # KeyboardInterrupt : annulation d'un téléchargement de la même URL, qui ne concerne pas le sondage
+            logger.debug(f"Sondage de taille impossible pour {url}: {e}")
+            store_size(url, None)
@@ -0,0 +1,125 @@
+import os
+import shutil
+import threading
+import time
+import logging
+import config
+from concurrent.futures import ThreadPoolExecutor
+from history import save_history
+from language import _  # Import de la fonction de traduction
+
+logger = logging.getLogger(__name__)
+
+# Zone de transit locale (RGSX_STAGING_DIR) : téléchargement et extraction se font dans
+# STAGING_DIR/<task_id>, puis un unique thread déplace le résultat vers le dossier ROM
+# (souvent un partage NFS/SMB) par grosses écritures séquentielles. Chaque fichier est écrit
+# sous un nom temporaire caché puis renommé : les émulateurs ne voient jamais de fichier partiel.
+MOVE_BUFFER_SIZE = 8 * 1024 * 1024
+MOVE_PROGRESS_INTERVAL = 0.5
+PARTIAL_SUFFIX = ".rgsx-part"
+
+_mover = None
+_mover_lock = threading.Lock()
+
+
+def is_staging_enabled():
+    return bool(config.STAGING_DIR)
+
+
+def get_work_dir(task_id):
+    """Dossier de transit de la tâche (créé si besoin)."""
+    work_dir = os.path.join(config.STAGING_DIR, task_id)
+    os.makedirs(work_dir, exist_ok=True)
+    return work_dir
+
+
+def remove_work_dir(work_dir):
+    """Supprime le dossier de transit d'une tâche (terminée, échouée ou annulée)."""
+    if work_dir and os.path.isdir(work_dir) and os.path.dirname(work_dir) == config.STAGING_DIR:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def update_move_history(url, moved, total):
+    """Affiche l'avancement du déplacement vers le dossier ROM dans l'entrée d'historique de url."""
+    if not url or not isinstance(config.history, list):
+        return
+    # L'extraction a pu marquer l'entrée Download_OK : elle repasse en cours jusqu'à la fin du déplacement
+    for entry in reversed(config.history):
+        if entry.get("url") == url and entry.get("status") in ["Téléchargement", "Extracting", "downloading", "Download_OK"]:
+            entry["status"] = "Extracting"
+            entry["progress"] = int(moved / total * 100) if total else 100
+            entry["message"] = _("staging_moving")
+            save_history(config.history)
+            config.needs_redraw = True
+            break
+
+
+def _move_file(source, target, same_volume, on_bytes):
+    """Déplace source vers target : renommage sur le même volume, sinon copie séquentielle
+    vers un nom temporaire caché puis renommage atomique."""
+    if same_volume:
+        os.replace(source, target)
+        on_bytes(os.path.getsize(target))
+        return
+    partial = os.path.join(os.path.dirname(target), "." + os.path.basename(target) + PARTIAL_SUFFIX)
+    try:
+        with open(source, 'rb') as src, open(partial, 'wb') as dst:
+            while True:
+                chunk = src.read(MOVE_BUFFER_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                on_bytes(len(chunk))
+        shutil.copymode(source, partial)
+        os.replace(partial, target)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.remove(source)
+
+
+def _move_tree(work_dir, dest_dir, url):
+    files, directories = [], []
+    for root, dirs, names in os.walk(work_dir):
+        # Les dossiers sont recréés même vides : certaines arborescences (PS3, PC) en attendent
+        directories.extend(os.path.relpath(os.path.join(root, name), work_dir) for name in dirs)
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), work_dir))
+    total = sum(os.path.getsize(os.path.join(work_dir, rel)) for rel in files)
+    os.makedirs(dest_dir, exist_ok=True)
+    same_volume = os.stat(work_dir).st_dev == os.stat(dest_dir).st_dev
+    logger.info(f"Déplacement de {len(files)} fichier(s), {total} octets, de {work_dir} vers {dest_dir}")
+    moved = [0, 0.0]
+
+    def on_bytes(size):
+        moved[0] += size
+        now = time.time()
+        if now - moved[1] >= MOVE_PROGRESS_INTERVAL:
+            moved[1] = now
+            update_move_history(url, moved[0], total)
+
+    for rel in sorted(directories):
+        target_dir = os.path.join(dest_dir, rel)
+        if not os.path.isdir(target_dir):
+            os.makedirs(target_dir, exist_ok=True)
+            os.chmod(target_dir, 0o755)
+    for rel in sorted(files):
+        target = os.path.join(dest_dir, rel)
+        _move_file(os.path.join(work_dir, rel), target, same_volume, on_bytes)
+    update_move_history(url, total, total)
+    return True, None
+
+
+def move_to_destination(work_dir, dest_dir, url=None):
+    """Confie le contenu de work_dir au thread de déplacement (un seul transfert à la fois vers le dossier ROM)
+    et attend la fin. Retourne (succès, message d'erreur)."""
+    global _mover
+    with _mover_lock:
+        if _mover is None:
+            _mover = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staging-mover")
+    try:
+        return _mover.submit(_move_tree, work_dir, dest_dir, url).result()
+    except Exception as e:
+        logger.error(f"Erreur lors du déplacement de {work_dir} vers {dest_dir}: {str(e)}")
+        return False, _("staging_move_failed").format(str(e))
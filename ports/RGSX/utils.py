@@ -8,14 +8,18 @@ import platform
 import subprocess
 import config
 import threading
-from rgsx_settings import load_rgsx_settings, save_rgsx_settings
+from rgsx_settings import load_rgsx_settings, save_rgsx_settings, get_extract_workers
 import zipfile
+import struct
+import errno
 import time
 import random
 from config import JSON_EXTENSIONS, SAVE_FOLDER
 from history import save_history
 from language import _  # Import de la fonction de traduction
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 
 
 logger = logging.getLogger(__name__)
@@ -181,6 +185,33 @@ def write_unavailable_systems():
     except Exception as e:
         logger.error(f"Erreur lors de l'écriture du fichier {log_file} : {str(e)}")
 
+def get_prefix_widths(text, font):
+    """Largeurs cumulées des avances des glyphes (font.metrics) : widths[k] estime font.size(text[:k])[0]
+    sans appel à SDL_ttf. Les glyphes absents de la police sont mesurés individuellement."""
+    widths = [0]
+    for char, metrics in zip(text, font.metrics(text)):
+        widths.append(widths[-1] + (metrics[4] if metrics else font.size(char)[0]))
+    return widths
+
+def find_last_fitting(low, high, measure, limit, estimate=None):
+    """Plus grand k de [low, high] tel que measure(k) <= limit (measure croissante en k), low - 1 si aucun.
+    La dichotomie porte sur estimate (sommes d'avances, gratuites) ; measure (font.size, exacte)
+    corrige ensuite les écarts éventuels (crénage, arrondis) autour du résultat."""
+    estimate = estimate or measure
+    first, lo, hi = low, low, high
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if estimate(mid) <= limit:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    k = hi
+    while k >= first and measure(k) > limit:
+        k -= 1
+    while k < high and measure(k + 1) <= limit:
+        k += 1
+    return k
+
 def truncate_text_middle(text, font, max_width, is_filename=True):
     """Tronque le texte en insérant '...' au milieu, en préservant le début et la fin.
     Si is_filename=False, ne supprime pas l'extension."""
@@ -198,12 +229,35 @@ def truncate_text_middle(text, font, max_width, is_filename=True):
 
     # Diviser la largeur disponible entre début et fin, en priorisant la fin
     chars = list(text)
-    left = []
-    right = []
-    left_width = 0
-    right_width = 0
-    left_idx = 0
-    right_idx = len(chars) - 1
+    count = len(chars)
+
+    # Les caractères sont ajoutés un à un, à droite puis à gauche : après t ajouts, la gauche en a t // 2.
+    # Une chaîne de longueur paire se termine par un ajout à droite (la gauche n'en prend pas quand il n'en reste qu'un).
+    def split(t):
+        left_count = t // 2 - 1 if t == count and count % 2 == 0 else t // 2
+        return left_count, t - left_count
+
+    def measure(t):
+        left_count, right_count = split(t)
+        return (font.size(text[:left_count])[0] if left_count else 0) + (font.size(text[count - right_count:])[0] if right_count else 0)
+
+    widths = get_prefix_widths(text, font)
+
+    def estimate(t):
+        left_count, right_count = split(t)
+        return widths[left_count] + widths[count] - widths[count - right_count]
+
+    # Avancer directement au dernier tour complet où la largeur cumulée reste sous max_text_width ;
+    # la boucle ci-dessous ne rejoue plus que les derniers ajouts
+    start = find_last_fitting(0, count, measure, max_text_width - 1, estimate)
+    start = max(0, min(start, count - 1))
+    start -= start % 2
+    left_idx = start // 2
+    right_idx = count - 1 - start // 2
+    left = chars[:left_idx]
+    right = chars[right_idx + 1:]
+    left_width = font.size(''.join(left))[0] if left else 0
+    right_width = font.size(''.join(right))[0] if right else 0
 
     # Préserver plus de caractères à droite pour garder le '%'
     while left_idx <= right_idx and (left_width + right_width) < max_text_width:
@@ -247,9 +301,12 @@ def truncate_text_end(text, font, max_width):
         if font.size(text)[0] <= max_width:
             return text
 
-        truncated = text
-        while len(truncated) > 0 and font.size(truncated + "...")[0] > max_width:
-            truncated = truncated[:-1]
+        # Plus long début de texte qui tient avec "..." (aucun caractère si même "..." déborde)
+        widths = get_prefix_widths(text, font)
+        ellipsis_width = font.size("...")[0]
+        length = find_last_fitting(0, len(text) - 1, lambda k: font.size(text[:k] + "...")[0], max_width,
+                                   lambda k: widths[k] + ellipsis_width)
+        truncated = text[:max(length, 0)]
         return truncated + "..." if len(truncated) < len(text) else text
     except Exception as e:
         logger.error(f"Erreur lors du rendu du texte '{text}': {str(e)}")
@@ -270,23 +327,28 @@ def wrap_text(text, font, max_width):
     
     for word in words:
         # Si le mot seul dépasse max_width, le couper caractère par caractère
-        if font.render(word, True, (255, 255, 255)).get_width() > max_width:
+        if font.size(word)[0] > max_width:
             temp_line = current_line
-            for char in word:
-                test_line = temp_line + (' ' if temp_line else '') + char
-                test_surface = font.render(test_line, True, (255, 255, 255))
-                if test_surface.get_width() <= max_width:
-                    temp_line = test_line
-                else:
-                    if temp_line:
-                        lines.append(temp_line)
-                    temp_line = char
+            position = 0
+            while position < len(word):
+                # Nombre de caractères (séparés par des espaces) qui tiennent encore sur la ligne en cours
+                prefix = temp_line + ' ' if temp_line else ''
+                fitting = find_last_fitting(
+                    position, len(word) - 1,
+                    lambda k: font.size(prefix + ' '.join(word[position:k + 1]))[0], max_width)
+                if fitting >= position:
+                    temp_line = prefix + ' '.join(word[position:fitting + 1])
+                    position = fitting + 1
+                    continue
+                if temp_line:
+                    lines.append(temp_line)
+                temp_line = word[position]
+                position += 1
             current_line = temp_line
         else:
             # Comportement standard pour les mots normaux
             test_line = current_line + (' ' if current_line else '') + word
-            test_surface = font.render(test_line, True, (255, 255, 255))
-            if test_surface.get_width() <= max_width:
+            if font.size(test_line)[0] <= max_width:
                 current_line = test_line
             else:
                 if current_line:
@@ -312,19 +374,132 @@ def load_system_image(platform_dict):
         logger.error(f"Erreur lors du chargement de l'image pour {platform_name} : {str(e)}")
         return None
 
+# Extraction ZIP : lectures par blocs de 1 Mo, progression remontée au plus toutes les 0,5 s
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+EXTRACT_PROGRESS_INTERVAL = 0.5
+
+
+class ExtractionProgress:
+    """Cumule les octets extraits et appelle callback(extraits, total) au plus toutes les interval secondes."""
+
+    def __init__(self, total_size, callback, interval=EXTRACT_PROGRESS_INTERVAL):
+        self.total_size = total_size
+        self.callback = callback
+        self.interval = interval
+        self.extracted_size = 0
+        self.last_report = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, size):
+        with self.lock:
+            self.extracted_size += size
+            now = time.time()
+            if now - self.last_report < self.interval:
+                return
+            self.last_report = now
+            extracted_size = self.extracted_size
+        if self.callback:
+            self.callback(extracted_size, self.total_size)
+
+    def finish(self):
+        if self.callback:
+            self.callback(self.extracted_size, self.total_size)
+
+
+def update_extraction_history(url, extracted_size, total_size):
+    """Reporte la progression d'une extraction dans l'entrée d'historique de url."""
+    if not isinstance(config.history, list):
+        return
+    for entry in config.history:
+        if entry.get("url") == url and entry.get("status") in ["Téléchargement", "Extracting", "downloading"]:
+            progress_percent = int(extracted_size / total_size * 100) if total_size > 0 else 0
+            entry["status"] = "Extracting"
+            entry["progress"] = max(0, min(100, progress_percent))
+            entry["message"] = "Extraction en cours"
+            save_history(config.history)
+            config.needs_redraw = True
+            break
+
+
+ZERO_COPY_CHUNK_SIZE = 64 * 1024 * 1024
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+
+
+def get_zip_member_data_offset(archive, info):
+    """Position des données d'un membre dans l'archive (après son en-tête local)."""
+    archive.seek(info.header_offset)
+    header = ZIP_LOCAL_HEADER.unpack(archive.read(ZIP_LOCAL_HEADER.size))
+    if header[0] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"En-tête local invalide pour {info.filename}")
+    return info.header_offset + ZIP_LOCAL_HEADER.size + header[9] + header[10]
+
+
+def copy_stored_member(zip_path, info, file_path, progress):
+    """Copie un membre non compressé (ZIP_STORED) directement depuis l'archive avec os.copy_file_range,
+    sinon os.sendfile : copie dans le noyau (sans passage par Python). Le membre commence à un décalage
+    quelconque dans l'archive, il n'y a donc jamais de clonage/reflink.
+    Le CRC n'est pas recalculé : seule la longueur copiée est contrôlée.
+    Retourne False si aucun des deux n'est disponible ici (copie classique à faire)."""
+    methods = [name for name in ("copy_file_range", "sendfile") if hasattr(os, name)]
+    if not methods:
+        return False
+    with open(zip_path, 'rb') as archive, open(file_path, 'wb') as dest:
+        offset = get_zip_member_data_offset(archive, info)
+        for method in methods:
+            copied = 0
+            try:
+                while copied < info.file_size:
+                    count = min(ZERO_COPY_CHUNK_SIZE, info.file_size - copied)
+                    if method == "copy_file_range":
+                        sent = os.copy_file_range(archive.fileno(), dest.fileno(), count, offset + copied)
+                    else:
+                        sent = os.sendfile(dest.fileno(), archive.fileno(), offset + copied, count)
+                    if sent == 0:
+                        raise zipfile.BadZipFile(f"Archive tronquée dans {info.filename}")
+                    copied += sent
+                    progress.add(sent)
+                break
+            except OSError as e:
+                # Appel non supporté pour ces fichiers (noyau ancien, volumes différents, FUSE...) : méthode suivante
+                if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                    raise
+                logger.debug(f"{method} indisponible pour {info.filename}: {e}")
+        else:
+            return False
+    os.chmod(file_path, 0o644)
+    return True
+
+
+def extract_zip_member(zip_ref, info, file_path, progress):
+    """Extrait un membre de l'archive en une seule passe ; le CRC est vérifié par la lecture
+    (zipfile lève BadZipFile en fin de membre si le CRC ne correspond pas).
+    Les membres stockés sans compression ni chiffrement sont copiés sans passer par l'espace utilisateur."""
+    if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1 and info.file_size:
+        if copy_stored_member(zip_ref.filename, info, file_path, progress):
+            return
+    with zip_ref.open(info) as source, open(file_path, 'wb') as dest:
+        while True:
+            chunk = source.read(EXTRACT_BUFFER_SIZE)
+            if not chunk:
+                break
+            dest.write(chunk)
+            progress.add(len(chunk))
+    os.chmod(file_path, 0o644)
+
+
 def extract_zip_data(zip_path, dest_dir, url):
     """Extrait le contenu du fichier ZIP  dans le dossier config.APP_FOLDER sans progression a l'ecran"""
     logger.debug(f"Extraction de {zip_path} dans {dest_dir}")
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.testzip()  # Vérifier l'intégrité de l'archive
+            # Le CRC de chaque membre est vérifié pendant sa lecture, pas besoin de testzip()
             for info in zip_ref.infolist():
                 if info.is_dir():
                     continue
                 file_path = os.path.join(dest_dir, info.filename)
                 os.makedirs(os.path.dirname(file_path), exist_ok=True)
                 with zip_ref.open(info) as source, open(file_path, 'wb') as dest:
-                    shutil.copyfileobj(source, dest)
+                    shutil.copyfileobj(source, dest, EXTRACT_BUFFER_SIZE)
         logger.info(f"Extraction terminée de {zip_path}")
         return True, "Extraction terminée avec succès"
     except zipfile.BadZipFile as e:
@@ -333,85 +508,85 @@ def extract_zip_data(zip_path, dest_dir, url):
 
     
 
-def extract_zip(zip_path, dest_dir, url):
-    """Extrait le contenu du fichier ZIP dans le dossier cible avec un suivi progressif de la progression."""
+def extract_zip_members_parallel(zip_path, dest_dir, members, progress, workers):
+    """Extrait les membres avec un pool de threads, chacun avec son propre ZipFile (zlib libère le GIL).
+    Les plus gros membres partent en premier pour équilibrer la charge."""
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def extract_member(info):
+        zip_ref = getattr(local, "zip_ref", None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+            with handles_lock:
+                handles.append(zip_ref)
+        extract_zip_member(zip_ref, info, os.path.join(dest_dir, info.filename), progress)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract") as executor:
+            futures = [executor.submit(extract_member, info)
+                       for info in sorted(members, key=lambda info: info.file_size, reverse=True)]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        for zip_ref in handles:
+            zip_ref.close()
+
+
+def get_manifest_dirs(dest_dir, paths):
+    """Dossiers d'un manifeste d'extraction : les parents des chemins extraits, sous dest_dir."""
+    dest_dir = os.path.normpath(dest_dir)
+    dirs = set()
+    for path in paths:
+        parent = os.path.dirname(path)
+        while parent.startswith(dest_dir + os.sep) and parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    return sorted(dirs)
+
+
+def extract_zip(zip_path, dest_dir, url, progress_callback=None, platform_dir=None):
+    """Extrait le contenu du fichier ZIP dans le dossier cible avec un suivi progressif de la progression.
+    progress_callback(extraits, total) remplace la mise à jour de l'historique de url ;
+    platform_dir est le dossier ROM de la plateforme si dest_dir est une zone de transit."""
     logger.debug(f"Extraction de {zip_path} dans {dest_dir}")
     try:
-        lock = threading.Lock()
+        if progress_callback is None:
+            progress_callback = lambda extracted_size, total_size: update_extraction_history(url, extracted_size, total_size)
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.testzip()  # Vérifier l'intégrité de l'archive
-            total_size = sum(info.file_size for info in zip_ref.infolist() if not info.is_dir())
+            members = [info for info in zip_ref.infolist() if not info.is_dir()]
+            total_size = sum(info.file_size for info in members)
             logger.info(f"Taille totale à extraire: {total_size} octets")
-            lock = threading.Lock()
-            # Lister les ISO avant extraction
-            iso_before = set()
-            for root, dirs, files in os.walk(dest_dir):
-                for file in files:
-                    if file.lower().endswith('.iso'):
-                        iso_before.add(os.path.abspath(os.path.join(root, file)))
-
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.testzip()  # Vérifier l'intégrité de l'archive
-                total_size = sum(info.file_size for info in zip_ref.infolist() if not info.is_dir())
-                logger.info(f"Taille totale à extraire: {total_size} octets")
-                if total_size == 0:
-                    logger.warning("ZIP vide ou ne contenant que des dossiers")
-                    return True, "ZIP vide extrait avec succès"
-
-                extracted_size = 0
-                os.makedirs(dest_dir, exist_ok=True)
-                chunk_size = 2048  # Réduire pour plus de mises à jour
-                last_save_time = time.time()
-                save_interval = 0.5  # Sauvegarder toutes les 0.5 secondes
-                for info in zip_ref.infolist():
-                    if info.is_dir():
-                        continue
-                    file_path = os.path.join(dest_dir, info.filename)
-                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                    with zip_ref.open(info) as source, open(file_path, 'wb') as dest:
-                        file_size = info.file_size
-                        file_extracted = 0
-                        while True:
-                            chunk = source.read(chunk_size)
-                            if not chunk:
-                                break
-                            dest.write(chunk)
-                            file_extracted += len(chunk)
-                            extracted_size += len(chunk)
-                            current_time = time.time()
-                            with lock:
-                                if isinstance(config.history, list):
-                                    for entry in config.history:
-                                        if "status" in entry and entry["status"] in ["Téléchargement", "Extracting", "downloading"]:
-                                            if "url" in entry and entry["url"] == url:
-                                                progress_percent = int(extracted_size / total_size * 100) if total_size > 0 else 0
-                                                progress_percent = max(0, min(100, progress_percent))
-                                                entry["status"] = "Extracting"
-                                                entry["progress"] = progress_percent
-                                                entry["message"] = "Extraction en cours"
-                                                if current_time - last_save_time >= save_interval:
-                                                    save_history(config.history)
-                                                    last_save_time = current_time
-                                                config.needs_redraw = True
-                                                break
-                    os.chmod(file_path, 0o644)
-            # Vérifier si c'est un dossier xbox et le traiter si nécessaire
-            xbox_dir = os.path.join(os.path.dirname(os.path.dirname(config.APP_FOLDER)), "xbox")
-            if dest_dir == xbox_dir:
-                # Lister les ISO après extraction
-                iso_after = set()
-                for root, dirs, files in os.walk(dest_dir):
-                    for file in files:
-                        if file.lower().endswith('.iso'):
-                            iso_after.add(os.path.abspath(os.path.join(root, file)))
-                new_isos = list(iso_after - iso_before)
-                if new_isos:
-                    success, error_msg = handle_xbox(dest_dir, new_isos)
-                    if not success:
-                        return False, error_msg
-                else:
-                    logger.warning("Aucun nouvel ISO détecté après extraction pour conversion Xbox.")
-                    # On ne retourne pas d'erreur fatale ici, on continue
+            # Manifeste : chemins créés par cette extraction (le post-traitement ne parcourt que ceux-ci)
+            manifest = [os.path.normpath(os.path.join(dest_dir, info.filename)) for info in members]
+
+            if total_size == 0:
+                logger.warning("ZIP vide ou ne contenant que des dossiers")
+                return True, "ZIP vide extrait avec succès"
+
+            os.makedirs(dest_dir, exist_ok=True)
+            progress = ExtractionProgress(total_size, progress_callback)
+            for dir_path in get_manifest_dirs(dest_dir, manifest):
+                os.makedirs(dir_path, exist_ok=True)
+            workers = min(get_extract_workers(), len(members))
+            if workers > 1:
+                logger.debug(f"Extraction parallèle de {len(members)} fichiers avec {workers} threads")
+                extract_zip_members_parallel(zip_path, dest_dir, members, progress, workers)
+            else:
+                for info in members:
+                    extract_zip_member(zip_ref, info, os.path.join(dest_dir, info.filename), progress)
+            progress.finish()
+            # Post-traitement propre à la console (conversion Xbox...) sur le pool dédié
+            from postprocess import run_post_processing
+            success, error_msg = run_post_processing(dest_dir, manifest, url, platform_dir, archive="zip")
+            if not success:
+                return False, error_msg
 
         try:
             os.remove(zip_path)
@@ -446,11 +621,66 @@ def extract_zip(zip_path, dest_dir, url):
      
 
 # Fonction pour extraire le contenu d'un fichier RAR
-def extract_rar(rar_path, dest_dir, url):
-    """Extrait le contenu du fichier RAR dans le dossier cible."""
+RAR_PERCENT = re.compile(r'(\d{1,3})%')
+
+
+class ProcessCloser:
+    """Adaptateur pour qu'un jeton d'annulation (register/close) tue un processus enfant."""
+
+    def __init__(self, process):
+        self.process = process
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.kill()
+
+
+def list_rar_archive(unrar_cmd, rar_path):
+    """Liste technique de l'archive et de ses volumes (unrar lt -v).
+    Retourne ([(nom, taille)], [dossiers], [chemins des volumes]) ; un fichier réparti sur plusieurs volumes n'est compté qu'une fois."""
+    result = subprocess.run(unrar_cmd + ['lt', '-v', rar_path], capture_output=True, text=True, errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+    logger.debug(f"Sortie brute de 'unrar lt -v {rar_path}':\n{result.stdout}")
+    files, dirs, volumes = {}, [], []
+    entry = {}
+
+    def flush():
+        name = entry.get("Name")
+        if name:
+            if entry.get("Type", "File") == "Directory":
+                dirs.append(name)
+            elif name not in files:
+                size = entry.get("Size", "0").replace(" ", "")
+                files[name] = int(size) if size.isdigit() else 0
+        entry.clear()
+
+    for line in result.stdout.splitlines():
+        key, sep, value = line.strip().partition(": ")
+        if not line.strip():
+            flush()
+        elif sep and key == "Archive":
+            flush()
+            volume = value.strip()
+            volumes.append(volume if os.path.isabs(volume) else os.path.join(os.path.dirname(rar_path), os.path.basename(volume)))
+        elif sep and key in ("Name", "Type", "Size"):
+            if key == "Name":
+                flush()
+            entry[key] = value.strip()
+    flush()
+    return list(files.items()), dirs, volumes or [rar_path]
+
+
+def extract_rar(rar_path, dest_dir, url, progress_callback=None, cancel_token=None, platform_dir=None):
+    """Extrait le contenu du fichier RAR (volumes suivants compris) dans le dossier cible
+    (platform_dir : dossier ROM de la plateforme si dest_dir est une zone de transit).
+    La progression est lue au fil de la sortie d'unrar et remontée comme pour les ZIP (progress_callback) ;
+    cancel_token.register() permet de tuer unrar dès l'annulation."""
+    volumes = [rar_path]
     try:
-        lock = threading.Lock()
         os.makedirs(dest_dir, exist_ok=True)
+        if progress_callback is None:
+            progress_callback = lambda extracted_size, total_size: update_extraction_history(url, extracted_size, total_size)
 
         system_type = platform.system()
         if system_type == "Windows":
@@ -477,109 +707,103 @@ def extract_rar(rar_path, dest_dir, url):
             logger.error("Commande unrar non disponible")
             return False, _("utils_unrar_unavailable")
 
-        result = subprocess.run(unrar_cmd + ['l', '-v', rar_path], capture_output=True, text=True)
-        if result.returncode != 0:
-            error_msg = result.stderr.strip()
-            logger.error(f"Erreur lors de la liste des fichiers RAR: {error_msg}")
-            return False, _("utils_rar_list_failed").format(error_msg)
-
-        logger.debug(f"Sortie brute de 'unrar l -v {rar_path}':\n{result.stdout}")
-
-        total_size = 0
-        files_to_extract = []
-        root_dirs = set()
-        lines = result.stdout.splitlines()
-        in_file_list = False
-        for line in lines:
-            if line.startswith("----"):
-                in_file_list = not in_file_list
-                continue
-            if in_file_list:
-                match = re.match(r'^\s*(\S+)\s+(\d+)\s+\d*\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})\s+(.+)$', line)
-                if match:
-                    attrs = match.group(1)
-                    file_size = int(match.group(2))
-                    file_date = match.group(3)
-                    file_name = match.group(4).strip()
-                    if 'D' not in attrs:
-                        files_to_extract.append((file_name, file_size))
-                        total_size += file_size
-                        root_dir = file_name.split('/')[0] if '/' in file_name else ''
-                        if root_dir:
-                            root_dirs.add(root_dir)
-                        logger.debug(f"Ligne parsée: {file_name}, taille: {file_size}, date: {file_date}")
-                    else:
-                        logger.debug(f"Dossier ignoré: {file_name}")
-                else:
-                    logger.debug(f"Ligne ignorée (format inattendu): {line}")
-
-        logger.info(f"Taille totale à extraire (RAR): {total_size} octets")
+        try:
+            files_to_extract, dirs_to_extract, volumes = list_rar_archive(unrar_cmd, rar_path)
+        except RuntimeError as e:
+            logger.error(f"Erreur lors de la liste des fichiers RAR: {e}")
+            return False, _("utils_rar_list_failed").format(str(e))
+        sizes = dict(files_to_extract)
+        total_size = sum(sizes.values())
+        logger.info(f"Taille totale à extraire (RAR): {total_size} octets, {len(volumes)} volume(s)")
         logger.debug(f"Fichiers à extraire: {files_to_extract}")
-        logger.debug(f"Dossiers racines détectés: {root_dirs}")
         if total_size == 0:
             logger.warning("RAR vide, ne contenant que des dossiers, ou erreur de parsing")
             return False, "RAR vide ou erreur lors de la liste des fichiers"
 
+        # Les chemins sont passés tels quels (liste d'arguments, pas de shell : aucun échappement)
+        process = subprocess.Popen(unrar_cmd + ['x', '-y', rar_path, os.path.join(dest_dir, '')],
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+        closer = ProcessCloser(process)
+        if cancel_token:
+            cancel_token.register(closer)
+        progress = ExtractionProgress(total_size, progress_callback)
+        output_tail = deque(maxlen=20)
+        current_file = None
+        done_size = 0
+        pending = ""
         try:
-            with lock:
-                # Vérifier si l'URL existe dans config.download_progress
-                if url not in config.download_progress:
-                    config.download_progress[url] = {}
-                config.download_progress[url]["downloaded_size"] = 0
-                config.download_progress[url]["total_size"] = total_size
-                config.download_progress[url]["status"] = "Extracting"
-                config.download_progress[url]["progress_percent"] = 0
-                config.needs_redraw = True
-        except Exception as e:
-            logger.error(f"Erreur lors de la mise à jour de la progression: {str(e)}")
-            # Continuer l'extraction même en cas d'erreur de mise à jour de la progression
-
-        escaped_rar_path = rar_path.replace(" ", "\\ ")
-        escaped_dest_dir = dest_dir.replace(" ", "\\ ")
-        process = subprocess.Popen(unrar_cmd + ['x', '-y', escaped_rar_path, escaped_dest_dir],
-                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        stdout, stderr = process.communicate()
-
+            # unrar réécrit son pourcentage (progression de toute l'archive) sur place à coups de \b :
+            # on découpe la sortie sur \b, \r et \n au fur et à mesure de sa lecture
+            while True:
+                data = process.stdout.read(4096)
+                if not data:
+                    break
+                parts = re.split(r'[\b\r\n]+', pending + data.decode('utf-8', errors='replace'))
+                pending = parts.pop()
+                for part in parts:
+                    text = part.strip()
+                    if not text:
+                        continue
+                    percent = RAR_PERCENT.fullmatch(text)
+                    if percent:
+                        extracted_size = max(done_size, total_size * min(100, int(percent.group(1))) // 100)
+                    elif text.startswith("Extracting  "):
+                        current_file = text[len("Extracting  "):].strip()
+                        continue
+                    elif text == "OK" and current_file:
+                        done_size += sizes.get(current_file, 0)
+                        current_file = None
+                        extracted_size = done_size
+                    else:
+                        output_tail.append(text)
+                        continue
+                    progress.add(max(0, extracted_size - progress.extracted_size))
+            process.wait()
+        finally:
+            if cancel_token:
+                cancel_token.unregister(closer)
+            closer.close()
+
+        if cancel_token and cancel_token.is_set():
+            # unrar tué : supprimer le fichier en cours d'écriture, incomplet
+            if current_file and os.path.isfile(os.path.join(dest_dir, current_file)):
+                os.remove(os.path.join(dest_dir, current_file))
+            logger.info(f"Extraction de {rar_path} annulée")
+            return False, _("history_status_canceled")
         if process.returncode != 0:
+            stderr = "\n".join(output_tail)
             logger.error(f"Erreur lors de l'extraction de {rar_path}: {stderr}")
             return False, f"Erreur lors de l'extraction: {stderr}"
+        progress.finish()
 
-        extracted_size = 0
         extracted_files = []
-        total_files = len(files_to_extract)
-        for i, (expected_file, file_size) in enumerate(files_to_extract):
+        for expected_file, file_size in files_to_extract:
             file_path = os.path.join(dest_dir, expected_file)
             if os.path.exists(file_path):
-                extracted_size += file_size
                 extracted_files.append(expected_file)
                 os.chmod(file_path, 0o644)
                 logger.debug(f"Fichier extrait: {expected_file}, taille: {file_size}, chemin: {file_path}")
-                try:
-                    with lock:
-                        if url in config.download_progress:
-                            config.download_progress[url]["downloaded_size"] = extracted_size
-                            config.download_progress[url]["status"] = "Extracting"
-                            config.download_progress[url]["progress_percent"] = ((i + 1) / total_files * 100) if total_files > 0 else 0
-                            config.needs_redraw = True
-                except Exception as e:
-                    logger.error(f"Erreur lors de la mise à jour de la progression d'extraction: {str(e)}")
-                    # Continuer l'extraction même en cas d'erreur de mise à jour de la progression
             else:
                 logger.warning(f"Fichier non trouvé après extraction: {expected_file}")
        
-        # Vérifier si c'est un dossier PS3 et le traiter si nécessaire
-        ps3_dir = os.path.join(os.path.dirname(os.path.dirname(config.APP_FOLDER)), "ps3")
-        if dest_dir == ps3_dir:
-            success, error_msg = handle_ps3(dest_dir)
-            if not success:
-                return False, error_msg
-
-        for root, dirs, files in os.walk(dest_dir):
-            for dir_name in dirs:
-                os.chmod(os.path.join(root, dir_name), 0o755)
-
-        os.remove(rar_path)
-        logger.info(f"Fichier RAR {rar_path} extrait dans {dest_dir} et supprimé")
+        # Manifeste : chemins créés par cette extraction, seuls concernés par les permissions et le renommage PS3
+        manifest = [os.path.normpath(os.path.join(dest_dir, name)) for name in extracted_files]
+        manifest_dirs = set(get_manifest_dirs(dest_dir, manifest))
+        manifest_dirs.update(os.path.normpath(os.path.join(dest_dir, name)) for name in dirs_to_extract)
+        for dir_path in manifest_dirs:
+            if os.path.isdir(dir_path):
+                os.chmod(dir_path, 0o755)
+
+        # Post-traitement propre à la console (renommage PS3...) sur le pool dédié
+        from postprocess import run_post_processing
+        success, error_msg = run_post_processing(dest_dir, manifest, url, platform_dir, archive="rar")
+        if not success:
+            return False, error_msg
+
+        for volume in volumes:
+            if os.path.exists(volume):
+                os.remove(volume)
+        logger.info(f"Fichier RAR {rar_path} ({len(volumes)} volume(s)) extrait dans {dest_dir} et supprimé")
         return True, "RAR extrait avec succès"
         
     except Exception as e:
@@ -593,16 +817,14 @@ def extract_rar(rar_path, dest_dir, url):
             except Exception as e:
                 logger.error(f"Erreur lors de la suppression de {rar_path}: {str(e)}")
 
-def handle_ps3(dest_dir):
-    """Gère le renommage spécifique des dossiers PS3 extraits."""
+def handle_ps3(dest_dir, manifest):
+    """Gère le renommage spécifique des dossiers PS3 extraits (manifest : chemins créés par l'extraction)."""
     logger.debug(f"Traitement spécifique PS3 dans: {dest_dir}")
     
-    # Attendre un peu que tous les processus d'extraction se terminent
-    time.sleep(2)
-    
-    # Rechercher le dossier extrait directement dans dest_dir
-    extracted_dirs = [d for d in os.listdir(dest_dir) if os.path.isdir(os.path.join(dest_dir, d))]
-    logger.debug(f"Dossiers trouvés dans {dest_dir}: {extracted_dirs}")
+    # Dossiers de premier niveau créés par l'extraction (sans lister tout dest_dir)
+    extracted_dirs = sorted({os.path.relpath(path, dest_dir).split(os.sep)[0] for path in manifest
+                             if os.sep in os.path.relpath(path, dest_dir)})
+    logger.debug(f"Dossiers extraits dans {dest_dir}: {extracted_dirs}")
     
     # Filtrer pour ne garder que les dossiers nouvellement extraits
     ps3_dirs = [d for d in extracted_dirs if not d.endswith('.ps3')]
@@ -619,15 +841,10 @@ def handle_ps3(dest_dir):
         for attempt in range(max_retries):
             try:
                 # Fermer les handles potentiellement ouverts
-                for root, dirs, files in os.walk(old_path):
-                    for f in files:
-                        try:
-                            os.chmod(os.path.join(root, f), 0o644)
-                        except (OSError, PermissionError):
-                            pass
-                    for d in dirs:
+                for path in manifest:
+                    if path.startswith(old_path + os.sep):
                         try:
-                            os.chmod(os.path.join(root, d), 0o755)
+                            os.chmod(path, 0o755 if os.path.isdir(path) else 0o644)
                         except (OSError, PermissionError):
                             pass
 
@@ -656,12 +873,10 @@ def handle_ps3(dest_dir):
         return True, None
 
 
-def handle_xbox(dest_dir, iso_files):
-    """Gère la conversion des fichiers Xbox extraits."""
+def handle_xbox(dest_dir, iso_files, report=None):
+    """Gère la conversion des fichiers Xbox extraits ; report(fait, total) est appelé après chaque ISO."""
     logger.debug(f"Traitement spécifique Xbox dans: {dest_dir}")
     
-    # Attendre un peu que tous les processus d'extraction se terminent
-    time.sleep(2)
     system_type = platform.system()
     if system_type == "Windows":
         # Sur Windows; telecharger le fichier exe
@@ -713,18 +928,14 @@ def handle_xbox(dest_dir, iso_files):
         xdvdfs_cmd = [XDVDFS_LINUX, "pack"]  # Liste avec 2 éléments
 
     try:
-        # Chercher les fichiers ISO à convertir
-        iso_files = []
-        for root, dirs, files in os.walk(dest_dir):
-            for file in files:
-                if file.lower().endswith('.iso'):
-                    iso_files.append(os.path.join(root, file))
-
+        # Les ISO à convertir sont ceux du manifeste d'extraction (iso_files), pas tout dest_dir
         if not iso_files:
             logger.warning("Aucun fichier ISO xbox trouvé")
             return True, None
 
-        for iso_xbox_source in iso_files:
+        for index, iso_xbox_source in enumerate(iso_files):
+            if report:
+                report(index, len(iso_files))
             logger.debug(f"Traitement de l'ISO Xbox: {iso_xbox_source}")
             xiso_dest = os.path.splitext(iso_xbox_source)[0] + "_xbox.iso"
 
@@ -752,6 +963,8 @@ def handle_xbox(dest_dir, iso_files):
             else:
                 logger.error(f"L'ISO converti n'a pas été créé: {xiso_dest}")
                 return False, "Échec de la conversion de l'ISO"
+        if report:
+            report(len(iso_files), len(iso_files))
 
         return True, "Conversion Xbox terminée avec succès"
 
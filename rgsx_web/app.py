@@ -25,6 +25,7 @@ from utils import load_sources, sanitize_filename, normalize_platform_name
 from rgsx_settings import apply_symlink_path
 from history import load_history, save_history, add_to_history, init_history
 import network
+import size_probe
 
 import requests
 from zipfile import ZipFile
@@ -149,6 +150,24 @@ def startup():
     sync_system_images_to_static()
 
 
+@app.on_event("startup")
+async def resume_downloads():
+    # Resume downloads left in the persistent queue by a previous run
+    try:
+        load_sources()  # sets cfg.platform_dicts for path mapping
+        resumed = network.resume_download_queue()
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} queued download(s)")
+    except Exception as e:
+        logger.error(f"Failed to resume download queue: {e}")
+
+
+@app.on_event("shutdown")
+def suspend_downloads():
+    # Keep partial files and queue entries so the next start resumes them
+    network.suspend_downloads()
+
+
 @app.get("/api/status", dependencies=[Depends(dep_auth), Depends(dep_rate_limit)])
 def status():
     return {
@@ -245,9 +264,27 @@ def get_games(platform_id: str):
         g = normalize(e)
         if g:
             result.append(g)
+    fill_probed_sizes(result)
     return result
 
 
+def fill_probed_sizes(games: list[dict]):
+    """Fill missing catalog sizes from the HEAD size cache and queue background probes for the rest."""
+    missing = [g for g in games if not g.get("size") or g.get("size") == "N/A"]
+    if not missing:
+        return
+    sizes = size_probe.get_cached_sizes([g["url"] for g in missing])
+    unknown = []
+    for g in missing:
+        size = sizes.get(g["url"])
+        if size:
+            g["size"] = size_probe.format_catalog_size(size)
+            g["size_bytes"] = size
+        else:
+            unknown.append(g["url"])
+    size_probe.schedule_probe(unknown)
+
+
 @app.get("/api/history", dependencies=[Depends(dep_auth), Depends(dep_rate_limit)])
 def get_history(status: Optional[str] = None, limit: int = 0):
     hist = load_history() or []
@@ -272,16 +309,19 @@ class DownloadRequest(BaseModel):
     game_name: str
     url: str
     is_archive: Optional[bool] = None
+    force: Optional[bool] = False
+
 
+async def _enqueue_download(platform: str, game_name: str, url: str, is_archive: bool | None, force: bool = False):
+    # Identical URL already in flight: attach to the running task instead of starting another
+    existing_task_id = network.get_inflight_task_id(url)
+    if existing_task_id:
+        return {"task_id": existing_task_id, "deduplicated": True}
 
-async def _enqueue_download(platform: str, game_name: str, url: str, is_archive: bool | None):
     ensure_data()
     # Initialize sources once to set cfg.platform_dicts for path mapping
     load_sources()
 
-    # Create a task id
-    task_id = str(asyncio.get_event_loop().time()).replace(".", "")
-
     # Append to history immediately
     hist_entry = add_to_history(platform, game_name, "downloading", url=url, progress=0)
     # Keep in-memory history in sync so network.py can update it
@@ -290,22 +330,16 @@ async def _enqueue_download(platform: str, game_name: str, url: str, is_archive:
     except Exception:
         pass
 
-    # Decide path based on URL type
-    if network.is_1fichier_url(url):
-        task = asyncio.create_task(
-            network.download_from_1fichier(url, platform, game_name, bool(is_archive), task_id)
-        )
-    else:
-        task = asyncio.create_task(
-            network.download_rom(url, platform, game_name, bool(is_archive), task_id)
-        )
+    # Picks 1fichier or direct download; skips files already on disk unless forced
+    # launch_download mints a unique task id (several requests can arrive in the same tick)
+    task_id, _task, _coalesced = network.launch_download(url, platform, game_name, bool(is_archive), force=bool(force))
 
-    return {"task_id": task_id, "history": hist_entry}
+    return {"task_id": task_id, "history": hist_entry, "deduplicated": _coalesced}
 
 
 @app.post("/api/download", dependencies=[Depends(dep_auth), Depends(dep_rate_limit)])
 async def start_download(req: DownloadRequest):
-    return await _enqueue_download(req.platform, req.game_name, req.url, req.is_archive)
+    return await _enqueue_download(req.platform, req.game_name, req.url, req.is_archive, bool(req.force))
 
 
 class BatchDownloadRequest(BaseModel):
@@ -333,8 +367,14 @@ class CancelRequest(BaseModel):
 def cancel_download(req: CancelRequest):
     if not req.task_id and not req.url:
         raise HTTPException(400, "task_id or url is required")
-    network.request_cancel(task_id=req.task_id, url=req.url)
-    return {"ok": True}
+    # ok is False when no running download matches
+    return {"ok": network.request_cancel(task_id=req.task_id, url=req.url)}
+
+
+@app.get("/api/disk/reservations", dependencies=[Depends(dep_auth), Depends(dep_rate_limit)])
+def get_disk_reservations():
+    # Space reserved by running downloads/extractions and the tasks waiting for room, per volume
+    return network.get_disk_reservations()
 
 
 class RedownloadRequest(BaseModel):
@@ -366,7 +406,8 @@ async def redownload_from_history(req: RedownloadRequest):
         platform=platform,
         game_name=game_name,
         url=req.url,
-        is_archive=is_archive
+        is_archive=is_archive,
+        force=True
     )
     
     return await start_download(download_req)
@@ -402,6 +443,7 @@ def progress(url: Optional[str] = None):
             "status": status,
             "percent": max(0, min(100, percent)),
             "speed": entry.get("speed", 0.0),
+            "eta": entry.get("eta"),
             "downloaded_size": downloaded,
             "total_size": total,
             "timestamp": entry.get("timestamp"),
@@ -415,6 +457,17 @@ def progress(url: Optional[str] = None):
             return {"url": url, "status": "unknown", "percent": 0}
         latest_raw = items[-1]
         latest = normalize(latest_raw)
+        # Live throughput model of the latest transfer: smoothed speed, ETA, serving mirror and timeline
+        stats = network.get_transfer_stats(latest_raw.get("url"))
+        if stats:
+            snapshot = stats.snapshot()
+            latest["timeline"] = snapshot["timeline"]
+            latest["sample_interval"] = snapshot["sample_interval"]
+            latest["source"] = snapshot["source"]
+            latest["idle"] = snapshot["idle"]
+            if latest["status"] == "downloading":
+                latest["speed"] = snapshot["speed"]
+                latest["eta"] = snapshot["eta"]
         # Heuristic: if backend missed final update but file exists on disk, mark completed
         try:
             # Ensure sources are loaded for folder mapping
@@ -568,7 +621,9 @@ def search(q: str, platform_id: Optional[str] = None, limit: int = 100):
                     if 0 < limit <= len(results):
                         break
 
-    return results[:limit] if limit and limit > 0 else results
+    results = results[:limit] if limit and limit > 0 else results
+    fill_probed_sizes(results)
+    return results
 
 
 # Redownload a history entry
@@ -603,7 +658,7 @@ async def redownload(req: RedownloadRequest):
     url = entry.get("url") or req.url
     if not (platform and game_name and url):
         raise HTTPException(status_code=400, detail="insufficient data to redownload")
-    return await _enqueue_download(platform, game_name, url, req.is_archive)
+    return await _enqueue_download(platform, game_name, url, req.is_archive, force=True)
 
 
 # Batch download
@@ -612,6 +667,7 @@ class BatchItem(BaseModel):
     game_name: str
     url: str
     is_archive: Optional[bool] = None
+    force: Optional[bool] = False
 
 
 class BatchRequest(BaseModel):
@@ -624,7 +680,7 @@ async def start_batch(req: BatchRequest):
         raise HTTPException(status_code=400, detail="no items")
     tasks = []
     for it in req.items:
-        tasks.append(asyncio.create_task(_enqueue_download(it.platform, it.game_name, it.url, it.is_archive)))
+        tasks.append(asyncio.create_task(_enqueue_download(it.platform, it.game_name, it.url, it.is_archive, bool(it.force))))
     results = await asyncio.gather(*tasks)
     return {"ok": True, "count": len(results), "tasks": results}
 